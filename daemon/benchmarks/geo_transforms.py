@@ -0,0 +1,63 @@
+"""
+Benchmark converting positions between x,y,z and lat,lon,alt, comparing per point
+conversions, batched conversions and the local tangent plane approximation.
+"""
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+
+from core.location.geo import GeoLocation
+
+REF_GEO: tuple[float, float, float] = (47.57917, -122.13232, 2.0)
+
+
+def measure(func: Callable[[], list], repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def run(location: GeoLocation, args: argparse.Namespace) -> dict[str, float]:
+    random.seed(0)
+    positions = []
+    for _ in range(args.points):
+        x = random.uniform(0, args.size)
+        y = random.uniform(0, args.size)
+        positions.append((x, y, random.uniform(0, 100)))
+    geos = location.getgeo_many(positions)
+    return {
+        "getgeo_ms": measure(
+            lambda: [location.getgeo(*x) for x in positions], args.repeat
+        ),
+        "getgeo_many_ms": measure(lambda: location.getgeo_many(positions), args.repeat),
+        "getxyz_ms": measure(lambda: [location.getxyz(*x) for x in geos], args.repeat),
+        "getxyz_many_ms": measure(lambda: location.getxyz_many(geos), args.repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="benchmark geo coordinate transforms",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("-p", "--points", type=int, default=10000, help="points")
+    parser.add_argument("-s", "--size", type=int, default=5000, help="canvas size")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="repetitions")
+    args = parser.parse_args()
+    location = GeoLocation()
+    location.setrefgeo(*REF_GEO)
+    location.refscale = 150.0
+    results = {"points": args.points, "projection": run(location, args)}
+    location.set_tangent_plane(True)
+    results["tangent_plane"] = run(location, args)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark canvas rendering of large topologies, comparing zooming out and back in
+with every item drawn against level of detail rendering.
+
+Requires a display, for example: xvfb-run python benchmarks/gui_render.py
+"""
+import argparse
+import json
+import random
+import time
+import tkinter as tk
+
+from core.gui.graph import tags
+from core.gui.graph.detail import DetailLevel, create_bundles, get_detail_level
+
+WIDTH: int = 1000
+HEIGHT: int = 800
+ZOOM_OUT: float = 0.9
+ZOOM_IN: float = 1.1
+
+
+def draw_topology(
+    canvas: tk.Canvas, nodes: int, edges: int, size: int
+) -> list[tuple[float, float]]:
+    random.seed(0)
+    positions = []
+    for i in range(nodes):
+        x, y = random.uniform(0, size), random.uniform(0, size)
+        positions.append((x, y))
+        canvas.create_rectangle(x - 12, y - 12, x + 12, y + 12, tags=tags.NODE)
+        canvas.create_text(x, y + 20, text=f"n{i + 1}", tags=tags.NODE_LABEL)
+        canvas.create_oval(x - 16, y - 28, x - 8, y - 20, tags=tags.ANTENNA)
+    for _ in range(edges):
+        x1, y1 = random.choice(positions)
+        x2, y2 = random.choice(positions)
+        canvas.create_line(x1, y1, x2, y2, tags=tags.WIRELESS_EDGE)
+        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+        canvas.create_text(mx, my, text="10.0.0.1/24", tags=tags.LINK_LABEL)
+    return positions
+
+
+def apply_detail(canvas: tk.Canvas, ratio: float) -> None:
+    level = get_detail_level(ratio)
+    canvas.delete(tags.WIRELESS_BUNDLE)
+    state = tk.NORMAL if level == DetailLevel.FULL else tk.HIDDEN
+    for tag in (tags.NODE_LABEL, tags.ANTENNA, tags.LINK_LABEL):
+        canvas.itemconfigure(tag, state=state)
+    if level == DetailLevel.BUNDLED:
+        canvas.itemconfigure(tags.WIRELESS_EDGE, state=tk.HIDDEN)
+        lines = [canvas.coords(x) for x in canvas.find_withtag(tags.WIRELESS_EDGE)]
+        for bundle in create_bundles(lines):
+            canvas.create_line(
+                *bundle.line(), width=bundle.width(), tags=tags.WIRELESS_BUNDLE
+            )
+    else:
+        canvas.itemconfigure(tags.WIRELESS_EDGE, state=tk.NORMAL)
+
+
+def run(root: tk.Tk, args: argparse.Namespace, detail: bool) -> dict[str, float]:
+    canvas = tk.Canvas(root, width=WIDTH, height=HEIGHT)
+    canvas.pack()
+    draw_topology(canvas, args.nodes, args.edges, args.size)
+    root.update()
+    ratio = 1.0
+    frames = []
+    factors = [ZOOM_OUT] * args.steps + [ZOOM_IN] * args.steps
+    for factor in factors:
+        start = time.perf_counter()
+        canvas.scale(tk.ALL, WIDTH / 2, HEIGHT / 2, factor, factor)
+        ratio *= factor
+        if detail:
+            apply_detail(canvas, ratio)
+        root.update()
+        frames.append(time.perf_counter() - start)
+    canvas.destroy()
+    frames.sort()
+    return {
+        "mean_ms": sum(frames) / len(frames) * 1000,
+        "p95_ms": frames[int(len(frames) * 0.95) - 1] * 1000,
+        "max_ms": frames[-1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="benchmark canvas zoom rendering for large topologies",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("-n", "--nodes", type=int, default=1000, help="node count")
+    parser.add_argument("-e", "--edges", type=int, default=5000, help="edge count")
+    parser.add_argument("-s", "--size", type=int, default=3000, help="canvas size")
+    parser.add_argument("--steps", type=int, default=15, help="zoom steps")
+    args = parser.parse_args()
+    root = tk.Tk()
+    results = {
+        "nodes": args.nodes,
+        "edges": args.edges,
+        "full": run(root, args, detail=False),
+        "detail": run(root, args, detail=True),
+    }
+    root.destroy()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
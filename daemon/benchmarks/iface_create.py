@@ -0,0 +1,103 @@
+"""
+Benchmark node interface creation, comparing creating a veth pair on the host
+and moving, renaming and configuring it within the node one command at a time,
+against creating the peer directly within the node namespace and configuring it
+as a single batch.
+
+Nodes are emulated using network namespaces created with unshare, and node
+commands are run with nsenter. Requires root, iproute2 and ethtool, unless turning checksums off is
+skipped.
+"""
+import argparse
+import shlex
+import subprocess
+import time
+from collections.abc import Callable
+
+from core import utils
+from core.executables import BASH
+from core.nodes.netclient import LinuxNetClient
+
+MTU: int = 1500
+
+
+def create_node_run(pid: int) -> Callable[..., str]:
+    def run(args: str, wait: bool = True, shell: bool = False) -> str:
+        if shell:
+            args = f"{BASH} -c {shlex.quote(args)}"
+        return utils.cmd(f"nsenter -t {pid} -n -- {args}", wait=wait, shell=shell)
+
+    return run
+
+
+def create_legacy(
+    host: LinuxNetClient,
+    node: LinuxNetClient,
+    pid: int,
+    index: int,
+    checksums_off: bool,
+) -> None:
+    name, localname = f"veth{index}.b", f"beth{index}.b"
+    host.create_veth(localname, name)
+    host.set_mtu(name, MTU)
+    host.set_mtu(localname, MTU)
+    host.device_up(name)
+    host.device_up(localname)
+    host.device_ns(name, str(pid))
+    node.device_name(name, f"eth{index}")
+    name = f"eth{index}"
+    if checksums_off:
+        node.checksums_off(name)
+    node.get_ifindex(name)
+    node.device_mac(name, utils.random_mac())
+    node.create_address(name, f"10.{index // 250}.{index % 250}.1/24", "+")
+    node.device_up(name)
+
+
+def create_direct(
+    host: LinuxNetClient,
+    node: LinuxNetClient,
+    pid: int,
+    index: int,
+    checksums_off: bool,
+) -> None:
+    name, localname = f"eth{index}", f"beth{index}.b"
+    host.create_veth_ns(localname, name, str(pid), MTU, utils.random_mac())
+    host.device_up(localname)
+    address = f"10.{index // 250}.{index % 250}.1/24"
+    node.setup_iface(name, [(address, "+")], checksums_off)
+
+
+def run(name: str, func: Callable, count: int, checksums_off: bool) -> float:
+    process = subprocess.Popen(["unshare", "-n", "sleep", "infinity"])
+    time.sleep(0.2)
+    host = LinuxNetClient(utils.cmd)
+    node = LinuxNetClient(create_node_run(process.pid))
+    try:
+        start = time.perf_counter()
+        for index in range(count):
+            func(host, node, process.pid, index, checksums_off)
+        duration = time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+    rate = count / duration
+    print(f"{name}: {count} interfaces in {duration:.3f}s ({rate:.1f}/s)")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark interface creation")
+    parser.add_argument("-c", "--count", type=int, default=100)
+    parser.add_argument(
+        "--skip-checksums", action="store_true", help="do not turn checksums off"
+    )
+    args = parser.parse_args()
+    checksums_off = not args.skip_checksums
+    legacy = run("legacy", create_legacy, args.count, checksums_off)
+    direct = run("direct", create_direct, args.count, checksums_off)
+    print(f"speedup: {direct / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
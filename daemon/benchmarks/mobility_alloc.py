@@ -0,0 +1,200 @@
+"""
+Benchmark memory and allocations of the data broadcast during a long mobility
+run, for nodes moving within a wlan using the basic range model and nodes
+moving within a wireless network.
+
+Each tick moves all nodes, broadcasting node, link and event data to handlers
+retaining recent payloads, similar to grpc event streams. Ticks are first timed,
+then run again tracing python allocations with tracemalloc, reporting memory
+retained by handlers, peak memory and garbage collections triggered, along with
+the size of each payload type. Commands are mocked, so this can be run without
+root.
+"""
+import argparse
+import gc
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter, deque
+from typing import Any
+from unittest import mock
+
+from core import utils
+from core.emulator.coreemu import CoreEmu
+from core.emulator.data import EventData, IpPrefixes, LinkData, NodeData
+from core.emulator.enumerations import EventTypes
+from core.emulator.session import Session
+from core.location.mobility import BasicRangeModel
+from core.nodes.base import CoreNode
+from core.nodes.network import NftablesQueue, WlanNode
+from core.nodes.wireless import WirelessNode
+
+SIZE: float = 1000.0
+STEP: float = 25.0
+WLAN_PREFIX: str = "10.254.0.0/16"
+WIRELESS_PREFIX: str = "10.253.0.0/16"
+DATA_TYPES: tuple[type, ...] = (NodeData, LinkData, EventData)
+
+
+def instance_size(obj: Any) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def build(session: Session, args: argparse.Namespace) -> None:
+    random.seed(0)
+    session.set_state(EventTypes.CONFIGURATION_STATE)
+    wlan = session.add_node(WlanNode)
+    config = {"range": str(args.range), "bandwidth": "54000000", "delay": "5000"}
+    session.mobility.set_model_config(wlan.id, BasicRangeModel.name, config)
+    wireless = session.add_node(WirelessNode)
+    for net, count, prefix in (
+        (wlan, args.wlan, WLAN_PREFIX),
+        (wireless, args.wireless, WIRELESS_PREFIX),
+    ):
+        prefixes = IpPrefixes(prefix)
+        for _ in range(count):
+            options = CoreNode.create_options()
+            options.model = "mdr"
+            node = session.add_node(CoreNode, options=options)
+            session.set_node_pos(node, random.uniform(0, SIZE), random.uniform(0, SIZE))
+            session.add_link(node.id, net.id, prefixes.create_iface(node))
+    session.set_state(EventTypes.INSTANTIATION_STATE)
+    exceptions = session.instantiate()
+    if exceptions:
+        raise RuntimeError(f"failed to instantiate session: {exceptions}")
+
+
+def move(node: CoreNode) -> tuple[float, float]:
+    x, y, _ = node.position.get()
+    x = min(max(x + random.uniform(-STEP, STEP), 0.0), SIZE)
+    y = min(max(y + random.uniform(-STEP, STEP), 0.0), SIZE)
+    return x, y
+
+
+def tick(session: Session, wlan: WlanNode, wireless: WirelessNode) -> None:
+    ifaces = wlan.get_ifaces()
+    for iface in ifaces:
+        x, y = move(iface.node)
+        iface.node.position.set(x, y)
+        session.broadcast_node(iface.node)
+    wlan.wireless_model.update(ifaces)
+    for iface in wireless.get_ifaces():
+        x, y = move(iface.node)
+        session.set_node_pos(iface.node, x, y)
+    session.broadcast_event(EventTypes.RUNTIME_STATE, name="mobility tick")
+
+
+def run_ticks(session: Session, args: argparse.Namespace) -> dict[str, Any]:
+    wlan = next(x for x in session.nodes.values() if isinstance(x, WlanNode))
+    wireless = next(x for x in session.nodes.values() if isinstance(x, WirelessNode))
+    counts = Counter()
+    queues = {}
+    for data_type in DATA_TYPES:
+        queue = deque(maxlen=args.retain)
+        queues[data_type] = queue
+
+        def handler(data: Any, queue: deque = queue) -> None:
+            counts[type(data).__name__] += 1
+            queue.append(data)
+
+        session.broadcast_manager.add_handler(data_type, handler)
+    random.seed(1)
+    # time ticks without tracing overhead
+    cpu_start = time.process_time()
+    for _ in range(args.ticks):
+        tick(session, wlan, wireless)
+    cpu_seconds = time.process_time() - cpu_start
+    # trace ticks from empty handlers, retaining payloads as they are broadcast
+    for queue in queues.values():
+        queue.clear()
+    counts.clear()
+    gc.collect()
+    collections = [x["collections"] for x in gc.get_stats()]
+    tracemalloc.start()
+    start_memory, _ = tracemalloc.get_traced_memory()
+    for _ in range(args.ticks):
+        tick(session, wlan, wireless)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = [x["collections"] - y for x, y in zip(gc.get_stats(), collections)]
+    retained = sum(len(x) for x in queues.values())
+    sizes = {}
+    for data_type, queue in queues.items():
+        if queue:
+            sizes[data_type.__name__] = instance_size(queue[-1])
+    link_data = next((x for x in queues[LinkData] if x.iface1), None)
+    if link_data is not None:
+        sizes["LinkOptions"] = instance_size(link_data.options)
+        sizes["InterfaceData"] = instance_size(link_data.iface1)
+    return dict(
+        cpu_seconds=cpu_seconds,
+        tick_ms=cpu_seconds / args.ticks * 1000,
+        broadcasts=dict(sorted(counts.items())),
+        retained=retained,
+        retained_bytes=current - start_memory,
+        bytes_per_payload=(current - start_memory) / max(retained, 1),
+        peak_bytes=peak - start_memory,
+        gc_collections=collections,
+        instance_bytes=sizes,
+    )
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    def cmd(*_: Any, **__: Any) -> str:
+        return "1"
+
+    patches = [
+        mock.patch.object(utils, "cmd", cmd),
+        mock.patch("core.utils.which"),
+        mock.patch("core.emulator.hooks._run_callback"),
+        mock.patch.object(CoreNode, "create_file"),
+        mock.patch.object(NftablesQueue, "start"),
+    ]
+    for patch in patches:
+        patch.start()
+    try:
+        coreemu = CoreEmu({"emane_prefix": "/usr"})
+        try:
+            session = coreemu.create_session()
+            build(session, args)
+            results = run_ticks(session, args)
+        finally:
+            coreemu.shutdown()
+    finally:
+        for patch in patches:
+            patch.stop()
+    config = dict(
+        wlan=args.wlan,
+        wireless=args.wireless,
+        range=args.range,
+        ticks=args.ticks,
+        retain=args.retain,
+    )
+    return dict(config=config, results=results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="benchmark mobility broadcast memory and allocations",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("-w", "--wlan", type=int, default=50, help="wlan nodes")
+    parser.add_argument("--wireless", type=int, default=20, help="wireless nodes")
+    parser.add_argument("--range", type=int, default=275, help="wlan range")
+    parser.add_argument("-t", "--ticks", type=int, default=500, help="ticks")
+    parser.add_argument(
+        "--retain", type=int, default=10000, help="payloads retained per data type"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Benchmark the python side cost of building, starting and running a session at
+scale, for a synthesized topology of routers wired in a chain and to a switch,
+nodes within a wlan and nodes within a wireless network.
+
+Each stage is timed and the external commands it runs are counted. Using --mock
+replaces running commands with a fake result, like the tests --mock option, so
+stages only reflect python cost and can be run without root. Otherwise nodes
+are created within the kernel, requiring root and the core dependencies.
+
+The nftables update thread is disabled, so wlan filtering is only committed
+within the nftables stage, keeping command counts reproducible. Results are
+written as json and can be compared against a prior result using --baseline,
+exiting with an error when a stage runs slower than the allowed threshold or
+runs more commands.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import logging
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from core import metrics, utils
+from core.api.grpc import core_pb2
+from core.api.grpc.server import CoreGrpcServer
+from core.emulator.coreemu import CoreEmu
+from core.emulator.data import EventData, IpPrefixes, LinkData, NodeData
+from core.emulator.enumerations import EventTypes
+from core.emulator.session import Session
+from core.nodes.base import CoreNode
+from core.nodes.network import NftablesQueue, SwitchNode, WlanNode, nft_queue
+from core.nodes.wireless import WirelessNode
+
+SIZE: float = 1000.0
+STEP: float = 25.0
+SWITCH_PREFIX: str = "10.255.0.0/16"
+WLAN_PREFIX: str = "10.254.0.0/16"
+WIRELESS_PREFIX: str = "10.253.0.0/16"
+
+
+class Recorder:
+    """
+    Records duration and commands run for benchmark stages.
+    """
+
+    def __init__(self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        self.commands: Counter[str] = Counter()
+        self.stages: dict[str, dict[str, Any]] = {}
+        self.depth: int = 0
+
+    def count(self, args: str) -> None:
+        with self.lock:
+            self.commands[metrics.command_name(args)] += 1
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a stage and count the commands it runs, repeated stages are added
+        together. Garbage is collected before top level stages, so collections
+        triggered by prior stages are not timed.
+
+        :param name: name of stage
+        :return: nothing
+        """
+        if not self.depth:
+            gc.collect()
+        self.depth += 1
+        with self.lock:
+            commands = Counter(self.commands)
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            duration = time.perf_counter() - start
+            cpu_duration = time.process_time() - cpu_start
+            with self.lock:
+                commands = self.commands - commands
+            result = self.stages.setdefault(
+                name, dict(samples=0, seconds=0.0, cpu_seconds=0.0, by_command={})
+            )
+            result["samples"] += 1
+            result["seconds"] += duration
+            result["cpu_seconds"] += cpu_duration
+            by_command = Counter(result["by_command"]) + commands
+            result["by_command"] = dict(sorted(by_command.items()))
+            result["commands"] = sum(by_command.values())
+
+
+def create_patches(recorder: Recorder, use_mock: bool) -> list:
+    if use_mock:
+
+        def cmd(args: str, *_: Any, **__: Any) -> str:
+            recorder.count(args)
+            return "1"
+
+        patches = [
+            mock.patch.object(utils, "cmd", cmd),
+            mock.patch("core.utils.which"),
+            mock.patch("core.emulator.hooks._run_callback"),
+            mock.patch.object(CoreNode, "create_file"),
+        ]
+    else:
+        run = utils.cmd
+
+        def cmd(args: str, *cmd_args: Any, **kwargs: Any) -> str:
+            recorder.count(args)
+            return run(args, *cmd_args, **kwargs)
+
+        patches = [mock.patch.object(utils, "cmd", cmd)]
+    patches.append(mock.patch.object(NftablesQueue, "start"))
+    return patches
+
+
+def build(session: Session, args: argparse.Namespace, recorder: Recorder) -> None:
+    random.seed(0)
+    session.set_state(EventTypes.CONFIGURATION_STATE)
+    with recorder.stage("add_nodes"):
+        switch = session.add_node(SwitchNode)
+        wlan = session.add_node(WlanNode)
+        wireless = session.add_node(WirelessNode)
+        routers = []
+        for _ in range(args.nodes):
+            options = CoreNode.create_options()
+            options.model = "router"
+            routers.append(session.add_node(CoreNode, options=options))
+        wlan_nodes = []
+        wireless_nodes = []
+        for nodes, count in ((wlan_nodes, args.wlan), (wireless_nodes, args.wireless)):
+            for _ in range(count):
+                options = CoreNode.create_options()
+                options.model = "mdr"
+                node = session.add_node(CoreNode, options=options)
+                x, y = random.uniform(0, SIZE), random.uniform(0, SIZE)
+                session.set_node_pos(node, x, y)
+                nodes.append(node)
+    with recorder.stage("add_links"):
+        for index, (node1, node2) in enumerate(zip(routers, routers[1:])):
+            add_ptp_link(session, node1, node2, index)
+        prefixes = IpPrefixes(SWITCH_PREFIX)
+        for node in routers:
+            session.add_link(node.id, switch.id, prefixes.create_iface(node))
+        prefixes = IpPrefixes(WLAN_PREFIX)
+        for node in wlan_nodes:
+            session.add_link(node.id, wlan.id, prefixes.create_iface(node))
+        prefixes = IpPrefixes(WIRELESS_PREFIX)
+        for node in wireless_nodes:
+            session.add_link(node.id, wireless.id, prefixes.create_iface(node))
+
+
+def add_ptp_link(session: Session, node1: CoreNode, node2: CoreNode, index: int):
+    prefixes = IpPrefixes(f"10.{index >> 8}.{index & 255}.0/24")
+    iface1_data = prefixes.create_iface(node1)
+    iface2_data = prefixes.create_iface(node2)
+    session.add_link(node1.id, node2.id, iface1_data, iface2_data)
+
+
+def instantiate(session: Session, recorder: Recorder) -> None:
+    boot_nodes = session.boot_nodes
+
+    def timed_boot_nodes() -> list[Exception]:
+        with recorder.stage("boot_nodes"):
+            return boot_nodes()
+
+    with mock.patch.object(session, "boot_nodes", timed_boot_nodes):
+        with recorder.stage("instantiate"):
+            session.set_state(EventTypes.INSTANTIATION_STATE)
+            exceptions = session.instantiate()
+    if exceptions:
+        raise RuntimeError(f"failed to instantiate session: {exceptions}")
+
+
+def run_runtime(session: Session, args: argparse.Namespace, recorder: Recorder):
+    random.seed(1)
+    routers = [
+        x
+        for x in session.nodes.values()
+        if isinstance(x, CoreNode) and x.model == "router"
+    ]
+    wlan = next(x for x in session.nodes.values() if isinstance(x, WlanNode))
+    wireless = next(x for x in session.nodes.values() if isinstance(x, WirelessNode))
+    with recorder.stage("add_link"):
+        for index in range(min(args.links, len(routers) - 2)):
+            node1, node2 = routers[index], routers[index + 2]
+            add_ptp_link(session, node1, node2, args.nodes + index)
+    # event handlers, similar to grpc event streams
+    handlers = []
+    for data_type in (NodeData, LinkData, EventData):
+        for _ in range(args.handlers):
+            handler = deque(maxlen=1000).append
+            session.broadcast_manager.add_handler(data_type, handler)
+            handlers.append((data_type, handler))
+    wlan_ifaces = wlan.get_ifaces()
+    wireless_nodes = [x.node for x in wireless.get_ifaces()]
+    for _ in range(args.ticks):
+        with recorder.stage("mobility_ticks"):
+            # similar to waypoint mobility, moving nodes and then updating ranges
+            moved_ifaces = []
+            for iface in wlan_ifaces:
+                move_node(iface.node)
+                session.broadcast_node(iface.node)
+                moved_ifaces.append(iface)
+            with recorder.stage("range_update"):
+                wlan.wireless_model.update(moved_ifaces)
+            for node in wireless_nodes:
+                x, y, _ = move_node(node, False)
+                session.set_node_pos(node, x, y)
+    for _ in range(args.rebuilds):
+        with recorder.stage("nftables"):
+            with wlan.linked_lock:
+                wlan.nftables_resync = True
+            nft_queue.build_cmds(wlan)
+            nft_queue.commit(wlan)
+    with recorder.stage("events"):
+        for _ in range(args.events):
+            for node in session.nodes.values():
+                session.broadcast_node(node)
+                session.broadcast_event(EventTypes.RUNTIME_STATE, node_id=node.id)
+    for data_type, handler in handlers:
+        session.broadcast_manager.remove_handler(data_type, handler)
+
+
+def move_node(node: CoreNode, update: bool = True) -> tuple[float, float, float]:
+    x, y, z = node.position.get()
+    x = min(max(x + random.uniform(-STEP, STEP), 0.0), SIZE)
+    y = min(max(y + random.uniform(-STEP, STEP), 0.0), SIZE)
+    if update:
+        node.position.set(x, y, z)
+    return x, y, z
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    recorder = Recorder()
+    patches = create_patches(recorder, args.mock)
+    for patch in patches:
+        patch.start()
+    try:
+        coreemu = CoreEmu({"emane_prefix": "/usr"})
+        server = CoreGrpcServer(coreemu)
+        context = mock.MagicMock()
+        try:
+            session = coreemu.create_session()
+            build(session, args, recorder)
+            instantiate(session, recorder)
+            run_runtime(session, args, recorder)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_path = Path(temp_dir) / "scale.xml"
+                with recorder.stage("xml_save"):
+                    session.save_xml(file_path)
+                with recorder.stage("shutdown"):
+                    coreemu.delete_session(session.id)
+                session = coreemu.create_session()
+                with recorder.stage("xml_load"):
+                    session.open_xml(file_path)
+            request = core_pb2.GetSessionRequest(session_id=session.id)
+            session_proto = server.GetSession(request, context).session
+            request = core_pb2.StartSessionRequest(session=session_proto)
+            with recorder.stage("start_session"):
+                response = server.StartSession(request, context)
+            if not response.result:
+                raise RuntimeError(f"failed to start session: {response.exceptions}")
+        finally:
+            coreemu.shutdown()
+    finally:
+        for patch in patches:
+            patch.stop()
+    config = dict(
+        mock=args.mock,
+        nodes=args.nodes,
+        wlan=args.wlan,
+        wireless=args.wireless,
+        links=args.links,
+        ticks=args.ticks,
+        rebuilds=args.rebuilds,
+        events=args.events,
+        handlers=args.handlers,
+    )
+    return dict(config=config, stages=recorder.stages)
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float):
+    if results["config"] != baseline["config"]:
+        raise ValueError(
+            f"baseline config {baseline['config']} does not match "
+            f"{results['config']}"
+        )
+    regressions = []
+    for name, base in baseline["stages"].items():
+        stage = results["stages"].get(name)
+        if stage is None:
+            regressions.append(f"{name}: missing stage")
+            continue
+        ratio = stage["cpu_seconds"] / max(base["cpu_seconds"], 1e-6)
+        status = "ok"
+        if ratio > threshold:
+            status = "slower"
+            regressions.append(f"{name}: {ratio:.2f}x cpu time")
+        if stage["commands"] > base["commands"]:
+            status = "more commands"
+            regressions.append(
+                f"{name}: {stage['commands']} commands, " f"baseline {base['commands']}"
+            )
+        print(
+            f"{name:>16}: {stage['cpu_seconds']:.3f}s cpu ({ratio:.2f}x) "
+            f"{stage['commands']} commands ({base['commands']}) {status}",
+            file=sys.stderr,
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="benchmark sessions at scale",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("-n", "--nodes", type=int, default=100, help="wired routers")
+    parser.add_argument("-w", "--wlan", type=int, default=50, help="wlan nodes")
+    parser.add_argument("--wireless", type=int, default=20, help="wireless nodes")
+    parser.add_argument("-l", "--links", type=int, default=20, help="runtime links")
+    parser.add_argument("-t", "--ticks", type=int, default=50, help="mobility ticks")
+    parser.add_argument(
+        "-r", "--rebuilds", type=int, default=20, help="nftables rebuilds"
+    )
+    parser.add_argument(
+        "-e", "--events", type=int, default=10, help="event rounds for all nodes"
+    )
+    parser.add_argument(
+        "--handlers", type=int, default=4, help="broadcast handlers per data type"
+    )
+    parser.add_argument(
+        "--mock", action="store_true", help="mock commands, only python cost"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="file to write results to")
+    parser.add_argument("-b", "--baseline", type=Path, help="results to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="allowed cpu time ratio against baseline",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    results = run(args)
+    data = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(data + "\n")
+    else:
+        print(data)
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("regressions:\n" + "\n".join(regressions), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark nftables wlan filtering, comparing rebuilding a chain with rules for
+every filtered interface pair against updating verdict map elements.
+
+Rules in a chain are matched linearly per packet, while verdict map lookups are
+a single hash lookup, so the rule and element counts reported reflect per packet
+matching cost. Applying commands requires root and nftables, use --dry-run to
+only report command and rule counts.
+"""
+import argparse
+import json
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from core.emulator.enumerations import NetworkPolicy
+from core.nodes.network import NftablesQueue
+
+TABLE: str = "b.bench.1"
+
+
+class BenchIface:
+    def __init__(self, localname: str) -> None:
+        self.localname = localname
+
+
+def create_net(nodes: int, linked: float) -> SimpleNamespace:
+    random.seed(0)
+    ifaces = [BenchIface(f"veth{i}.0.1") for i in range(nodes)]
+    net = SimpleNamespace(
+        brname=TABLE,
+        policy=NetworkPolicy.ACCEPT,
+        linked={x: {} for x in ifaces},
+        linked_lock=threading.Lock(),
+        has_nftables_chain=False,
+        nftables_changes=set(),
+        nftables_resync=False,
+        nftables_elements={},
+    )
+    for index, iface1 in enumerate(ifaces):
+        for iface2 in ifaces[index + 1 :]:
+            net.linked[iface1][iface2] = random.random() < linked
+    return net
+
+
+def legacy_cmds(net: SimpleNamespace) -> list[str]:
+    cmds = [
+        f"add table bridge {net.brname}",
+        f"flush table bridge {net.brname}",
+        f"add chain bridge {net.brname} forward {{type filter hook forward "
+        f"priority -1; policy accept;}}",
+        f"add rule bridge {net.brname} forward ibriport != {net.brname} accept",
+    ]
+    for iface1, value in net.linked.items():
+        for iface2, linked in value.items():
+            if linked:
+                continue
+            name1, name2 = iface1.localname, iface2.localname
+            cmds.append(
+                f'add rule bridge {net.brname} forward iifname "{name1}" '
+                f'oifname "{name2}" drop'
+            )
+            cmds.append(
+                f'add rule bridge {net.brname} forward oifname "{name1}" '
+                f'iifname "{name2}" drop'
+            )
+    return cmds
+
+
+def apply(cmds: list[str], dry_run: bool) -> float:
+    if dry_run:
+        return 0.0
+    with tempfile.NamedTemporaryFile("w", suffix=".nft") as f:
+        f.write("\n".join(cmds) + "\n")
+        f.flush()
+        start = time.perf_counter()
+        subprocess.run(["nft", "-f", f.name], check=True)
+        return (time.perf_counter() - start) * 1000
+
+
+def toggle_link(net: SimpleNamespace) -> None:
+    iface1 = random.choice(list(net.linked))
+    if not net.linked[iface1]:
+        return toggle_link(net)
+    iface2 = random.choice(list(net.linked[iface1]))
+    net.linked[iface1][iface2] = not net.linked[iface1][iface2]
+    net.nftables_changes.add((iface1, iface2))
+
+
+def run(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    net = create_net(args.nodes, args.linked)
+    results = {}
+    # legacy rebuilds the full chain for every update
+    cmds = legacy_cmds(net)
+    load_ms = apply(cmds, args.dry_run)
+    update_ms = []
+    for _ in range(args.updates):
+        toggle_link(net)
+        cmds = legacy_cmds(net)
+        update_ms.append(apply(cmds, args.dry_run))
+    results["chain"] = {
+        "rules": len([x for x in cmds if x.startswith("add rule")]),
+        "load_ms": load_ms,
+        "update_ms": sum(update_ms) / len(update_ms),
+        "update_cmds": len(cmds),
+    }
+    apply([f"delete table bridge {TABLE}"], args.dry_run)
+    # verdict map only updates changed elements
+    net.nftables_changes.clear()
+    queue = NftablesQueue()
+    queue.build_cmds(net)
+    load_ms = apply(queue.cmds, args.dry_run)
+    queue.cmds.clear()
+    update_ms = []
+    update_cmds = 0
+    for _ in range(args.updates):
+        toggle_link(net)
+        queue.build_cmds(net)
+        update_cmds = max(update_cmds, len(queue.cmds))
+        update_ms.append(apply(queue.cmds, args.dry_run))
+        queue.cmds.clear()
+    results["map"] = {
+        "rules": 2,
+        "elements": len(net.nftables_elements),
+        "load_ms": load_ms,
+        "update_ms": sum(update_ms) / len(update_ms),
+        "update_cmds": update_cmds,
+    }
+    apply([f"delete table bridge {TABLE}"], args.dry_run)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="benchmark nftables wlan filtering",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("-n", "--nodes", type=int, default=300, help="wlan nodes")
+    parser.add_argument(
+        "-l", "--linked", type=float, default=0.05, help="fraction of linked pairs"
+    )
+    parser.add_argument("-u", "--updates", type=int, default=20, help="link updates")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report command counts"
+    )
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
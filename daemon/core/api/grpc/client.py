@@ -60,26 +60,37 @@ class MoveNodesStreamer:
         self.source: str | None = source
         self.queue: SetQueue = SetQueue()
 
-    def send_position(self, node_id: int, x: float, y: float) -> None:
+    def create_position(
+        self, node_id: int, x: float, y: float
+    ) -> wrappers.MoveNodesRequest:
         position = wrappers.Position(x=x, y=y)
-        request = wrappers.MoveNodesRequest(
+        return wrappers.MoveNodesRequest(
             session_id=self.session_id,
             node_id=node_id,
             source=self.source,
             position=position,
         )
-        self.send(request)
 
-    def send_geo(self, node_id: int, lon: float, lat: float, alt: float) -> None:
+    def create_geo(
+        self, node_id: int, lon: float, lat: float, alt: float
+    ) -> wrappers.MoveNodesRequest:
         geo = wrappers.Geo(lon=lon, lat=lat, alt=alt)
-        request = wrappers.MoveNodesRequest(
+        return wrappers.MoveNodesRequest(
             session_id=self.session_id, node_id=node_id, source=self.source, geo=geo
         )
-        self.send(request)
+
+    def send_position(self, node_id: int, x: float, y: float) -> None:
+        self.send(self.create_position(node_id, x, y))
+
+    def send_geo(self, node_id: int, lon: float, lat: float, alt: float) -> None:
+        self.send(self.create_geo(node_id, lon, lat, alt))
 
     def send(self, request: wrappers.MoveNodesRequest) -> None:
         self.queue.put(request)
 
+    def send_all(self, requests: list[wrappers.MoveNodesRequest]) -> None:
+        self.queue.put_all(requests)
+
     def stop(self) -> None:
         self.queue.put(None)
 
@@ -215,6 +226,64 @@ def cpu_listener(
             logger.exception("cpu stream error")
 
 
+def command_listener(
+    stream: Any, handler: Callable[[wrappers.NodeCommandOutput], None]
+) -> None:
+    """
+    Listen for node command output and provide it to the handler.
+
+    :param stream: grpc stream that will provide command output
+    :param handler: function that handles command output
+    :return: nothing
+    """
+    try:
+        for response in stream:
+            handler(wrappers.NodeCommandOutput.from_proto(response))
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.CANCELLED:
+            logger.debug("node command stream closed")
+        else:
+            logger.exception("node command stream error")
+
+
+def nodes_command_listener(
+    stream: Any, handler: Callable[[wrappers.NodeCommandResult], None]
+) -> None:
+    """
+    Listen for node command results and provide them to the handler.
+
+    :param stream: grpc stream that will provide command results
+    :param handler: function that handles a command result
+    :return: nothing
+    """
+    try:
+        for response in stream:
+            handler(wrappers.NodeCommandResult.from_proto(response))
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.CANCELLED:
+            logger.debug("nodes command stream closed")
+        else:
+            logger.exception("nodes command stream error")
+
+
+def record_listener(stream: Any, handler: Callable[[str], None]) -> None:
+    """
+    Listen for recorded session data and provide it to the handler.
+
+    :param stream: grpc stream that will provide recorded data
+    :param handler: function that handles recorded data
+    :return: nothing
+    """
+    try:
+        for response in stream:
+            handler(response.data)
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.CANCELLED:
+            logger.debug("record stream closed")
+        else:
+            logger.exception("record stream error")
+
+
 def event_listener(stream: Any, handler: Callable[[wrappers.Event], None]) -> None:
     """
     Listen for session events and provide them to the handler.
@@ -339,6 +408,24 @@ class CoreGrpcClient:
         response = self.stub.GetSession(request)
         return wrappers.Session.from_proto(response.session)
 
+    def get_session_changes(
+        self, session_id: int, revision: int
+    ) -> wrappers.SessionChanges:
+        """
+        Retrieve changes made to a session since a given revision, which can be
+        applied to a session using Session.apply_changes.
+
+        :param session_id: id of session
+        :param revision: session revision to get changes since
+        :return: session changes
+        :raises grpc.RpcError: when session doesn't exist
+        """
+        request = core_pb2.GetSessionChangesRequest(
+            session_id=session_id, revision=revision
+        )
+        response = self.stub.GetSessionChanges(request)
+        return wrappers.SessionChanges.from_proto(response)
+
     def alert(
         self,
         session_id: int,
@@ -409,6 +496,34 @@ class CoreGrpcClient:
         thread.start()
         return stream
 
+    def record_session(
+        self,
+        session_id: int,
+        handler: Callable[[str], None],
+        interval: float = 0.0,
+        min_distance: float = 0.0,
+    ) -> grpc.Future:
+        """
+        Record session activity, in core player file format.
+
+        :param session_id: id of session to record
+        :param handler: handler for recorded data, to be appended to a core file
+        :param interval: interval to receive recorded data at, 0 for the default
+        :param min_distance: distance nodes must move before a new position is
+            recorded, 0 to record every change
+        :return: stream providing recorded data, can be used to cancel stream
+        :raises grpc.RpcError: when session doesn't exist
+        """
+        request = core_pb2.RecordSessionRequest(
+            session_id=session_id, interval=interval, min_distance=min_distance
+        )
+        stream = self.stub.RecordSession(request)
+        thread = threading.Thread(
+            target=record_listener, args=(stream, handler), daemon=True
+        )
+        thread.start()
+        return stream
+
     def cpu_usage(
         self, delay: int, handler: Callable[[wrappers.CpuUsageEvent], None]
     ) -> grpc.Future:
@@ -575,6 +690,75 @@ class CoreGrpcClient:
         response = self.stub.NodeCommand(request)
         return response.return_code, response.output
 
+    def node_command_stream(
+        self,
+        session_id: int,
+        node_id: int,
+        command: str,
+        handler: Callable[[wrappers.NodeCommandOutput], None],
+        shell: bool = False,
+    ) -> grpc.Future:
+        """
+        Send command to a node, providing output to the handler as it is produced,
+        with the last output marked done and containing the return code.
+
+        :param session_id: session id
+        :param node_id: node id
+        :param command: command to run on node
+        :param handler: handler for command output
+        :param shell: send shell command
+        :return: stream providing output, can be used to cancel and stop command
+        :raises grpc.RpcError: when session or node doesn't exist
+        """
+        request = core_pb2.NodeCommandStreamRequest(
+            session_id=session_id, node_id=node_id, command=command, shell=shell
+        )
+        stream = self.stub.NodeCommandStream(request)
+        thread = threading.Thread(
+            target=command_listener, args=(stream, handler), daemon=True
+        )
+        thread.start()
+        return stream
+
+    def nodes_command(
+        self,
+        session_id: int,
+        node_ids: list[int],
+        command: str,
+        handler: Callable[[wrappers.NodeCommandResult], None],
+        wait: bool = True,
+        shell: bool = False,
+        concurrency: int = 0,
+    ) -> grpc.Future:
+        """
+        Send command to a set of nodes, providing the result for each node to the
+        handler as it completes.
+
+        :param session_id: session id
+        :param node_ids: ids of nodes to run command on
+        :param command: command to run on nodes
+        :param handler: handler for node command results
+        :param wait: wait for command to complete
+        :param shell: send shell command
+        :param concurrency: maximum commands to run at once, 0 for the default
+        :return: stream providing results, can be used to cancel stream
+        :raises grpc.RpcError: when session or a node doesn't exist
+        """
+        request = core_pb2.NodesCommandRequest(
+            session_id=session_id,
+            node_ids=node_ids,
+            command=command,
+            wait=wait,
+            shell=shell,
+            concurrency=concurrency,
+        )
+        stream = self.stub.NodesCommand(request)
+        thread = threading.Thread(
+            target=nodes_command_listener, args=(stream, handler), daemon=True
+        )
+        thread.start()
+        return stream
+
     def get_node_terminal(self, session_id: int, node_id: int) -> str:
         """
         Retrieve terminal command string for launching a local terminal.
@@ -723,6 +907,18 @@ class CoreGrpcClient:
         response = self.stub.GetConfig(request)
         return wrappers.CoreConfig.from_proto(response)
 
+    def get_metrics(self, reset: bool = False) -> list[wrappers.Metric]:
+        """
+        Retrieve metrics recorded for emulator operations, which are only recorded
+        when enabled within the core daemon configuration.
+
+        :param reset: True to clear metrics after retrieving them
+        :return: recorded metrics
+        """
+        request = core_pb2.GetMetricsRequest(reset=reset)
+        response = self.stub.GetMetrics(request)
+        return [wrappers.Metric.from_proto(x) for x in response.metrics]
+
     def service_action(
         self,
         session_id: int,
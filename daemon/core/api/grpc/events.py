@@ -47,15 +47,12 @@ def handle_session_event(event_data: EventData) -> core_pb2.Event:
     :param event_data: event data
     :return: session event
     """
-    event_time = event_data.time
-    if event_time is not None:
-        event_time = float(event_time)
     session_event = core_pb2.SessionEvent(
         node_id=event_data.node,
         event=event_data.event_type.value,
         name=event_data.name,
         data=event_data.data,
-        time=event_time,
+        time=event_data.time,
     )
     return core_pb2.Event(session_event=session_event)
 
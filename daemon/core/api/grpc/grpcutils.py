@@ -1,5 +1,6 @@
 import logging
 import time
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
@@ -9,7 +10,7 @@ from google.protobuf.message import Message
 from grpc import ServicerContext
 
 from core import utils
-from core.api.grpc import common_pb2, core_pb2, services_pb2, wrappers
+from core.api.grpc import common_pb2, core_pb2, services_pb2
 from core.api.grpc.emane_pb2 import NodeEmaneConfig
 from core.config import ConfigurableOptions
 from core.emane.nodes import EmaneNet, EmaneOptions
@@ -17,7 +18,7 @@ from core.emulator.data import InterfaceData, LinkData, LinkOptions
 from core.emulator.enumerations import LinkTypes, NodeTypes
 from core.emulator.links import CoreLink
 from core.emulator.session import Session
-from core.errors import CoreError
+from core.errors import CoreCommandError, CoreError
 from core.location.mobility import BasicRangeModel, Ns2ScriptedMobility
 from core.nodes.base import (
     CoreNode,
@@ -702,7 +703,15 @@ def get_hooks(session: Session) -> list[core_pb2.Hook]:
     hooks = []
     for state, state_hooks in session.hook_manager.script_hooks.items():
         for file_name, file_data in state_hooks.items():
-            hook = core_pb2.Hook(state=state.value, file=file_name, data=file_data)
+            options = session.hook_manager.get_options(state, file_name)
+            hook = core_pb2.Hook(
+                state=state.value,
+                file=file_name,
+                data=file_data,
+                detached=options.detached,
+                group=options.group,
+                timeout=options.timeout,
+            )
             hooks.append(hook)
     return hooks
 
@@ -727,26 +736,60 @@ def get_mobility_node(
             context.abort(grpc.StatusCode.NOT_FOUND, "node id is not for wlan or emane")
 
 
-def convert_session(session: Session) -> wrappers.Session:
+def get_node_protos(
+    session: Session, node_ids: Iterable[int] = None
+) -> list[core_pb2.Node]:
     """
-    Convert session to its wrapped version.
+    Convert session nodes to their protobuf representation.
 
-    :param session: session to convert
-    :return: wrapped session data
+    :param session: session containing nodes
+    :param node_ids: ids of nodes to convert, defaults to all nodes
+    :return: node protos
     """
     emane_configs = get_emane_model_configs_dict(session)
+    if node_ids is None:
+        node_ids = list(session.nodes)
     nodes = []
-    links = []
-    for _id in session.nodes:
-        node = session.nodes[_id]
+    for _id in node_ids:
+        node = session.nodes.get(_id)
+        if node is None:
+            continue
         node_emane_configs = emane_configs.get(node.id, [])
         node_proto = get_node_proto(session, node, node_emane_configs)
         nodes.append(node_proto)
+    return nodes
+
+
+def get_session_links(session: Session) -> list[core_pb2.Link]:
+    """
+    Convert all session links, wired and wireless, to their protobuf representation.
+
+    :param session: session to get links for
+    :return: link protos
+    """
+    links = []
+    for node in list(session.nodes.values()):
         if isinstance(node, (WlanNode, EmaneNet)):
             for link_data in node.links():
                 links.append(convert_link_data(link_data))
     for core_link in session.link_manager.links():
         links.extend(convert_core_link(core_link))
+    return links
+
+
+def convert_session(session: Session, full: bool = True) -> core_pb2.Session:
+    """
+    Convert session to its protobuf representation.
+
+    :param session: session to convert
+    :param full: True to include nodes and links, False for session level data only
+    :return: session proto
+    """
+    nodes = []
+    links = []
+    if full:
+        nodes = get_node_protos(session)
+        links = get_session_links(session)
     x, y, z = session.location.refxyz
     lat, lon, alt = session.location.refgeo
     location = core_pb2.SessionLocation(
@@ -821,3 +864,25 @@ def configure_node(
 
 def get_optional(message: Message, name: str) -> Any | None:
     return getattr(message, name) if message.HasField(name) else None
+
+
+def node_command(
+    node: CoreNode, command: str, wait: bool, shell: bool
+) -> tuple[int, str]:
+    """
+    Run a command on a node, capturing a failed command as its exit status and
+    error output.
+
+    :param node: node to run command on
+    :param command: command to run
+    :param wait: True to wait for status, False otherwise
+    :param shell: True to use shell, False otherwise
+    :return: return code and output
+    """
+    try:
+        output = node.cmd(command, wait, shell)
+        return_code = 0
+    except CoreCommandError as e:
+        output = e.stderr
+        return_code = e.returncode
+    return return_code, output
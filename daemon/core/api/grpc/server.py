@@ -5,15 +5,16 @@ import signal
 import sys
 import tempfile
 import time
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from concurrent import futures
 from pathlib import Path
+from queue import Empty
 from re import Pattern
 
 import grpc
 from grpc import ServicerContext
 
-from core import utils
+from core import metrics, utils
 from core.api.grpc import common_pb2, core_pb2, core_pb2_grpc, grpcutils, services_pb2
 from core.api.grpc.core_pb2 import (
     ExecuteScriptResponse,
@@ -76,12 +77,15 @@ from core.emane.modelmanager import EmaneModelManager
 from core.emulator.coreemu import CoreEmu
 from core.emulator.data import InterfaceData, LinkData, LinkOptions
 from core.emulator.enumerations import AlertLevels, EventTypes, MessageFlags, NodeTypes
+from core.emulator.hooks import HookOptions
+from core.emulator.recorder import DEFAULT_INTERVAL, SessionRecorder
 from core.emulator.session import NT, Session
 from core.errors import CoreCommandError, CoreError
 from core.location.mobility import BasicRangeModel, Ns2ScriptedMobility
 from core.nodes.base import CoreNode, NodeBase
 from core.nodes.network import CoreNetwork, WlanNode
 from core.nodes.wireless import WirelessNode
+from core.player import QueuePlayerWriter
 from core.services.base import (
     CoreService,
     CustomCoreService,
@@ -93,6 +97,32 @@ from core.xml.corexml import CoreXmlWriter
 logger = logging.getLogger(__name__)
 _INTERFACE_REGEX: Pattern[str] = re.compile(r"beth(?P<node>[0-9a-fA-F]+)")
 _MAX_WORKERS = 1000
+_COMMAND_WORKERS: int = 16
+_STREAM_TIMEOUT: float = 0.5
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """
+    Records handler latency for unary response rpcs, when metrics are enabled.
+    Streaming response rpcs are long lived and not recorded.
+    """
+
+    def intercept_service(
+        self,
+        continuation: Callable[[grpc.HandlerCallDetails], grpc.RpcMethodHandler],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return handler
+        name = handler_call_details.method.rsplit("/", 1)[-1]
+        if handler.unary_unary:
+            func = metrics.timed("grpc", name)(handler.unary_unary)
+            handler = handler._replace(unary_unary=func)
+        elif handler.stream_unary:
+            func = metrics.timed("grpc", name)(handler.stream_unary)
+            handler = handler._replace(stream_unary=func)
+        return handler
 
 
 class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
@@ -130,7 +160,10 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
 
     def listen(self, address: str) -> None:
         logger.info("CORE gRPC API listening on: %s", address)
-        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=_MAX_WORKERS))
+        self.server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=_MAX_WORKERS),
+            interceptors=[MetricsInterceptor()],
+        )
         core_pb2_grpc.add_CoreApiServicer_to_server(self, self.server)
         self.server.add_insecure_port(address)
         self.server.start()
@@ -154,6 +187,21 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
             context.abort(grpc.StatusCode.NOT_FOUND, f"session {session_id} not found")
         return session
 
+    def get_session_proto(self, session: Session) -> core_pb2.Session:
+        """
+        Retrieve the protobuf representation of a session, reusing the snapshot
+        converted for the current session revision when available.
+
+        :param session: session to get proto for
+        :return: session proto
+        """
+        revision, session_proto = session.revisions.get_snapshot()
+        if session_proto is None:
+            session_proto = grpcutils.convert_session(session)
+            session_proto.revision = revision
+            session.revisions.set_snapshot(revision, session_proto)
+        return session_proto
+
     def get_node(
         self, session: Session, node_id: int, context: ServicerContext, _class: type[NT]
     ) -> NT:
@@ -231,6 +279,31 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         emane_models = [x.name for x in EmaneModelManager.models.values()]
         return core_pb2.GetConfigResponse(services=services, emane_models=emane_models)
 
+    def GetMetrics(
+        self, request: core_pb2.GetMetricsRequest, context: ServicerContext
+    ) -> core_pb2.GetMetricsResponse:
+        """
+        Retrieve recorded metrics for emulator operations.
+
+        :param request: get metrics request
+        :param context: context object
+        :return: get metrics response
+        """
+        metrics_protos = []
+        for (name, label), histogram in metrics.METRICS.get(request.reset).items():
+            metric_proto = core_pb2.Metric(
+                name=name,
+                label=label,
+                count=histogram.count,
+                total=histogram.total,
+                bounds=metrics.BUCKETS,
+                buckets=histogram.buckets,
+            )
+            metrics_protos.append(metric_proto)
+        return core_pb2.GetMetricsResponse(
+            enabled=metrics.METRICS.enabled, metrics=metrics_protos
+        )
+
     def StartSession(
         self, request: core_pb2.StartSessionRequest, context: ServicerContext
     ) -> core_pb2.StartSessionResponse:
@@ -263,8 +336,9 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         session.parse_options()
 
         # add servers
-        for server in request.session.servers:
-            session.distributed.add_server(server.name, server.host)
+        servers = [(x.name, x.host) for x in request.session.servers]
+        session.distributed.add_servers(servers)
+        session.revisions.session_changed()
 
         # location
         if request.session.HasField("location"):
@@ -273,7 +347,8 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         # add all hooks
         for hook in request.session.hooks:
             state = EventTypes(hook.state)
-            session.add_hook(state, hook.file, hook.data)
+            options = HookOptions(hook.detached, hook.group, hook.timeout)
+            session.add_hook(state, hook.file, hook.data, options)
 
         # create nodes
         _, exceptions = grpcutils.create_nodes(session, request.session.nodes)
@@ -285,6 +360,7 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         for node in request.session.nodes:
             core_node = self.get_node(session, node.id, context, NodeBase)
             grpcutils.configure_node(session, node, core_node, context)
+            session.revisions.node_changed(core_node.id)
 
         # create links
         links = []
@@ -355,9 +431,8 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         logger.debug("create session: %s", request)
         session = self.coreemu.create_session(request.session_id)
         session.set_state(EventTypes.DEFINITION_STATE)
-        session.location.setrefgeo(47.57917, -122.13232, 2.0)
-        session.location.refscale = 150.0
-        session_proto = grpcutils.convert_session(session)
+        session.set_location(47.57917, -122.13232, 2.0, 150.0)
+        session_proto = self.get_session_proto(session)
         return core_pb2.CreateSessionResponse(session=session_proto)
 
     def DeleteSession(
@@ -424,9 +499,40 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         """
         logger.debug("get session: %s", request)
         session = self.get_session(request.session_id, context)
-        session_proto = grpcutils.convert_session(session)
+        session_proto = self.get_session_proto(session)
         return core_pb2.GetSessionResponse(session=session_proto)
 
+    def GetSessionChanges(
+        self, request: core_pb2.GetSessionChangesRequest, context: ServicerContext
+    ) -> core_pb2.GetSessionChangesResponse:
+        """
+        Retrieve changes made to a session since a given revision.
+
+        :param request: get session changes request
+        :param context: context object
+        :return: get session changes response
+        """
+        logger.debug("get session changes: %s", request)
+        session = self.get_session(request.session_id, context)
+        changes = session.revisions.get_changes(request.revision)
+        if changes.full:
+            session_proto = self.get_session_proto(session)
+            return core_pb2.GetSessionChangesResponse(
+                revision=session_proto.revision, full=True, session=session_proto
+            )
+        session_proto = grpcutils.convert_session(session, full=False)
+        session_proto.revision = changes.revision
+        nodes = grpcutils.get_node_protos(session, sorted(changes.node_ids))
+        links = grpcutils.get_session_links(session) if changes.links else None
+        return core_pb2.GetSessionChangesResponse(
+            revision=changes.revision,
+            session=session_proto,
+            nodes=nodes,
+            deleted_node_ids=sorted(changes.deleted_node_ids),
+            links_changed=changes.links,
+            links=links,
+        )
+
     def SessionAlert(
         self, request: core_pb2.SessionAlertRequest, context: ServicerContext
     ) -> core_pb2.SessionAlertResponse:
@@ -451,6 +557,34 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         streamer.remove_handlers()
         self._cancel_stream(context)
 
+    def RecordSession(
+        self, request: core_pb2.RecordSessionRequest, context: ServicerContext
+    ) -> None:
+        """
+        Record session activity, streaming it in core player file format.
+
+        :param request: record session request
+        :param context: context object
+        :return: nothing
+        """
+        session = self.get_session(request.session_id, context)
+        interval = request.interval or DEFAULT_INTERVAL
+        writer = QueuePlayerWriter()
+        recorder = SessionRecorder(session, writer, interval, request.min_distance)
+        recorder.start()
+        try:
+            while self._is_running(context):
+                try:
+                    data = writer.queue.get(timeout=1)
+                except Empty:
+                    continue
+                if data is None:
+                    break
+                yield core_pb2.RecordSessionResponse(data=data)
+        finally:
+            recorder.stop()
+        self._cancel_stream(context)
+
     def Throughputs(
         self, request: core_pb2.ThroughputsRequest, context: ServicerContext
     ) -> None:
@@ -671,13 +805,99 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         logger.debug("sending node command: %s", request)
         session = self.get_session(request.session_id, context)
         node = self.get_node(session, request.node_id, context, CoreNode)
+        return_code, output = grpcutils.node_command(
+            node, request.command, request.wait, request.shell
+        )
+        return core_pb2.NodeCommandResponse(output=output, return_code=return_code)
+
+    def NodeCommandStream(
+        self, request: core_pb2.NodeCommandStreamRequest, context: ServicerContext
+    ) -> None:
+        """
+        Run command on a node, streaming output as it is produced and stopping
+        the command when the stream is cancelled. Nodes on distributed servers
+        provide output once the command completes.
+
+        :param request: node command stream request
+        :param context: context object
+        :return: nothing
+        """
+        logger.debug("sending node command stream: %s", request)
+        session = self.get_session(request.session_id, context)
+        node = self.get_node(session, request.node_id, context, CoreNode)
+        if node.server:
+            return_code, output = grpcutils.node_command(
+                node, request.command, True, request.shell
+            )
+            yield core_pb2.NodeCommandStreamResponse(
+                stdout=output.encode(), done=True, return_code=return_code
+            )
+            return
         try:
-            output = node.cmd(request.command, request.wait, request.shell)
-            return_code = 0
+            stream = node.cmd_stream(request.command, request.shell)
         except CoreCommandError as e:
-            output = e.stderr
-            return_code = e.returncode
-        return core_pb2.NodeCommandResponse(output=output, return_code=return_code)
+            yield core_pb2.NodeCommandStreamResponse(
+                stderr=e.stderr.encode(), done=True, return_code=e.returncode
+            )
+            return
+        try:
+            while self._is_running(context):
+                stdout, stderr = stream.read(_STREAM_TIMEOUT)
+                if stdout or stderr:
+                    yield core_pb2.NodeCommandStreamResponse(
+                        stdout=stdout, stderr=stderr
+                    )
+                elif stream.done:
+                    return_code = stream.poll()
+                    if return_code is not None:
+                        yield core_pb2.NodeCommandStreamResponse(
+                            done=True, return_code=return_code
+                        )
+                        break
+        finally:
+            stream.stop()
+
+    def NodesCommand(
+        self, request: core_pb2.NodesCommandRequest, context: ServicerContext
+    ) -> None:
+        """
+        Run command on a set of nodes with bounded concurrency, streaming the
+        result for each node as it completes.
+
+        :param request: nodes command request
+        :param context: context object
+        :return: nothing
+        """
+        logger.debug("sending nodes command: %s", request)
+        session = self.get_session(request.session_id, context)
+        nodes = [self.get_node(session, x, context, CoreNode) for x in request.node_ids]
+        if not nodes:
+            return
+        workers = min(request.concurrency or _COMMAND_WORKERS, len(nodes))
+        executor = futures.ThreadPoolExecutor(max_workers=workers)
+        pending = {}
+        for node in nodes:
+            future = executor.submit(
+                grpcutils.node_command,
+                node,
+                request.command,
+                request.wait,
+                request.shell,
+            )
+            pending[future] = node.id
+        try:
+            while pending and self._is_running(context):
+                done, _ = futures.wait(
+                    pending, _STREAM_TIMEOUT, futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    node_id = pending.pop(future)
+                    return_code, output = future.result()
+                    yield core_pb2.NodesCommandResponse(
+                        node_id=node_id, output=output, return_code=return_code
+                    )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def GetNodeTerminal(
         self, request: core_pb2.GetNodeTerminalRequest, context: ServicerContext
@@ -863,6 +1083,7 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
             Ns2ScriptedMobility.name,
             dict(mobility_config.config),
         )
+        session.revisions.node_changed(mobility_config.node_id)
         return SetMobilityConfigResponse(result=True)
 
     def MobilityAction(
@@ -971,6 +1192,7 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         node_id = request.wlan_config.node_id
         config = dict(request.wlan_config.config)
         session.mobility.set_model_config(node_id, BasicRangeModel.name, config)
+        session.revisions.node_changed(node_id)
         if session.is_running():
             node = self.get_node(session, node_id, context, WlanNode)
             node.updatemodel(config)
@@ -1011,6 +1233,7 @@ class CoreGrpcServer(core_pb2_grpc.CoreApiServicer):
         model_config = request.emane_model_config
         _id = utils.iface_config_id(model_config.node_id, model_config.iface_id)
         session.emane.set_config(_id, model_config.model, dict(model_config.config))
+        session.revisions.node_changed(model_config.node_id)
         return SetEmaneModelConfigResponse(result=True)
 
     def SaveXml(
@@ -241,6 +241,38 @@ class CpuUsageEvent:
         return CpuUsageEvent(usage=proto.usage)
 
 
+@dataclass
+class NodeCommandOutput:
+    stdout: bytes
+    stderr: bytes
+    done: bool
+    return_code: int
+
+    @classmethod
+    def from_proto(
+        cls, proto: core_pb2.NodeCommandStreamResponse
+    ) -> "NodeCommandOutput":
+        return NodeCommandOutput(
+            stdout=proto.stdout,
+            stderr=proto.stderr,
+            done=proto.done,
+            return_code=proto.return_code,
+        )
+
+
+@dataclass
+class NodeCommandResult:
+    node_id: int
+    return_code: int
+    output: str
+
+    @classmethod
+    def from_proto(cls, proto: core_pb2.NodesCommandResponse) -> "NodeCommandResult":
+        return NodeCommandResult(
+            node_id=proto.node_id, return_code=proto.return_code, output=proto.output
+        )
+
+
 @dataclass
 class SessionLocation:
     x: float
@@ -533,13 +565,30 @@ class Hook:
     state: SessionState
     file: str
     data: str
+    detached: bool = False
+    group: str = ""
+    timeout: float = 0.0
 
     @classmethod
     def from_proto(cls, proto: core_pb2.Hook) -> "Hook":
-        return Hook(state=SessionState(proto.state), file=proto.file, data=proto.data)
+        return Hook(
+            state=SessionState(proto.state),
+            file=proto.file,
+            data=proto.data,
+            detached=proto.detached,
+            group=proto.group,
+            timeout=proto.timeout,
+        )
 
     def to_proto(self) -> core_pb2.Hook:
-        return core_pb2.Hook(state=self.state.value, file=self.file, data=self.data)
+        return core_pb2.Hook(
+            state=self.state.value,
+            file=self.file,
+            data=self.data,
+            detached=self.detached,
+            group=self.group,
+            timeout=self.timeout,
+        )
 
 
 @dataclass
@@ -738,6 +787,7 @@ class Session:
     file: Path = None
     options: dict[str, ConfigOption] = field(default_factory=dict)
     servers: list[Server] = field(default_factory=list)
+    revision: int = 0
 
     @classmethod
     def from_proto(cls, proto: core_pb2.Session) -> "Session":
@@ -762,6 +812,7 @@ class Session:
             file=file_path,
             options=options,
             servers=servers,
+            revision=proto.revision,
         )
 
     def to_proto(self) -> core_pb2.Session:
@@ -791,8 +842,30 @@ class Session:
             file=file,
             options=options,
             servers=servers,
+            revision=self.revision,
         )
 
+    def apply_changes(self, changes: "SessionChanges") -> "Session":
+        """
+        Create an updated session, by applying changes retrieved for the revision
+        of this session.
+
+        :param changes: changes to apply
+        :return: updated session
+        """
+        if changes.full:
+            return changes.session
+        nodes = {k: v for k, v in self.nodes.items()}
+        for node_id in changes.deleted_node_ids:
+            nodes.pop(node_id, None)
+        for node in changes.nodes:
+            nodes[node.id] = node
+        links = changes.links if changes.links_changed else self.links
+        session = changes.session
+        session.nodes = nodes
+        session.links = links
+        return session
+
     def add_node(
         self,
         _id: int,
@@ -845,6 +918,29 @@ class Session:
             self.options[key] = option
 
 
+@dataclass
+class SessionChanges:
+    revision: int
+    full: bool
+    session: Session
+    nodes: list[Node]
+    deleted_node_ids: list[int]
+    links_changed: bool
+    links: list[Link]
+
+    @classmethod
+    def from_proto(cls, proto: core_pb2.GetSessionChangesResponse) -> "SessionChanges":
+        return SessionChanges(
+            revision=proto.revision,
+            full=proto.full,
+            session=Session.from_proto(proto.session),
+            nodes=[Node.from_proto(x) for x in proto.nodes],
+            deleted_node_ids=list(proto.deleted_node_ids),
+            links_changed=proto.links_changed,
+            links=[Link.from_proto(x) for x in proto.links],
+        )
+
+
 @dataclass
 class CoreConfig:
     services: list[Service] = field(default_factory=list)
@@ -856,6 +952,27 @@ class CoreConfig:
         return CoreConfig(services=services, emane_models=list(proto.emane_models))
 
 
+@dataclass
+class Metric:
+    name: str
+    label: str
+    count: int
+    total: float
+    bounds: list[float] = field(default_factory=list)
+    buckets: list[int] = field(default_factory=list)
+
+    @classmethod
+    def from_proto(cls, proto: core_pb2.Metric) -> "Metric":
+        return Metric(
+            name=proto.name,
+            label=proto.label,
+            count=proto.count,
+            total=proto.total,
+            bounds=list(proto.bounds),
+            buckets=list(proto.buckets),
+        )
+
+
 @dataclass
 class LinkEvent:
     message_type: MessageType
@@ -4,8 +4,11 @@ Implements configuration and control of an EMANE emulation.
 
 import logging
 import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from core import utils
 from core.emane.emanemodel import EmaneModel
@@ -18,6 +21,7 @@ from core.emulator.enumerations import LinkTypes, MessageFlags
 from core.errors import CoreCommandError, CoreError
 from core.nodes.base import CoreNode, NodeBase
 from core.nodes.interface import CoreInterface
+from core.nodes.linkwatcher import LinkWatcher
 from core.xml import emanexml
 
 logger = logging.getLogger(__name__)
@@ -35,6 +39,7 @@ except ImportError:
         logger.debug("compatible emane python bindings not installed")
 
 DEFAULT_LOG_LEVEL: int = 3
+STARTUP_WORKERS: int = 16
 
 
 class EmaneState(Enum):
@@ -43,6 +48,19 @@ class EmaneState(Enum):
     NOT_READY = 2
 
 
+@dataclass
+class NemStartup:
+    """
+    Data allocated up front for a nem, used by the later stages of startup.
+    """
+
+    emane_net: EmaneNet
+    iface: TunTap
+    nem_id: int
+    nem_port: int
+    config: dict[str, str]
+
+
 class EmaneManager:
     """
     EMANE controller object. Lives in a Session instance and is used for
@@ -72,6 +90,8 @@ class EmaneManager:
             "emane_transform_port", 8200
         )
         self.doeventloop: bool = False
+        self.startup_times: dict[str, float] = {}
+        self.link_watcher: LinkWatcher = LinkWatcher()
         self.eventmonthread: threading.Thread | None = None
 
         # model for global EMANE configuration options
@@ -250,12 +270,62 @@ class EmaneManager:
         return EmaneState.SUCCESS
 
     def startup_nodes(self) -> None:
+        """
+        Start all emane nems as a pipeline of stages. Nem ids, ports and control
+        channels are set up serially in a deterministic order, then xml files are
+        built, daemons started and interfaces installed concurrently across nems.
+
+        :return: nothing
+        """
         with self._emane_node_lock:
+            self.startup_times.clear()
+            start = time.monotonic()
+            nems = [self.allocate_nem(x, y) for x, y in self.get_ifaces()]
+            self.startup_times["allocate"] = time.monotonic() - start
+            start = time.monotonic()
+            for nem in nems:
+                self.setup_control_channels(nem.nem_id, nem.iface, nem.config)
+            self.startup_times["control"] = time.monotonic() - start
             logger.info("emane building xmls...")
-            for emane_net, iface in self.get_ifaces():
-                self.start_iface(emane_net, iface)
+            funcs = [(self.build_nem_xml, (x,), {}) for x in nems]
+            self.run_stage("xml", funcs)
+            funcs = [(self.start_daemon, (x.iface,), {}) for x in nems]
+            self.run_stage("daemons", funcs)
+            self.install_ifaces(nems)
+            logger.info(
+                "emane started %s nems: %s",
+                len(nems),
+                ", ".join(f"{k}({v:.3f}s)" for k, v in self.startup_times.items()),
+            )
 
-    def start_iface(self, emane_net: EmaneNet, iface: TunTap) -> None:
+    def run_stage(
+        self, name: str, funcs: list[tuple[Callable, Iterable[Any], dict[Any, Any]]]
+    ) -> None:
+        """
+        Run a startup stage concurrently, recording the time it took.
+
+        :param name: name of stage
+        :param funcs: functions to run, with args and kwargs
+        :return: nothing
+        :raises CoreError: when any function fails
+        """
+        start = time.monotonic()
+        _, exceptions = utils.threadpool(funcs, STARTUP_WORKERS)
+        self.startup_times[name] = time.monotonic() - start
+        if exceptions:
+            raise CoreError(
+                f"emane startup stage({name}) failed for {len(exceptions)} nems: "
+                f"{exceptions[0]}"
+            ) from exceptions[0]
+
+    def allocate_nem(self, emane_net: EmaneNet, iface: TunTap) -> NemStartup:
+        """
+        Allocate a nem id and port for an interface and retrieve its configuration.
+
+        :param emane_net: emane network interface is connected to
+        :param iface: interface to allocate a nem for
+        :return: allocated nem data
+        """
         nem_id = self.next_nem_id(iface)
         nem_port = self.get_nem_port(iface)
         logger.info(
@@ -265,10 +335,25 @@ class EmaneManager:
             nem_id,
         )
         config = self.get_iface_config(emane_net, iface)
-        self.setup_control_channels(nem_id, iface, config)
-        emanexml.build_platform_xml(nem_id, nem_port, emane_net, iface, config)
+        return NemStartup(emane_net, iface, nem_id, nem_port, config)
+
+    def build_nem_xml(self, nem: NemStartup) -> None:
+        """
+        Build the platform and model xml files for a nem.
+
+        :param nem: nem to build xml files for
+        :return: nothing
+        """
+        emanexml.build_platform_xml(
+            nem.nem_id, nem.nem_port, nem.emane_net, nem.iface, nem.config
+        )
+
+    def start_iface(self, emane_net: EmaneNet, iface: TunTap) -> None:
+        nem = self.allocate_nem(emane_net, iface)
+        self.setup_control_channels(nem.nem_id, iface, nem.config)
+        self.build_nem_xml(nem)
         self.start_daemon(iface)
-        self.install_iface(iface, config)
+        self.install_iface(iface, nem.config)
 
     def get_ifaces(self) -> list[tuple[EmaneNet, TunTap]]:
         ifaces = []
@@ -345,19 +430,40 @@ class EmaneManager:
         :param iface: interface to get nem emane position for
         :return: nem position tuple, None otherwise
         """
-        nem_id = self.get_nem_id(iface)
-        if nem_id is None:
-            logger.info("nem for %s is unknown", iface.localname)
-            return
-        node = iface.node
-        x, y, z = node.getposition()
-        lat, lon, alt = self.session.location.getgeo(x, y, z)
-        if node.position.alt is not None:
-            alt = node.position.alt
-        node.position.set_geo(lon, lat, alt)
-        # altitude must be an integer or warning is printed
-        alt = int(round(alt))
-        return nem_id, lon, lat, alt
+        positions = self.get_nem_positions([iface])
+        return positions[0] if positions else None
+
+    def get_nem_positions(
+        self, ifaces: list[CoreInterface]
+    ) -> list[tuple[int, float, float, int]]:
+        """
+        Retrieves nem positions for the given interfaces, converting all node
+        positions to geo coordinates with a single transform.
+
+        :param ifaces: interfaces to get nem emane positions for
+        :return: nem position tuples, for interfaces with a known nem
+        """
+        nodes = []
+        nem_ids = []
+        for iface in ifaces:
+            nem_id = self.get_nem_id(iface)
+            if nem_id is None:
+                logger.info("nem for %s is unknown", iface.localname)
+                continue
+            nem_ids.append(nem_id)
+            nodes.append(iface.node)
+        xyzs = [node.getposition() for node in nodes]
+        geos = self.session.location.getgeo_many(xyzs)
+        positions = []
+        for nem_id, node, (lat, lon, alt) in zip(nem_ids, nodes, geos):
+            # altitude is kept once known, node position acts as the cache
+            if node.position.alt is not None:
+                alt = node.position.alt
+            node.position.set_geo(lon, lat, alt)
+            # altitude must be an integer or warning is printed
+            alt = int(round(alt))
+            positions.append((nem_id, lon, lat, alt))
+        return positions
 
     def set_nem_position(self, iface: CoreInterface) -> None:
         """
@@ -365,27 +471,27 @@ class EmaneManager:
 
         :param iface: interface to set nem position for
         """
-        position = self.get_nem_position(iface)
-        if position:
-            nem_id, lon, lat, alt = position
-            self.event_manager.publish_location(nem_id, lon, lat, alt)
+        self.set_nem_positions([iface])
 
     def set_nem_positions(self, moved_ifaces: list[CoreInterface]) -> None:
         """
         Several NEMs have moved, from e.g. a WaypointMobilityModel
         calculation. Generate an EMANE Location Event having several
-        entries for each interface that has moved.
+        entries for each interface that has moved, one per event service.
+
+        :param moved_ifaces: interfaces that have moved
+        :return: nothing
         """
         if not moved_ifaces:
             return
-        positions = []
-        for iface in moved_ifaces:
-            position = self.get_nem_position(iface)
-            if not position:
-                continue
-            nem_id, lon, lat, alt = position
-            positions.append((nem_id, lon, lat, alt))
+        start = time.monotonic()
+        positions = self.get_nem_positions(moved_ifaces)
         self.event_manager.publish_locations(positions)
+        logger.debug(
+            "published %s nem positions in %.4fs",
+            len(positions),
+            time.monotonic() - start,
+        )
 
     def write_nem(self, iface: CoreInterface, nem_id: int) -> None:
         path = self.session.directory / "emane_nems"
@@ -403,6 +509,7 @@ class EmaneManager:
         Retransmit location events now that all NEMs are active.
         """
         events_enabled = self.genlocationevents()
+        moved_ifaces = []
         with self._emane_node_lock:
             for node_id in sorted(self._emane_nets):
                 emane_net = self._emane_nets[node_id]
@@ -411,8 +518,9 @@ class EmaneManager:
                 )
                 for iface in emane_net.get_ifaces():
                     emane_net.wireless_model.post_startup(iface)
-                    if events_enabled:
-                        iface.setposition()
+                    if events_enabled and iface.node:
+                        moved_ifaces.append(iface)
+            self.set_nem_positions(moved_ifaces)
 
     def reset(self) -> None:
         """
@@ -430,6 +538,7 @@ class EmaneManager:
         """
         stop all EMANE daemons
         """
+        self.link_watcher.stop()
         with self._emane_node_lock:
             if not self._emane_nets:
                 return
@@ -543,6 +652,27 @@ class EmaneManager:
             iface.poshook = self.set_nem_position
             iface.setposition()
 
+    def install_ifaces(self, nems: list[NemStartup]) -> None:
+        """
+        Install interfaces for started nems, waiting on each device concurrently,
+        and publish their initial positions as a single location event.
+
+        :param nems: started nems to install interfaces for
+        :return: nothing
+        """
+        funcs = []
+        for nem in nems:
+            if nem.config.get("external", "0") == "0":
+                funcs.append((nem.iface.set_ips, (), {}))
+        self.run_stage("install", funcs)
+        if self.genlocationevents():
+            start = time.monotonic()
+            ifaces = [x.iface for x in nems]
+            for iface in ifaces:
+                iface.poshook = self.set_nem_position
+            self.set_nem_positions([x for x in ifaces if x.node])
+            self.startup_times["positions"] = time.monotonic() - start
+
     def doeventmonitor(self) -> bool:
         """
         Returns boolean whether or not EMANE events will be monitored.
@@ -557,8 +687,10 @@ class EmaneManager:
 
     def handlelocationevent(self, events: LocationEvent) -> None:
         """
-        Handle an EMANE location event.
+        Handle an EMANE location event, converting all contained locations to
+        x,y,z coordinates together.
         """
+        nem_ids, geos = [], []
         for event in events:
             txnemid, attrs = event
             if (
@@ -573,7 +705,11 @@ class EmaneManager:
             lon = attrs["longitude"]
             alt = attrs["altitude"]
             logger.debug("emane location event: %s,%s,%s", lat, lon, alt)
-            self.handlelocationeventtoxyz(txnemid, lat, lon, alt)
+            nem_ids.append(txnemid)
+            geos.append((lat, lon, alt))
+        positions = self.session.location.getxyz_many(geos)
+        for nem_id, geo, position in zip(nem_ids, geos, positions):
+            self.set_location(nem_id, geo, position)
 
     def handlelocationeventtoxyz(
         self, nemid: int, lat: float, lon: float, alt: float
@@ -583,6 +719,24 @@ class EmaneManager:
         into a node and x,y,z coordinate values, sending a Node Message.
         Returns True if successfully parsed and a Node Message was sent.
         """
+        position = self.session.location.getxyz(lat, lon, alt)
+        return self.set_location(nemid, (lat, lon, alt), position)
+
+    def set_location(
+        self,
+        nemid: int,
+        geo: tuple[float, float, float],
+        position: tuple[float, float, float],
+    ) -> bool:
+        """
+        Set the location of the node associated with a NEM, from its received
+        lat,lon,alt and converted x,y,z coordinates, sending a Node Message.
+
+        :param nemid: nem id location is for
+        :param geo: received lat,lon,alt
+        :param position: x,y,z converted from received location
+        :return: True if a Node Message was sent, False otherwise
+        """
         # convert nemid to node number
         iface = self.get_iface(nemid)
         if iface is None:
@@ -590,8 +744,8 @@ class EmaneManager:
             return False
 
         n = iface.node.id
-        # convert from lat/long/alt to x,y,z coordinates
-        x, y, z = self.session.location.getxyz(lat, lon, alt)
+        lat, lon, alt = geo
+        x, y, z = position
         x = int(x)
         y = int(y)
         z = int(z)
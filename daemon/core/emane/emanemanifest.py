@@ -1,4 +1,5 @@
 import logging
+from copy import deepcopy
 from pathlib import Path
 
 from core.config import Configuration
@@ -16,6 +17,9 @@ except ImportError:
         manifest = None
         logger.debug("compatible emane python bindings not installed")
 
+# parsed manifests, keyed by manifest path and defaults
+MANIFEST_CACHE: dict[str, list[Configuration]] = {}
+
 
 def _type_value(config_type: str) -> ConfigDataTypes:
     """
@@ -55,6 +59,18 @@ def _get_default(config_type_name: str, config_value: list[str]) -> str:
     return config_default
 
 
+def get_cache_key(manifest_path: Path, defaults: dict[str, str]) -> str:
+    """
+    Create key used to cache a parsed manifest.
+
+    :param manifest_path: absolute manifest file path
+    :param defaults: default values overridden for the manifest
+    :return: cache key
+    """
+    values = ",".join(f"{k}={v}" for k, v in sorted(defaults.items()))
+    return f"{manifest_path}:{values}"
+
+
 def parse(manifest_path: Path, defaults: dict[str, str]) -> list[Configuration]:
     """
     Parses a valid emane manifest file and converts the provided configuration values
@@ -69,6 +85,12 @@ def parse(manifest_path: Path, defaults: dict[str, str]) -> list[Configuration]:
     if not manifest:
         return []
 
+    # models may modify their configurations, so always provide copies
+    key = get_cache_key(manifest_path, defaults)
+    configurations = MANIFEST_CACHE.get(key)
+    if configurations is not None:
+        return deepcopy(configurations)
+
     # load configuration file
     manifest_file = manifest.Manifest(str(manifest_path))
     manifest_configurations = manifest_file.getAllConfiguration()
@@ -112,4 +134,5 @@ def parse(manifest_path: Path, defaults: dict[str, str]) -> list[Configuration]:
         )
         configurations.append(configuration)
 
+    MANIFEST_CACHE[key] = deepcopy(configurations)
     return configurations
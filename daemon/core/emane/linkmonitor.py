@@ -1,7 +1,9 @@
+import concurrent.futures
 import logging
 import sched
 import threading
 import time
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from lxml import etree
@@ -31,6 +33,7 @@ EMANE_80211: str = "ieee80211abgmaclayer"
 EMANE_TDMA: str = "tdmaeventschedulerradiomodel"
 SINR_TABLE: str = "NeighborStatusTable"
 NEM_SELF: int = 65535
+MAX_WORKERS: int = 32
 
 
 class LossTable:
@@ -109,14 +112,19 @@ class EmaneClient:
             loss_table.mac_id = mac_id
             self.nems[nem_id] = loss_table
 
-    def check_links(
-        self, links: dict[tuple[int, int], EmaneLink], loss_threshold: int
-    ) -> None:
+    def get_links(self, loss_threshold: int) -> list[tuple[int, int, float]]:
+        """
+        Query the sinr tables of monitored nems, for links within the loss
+        threshold.
+
+        :param loss_threshold: loss percentage links must be below
+        :return: from nem, to nem and sinr of valid links
+        """
+        links = []
         for from_nem, loss_table in self.nems.items():
             tables = self.client.getStatisticTable(loss_table.mac_id, (SINR_TABLE,))
             table = tables[SINR_TABLE][1:][0]
             for row in table:
-                row = row
                 to_nem = row[0][0]
                 sinr = row[5][0]
                 age = row[-1][0]
@@ -128,15 +136,10 @@ class EmaneClient:
                     continue
 
                 # check if valid link loss
-                link_key = (from_nem, to_nem)
                 loss = loss_table.get_loss(sinr)
                 if loss < loss_threshold:
-                    link = links.get(link_key)
-                    if link:
-                        link.update(sinr)
-                    else:
-                        link = EmaneLink(from_nem, to_nem, sinr)
-                        links[link_key] = link
+                    links.append((from_nem, to_nem, sinr))
+        return links
 
     def handle_tdma(self, config: dict[str, tuple]):
         pcr = config["pcrcurveuri"][0][0]
@@ -176,10 +179,41 @@ class EmaneClient:
         self.client.stop()
 
 
+@dataclass
+class LinkMonitorStats:
+    """
+    Statistics for link monitor polling passes.
+    """
+
+    polls: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    overruns: int = 0
+    skipped: int = 0
+    errors: int = 0
+
+    def update(self, duration: float, interval: float) -> None:
+        """
+        Record a completed polling pass.
+
+        :param duration: time taken by the pass in seconds
+        :param interval: interval passes are expected to complete within
+        :return: nothing
+        """
+        self.polls += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        if duration > interval:
+            self.overruns += 1
+
+
 class EmaneLinkMonitor:
     def __init__(self, emane_manager: "EmaneManager") -> None:
         self.emane_manager: "EmaneManager" = emane_manager
         self.clients: list[EmaneClient] = []
+        self.executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self.pending: dict[EmaneClient, concurrent.futures.Future] = {}
+        self.stats: LinkMonitorStats = LinkMonitorStats()
         self.links: dict[tuple[int, int], EmaneLink] = {}
         self.complete_links: set[tuple[int, int]] = set()
         self.loss_threshold: int | None = None
@@ -193,9 +227,15 @@ class EmaneLinkMonitor:
         self.loss_threshold = options.get_int("loss_threshold")
         self.link_interval = options.get_int("link_interval")
         self.link_timeout = options.get_int("link_timeout")
+        self.stats = LinkMonitorStats()
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_WORKERS, thread_name_prefix="emane-links"
+        )
         self.initialize()
         if not self.clients:
             logger.info("no valid emane models to monitor links")
+            self.executor.shutdown(wait=False)
+            self.executor = None
             return
         self.scheduler = sched.scheduler()
         self.scheduler.enter(0, 0, self.check_links)
@@ -205,8 +245,13 @@ class EmaneLinkMonitor:
 
     def initialize(self) -> None:
         addresses = self.get_addresses()
-        for address, port in addresses:
-            client = EmaneClient(address, port)
+        futures = [self.executor.submit(EmaneClient, *x) for x in addresses]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                client = future.result()
+            except shell.ControlPortException:
+                logger.exception("error connecting to emane control port")
+                continue
             if client.nems:
                 self.clients.append(client)
 
@@ -229,15 +274,70 @@ class EmaneLinkMonitor:
                     addresses.append((control, port))
         return addresses
 
+    def poll_links(self, deadline: float) -> None:
+        """
+        Query all clients concurrently, updating links as each client responds.
+        Clients still busy with a previous query are skipped, and queries not
+        complete by the deadline are left to finish in the background.
+
+        :param deadline: monotonic time to stop waiting for responses at
+        :return: nothing
+        """
+        executor = self.executor
+        if executor is None:
+            return
+        futures = {}
+        pending = {}
+        for client in self.clients:
+            future = self.pending.get(client)
+            if future and not future.done():
+                # keep tracking unfinished queries, so they remain skipped
+                self.stats.skipped += 1
+                pending[client] = future
+                continue
+            try:
+                future = executor.submit(client.get_links, self.loss_threshold)
+            except RuntimeError:
+                # monitor was stopped
+                return
+            futures[future] = client
+        self.pending = pending
+        timeout = max(deadline - time.monotonic(), 0)
+        try:
+            for future in concurrent.futures.as_completed(futures, timeout):
+                try:
+                    links = future.result()
+                except shell.ControlPortException:
+                    self.stats.errors += 1
+                    if self.running:
+                        logger.exception("link monitor error")
+                    continue
+                self.update_links(links)
+        except concurrent.futures.TimeoutError:
+            for future, client in futures.items():
+                if not future.done():
+                    self.pending[client] = future
+
+    def update_links(self, links: list[tuple[int, int, float]]) -> None:
+        """
+        Update links from the results of a client query.
+
+        :param links: from nem, to nem and sinr of valid links
+        :return: nothing
+        """
+        for from_nem, to_nem, sinr in links:
+            link_key = (from_nem, to_nem)
+            link = self.links.get(link_key)
+            if link:
+                link.update(sinr)
+            else:
+                self.links[link_key] = EmaneLink(from_nem, to_nem, sinr)
+
     def check_links(self) -> None:
+        start = time.monotonic()
         # check for new links
         previous_links = set(self.links.keys())
-        for client in self.clients:
-            try:
-                client.check_links(self.links, self.loss_threshold)
-            except shell.ControlPortException:
-                if self.running:
-                    logger.exception("link monitor error")
+        self.poll_links(start + self.link_interval)
 
         # find new links
         current_links = set(self.links.keys())
@@ -270,8 +370,17 @@ class EmaneLinkMonitor:
                 self.complete_links.add(complete_id)
                 self.send_link(MessageFlags.ADD, complete_id)
 
+        duration = time.monotonic() - start
+        self.stats.update(duration, self.link_interval)
+        if duration > self.link_interval:
+            logger.warning(
+                "emane link check took %.2fs, exceeding interval of %ss",
+                duration,
+                self.link_interval,
+            )
         if self.running:
-            self.scheduler.enter(self.link_interval, 0, self.check_links)
+            delay = max(self.link_interval - duration, 0)
+            self.scheduler.enter(delay, 0, self.check_links)
 
     def get_complete_id(self, link_id: tuple[int, int]) -> tuple[int, int]:
         value1, value2 = link_id
@@ -321,8 +430,12 @@ class EmaneLinkMonitor:
 
     def stop(self) -> None:
         self.running = False
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
         for client in self.clients:
             client.stop()
         self.clients.clear()
+        self.pending.clear()
         self.links.clear()
         self.complete_links.clear()
@@ -16,6 +16,7 @@ from core.nodes.base import CoreNetworkBase, CoreNode, NodeOptions
 from core.nodes.interface import CoreInterface
 
 logger = logging.getLogger(__name__)
+DEVICE_TIMEOUT: float = 10.0
 
 if TYPE_CHECKING:
     from core.emane.emanemodel import EmaneModel
@@ -112,11 +113,23 @@ class TunTap(CoreInterface):
 
     def waitfordevicenode(self) -> None:
         """
-        Check for presence of a node device - tap device may not appear right away waits.
+        Check for presence of a node device - tap device may not appear right away
+        waits. Local nodes are watched for link notifications, falling back to
+        polling when that is not possible or times out.
 
         :return: nothing
         """
         logger.debug("waiting for device node: %s", self.name)
+        if not self.node.server:
+            watcher = self.node.session.emane.link_watcher
+            try:
+                if watcher.wait(self.node.pid, self.name, DEVICE_TIMEOUT):
+                    return
+                logger.warning("timed out watching for device(%s), polling", self.name)
+            except OSError as e:
+                logger.warning(
+                    "unable to watch for device(%s), polling: %s", self.name, e
+                )
         count = 0
         while True:
             result = self.waitfor(self.nodedevexists)
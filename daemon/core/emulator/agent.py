@@ -0,0 +1,124 @@
+"""
+Command agent run on distributed servers, over a single persistent connection.
+
+Reads json requests from stdin, one per line, running each on a worker thread
+and writing a json response for each to stdout as they complete, which may not
+be in the order received. Requests either run a shell command, write a file or
+run a batch of requests in order. This module is sent to servers as source and
+must only depend on the python standard library.
+"""
+
+import base64
+import json
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS: int = 64
+
+
+def run_cmd(request: dict) -> dict:
+    """
+    Run a shell command.
+
+    :param request: command request
+    :return: response with exit status and output
+    """
+    env = request.get("env")
+    cwd = request.get("cwd")
+    cmd = request["cmd"]
+    if not request.get("wait", True):
+        subprocess.Popen(
+            cmd,
+            shell=True,
+            env=env,
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        return dict(status=0, stdout="", stderr="")
+    p = subprocess.run(
+        cmd,
+        shell=True,
+        env=env,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stdout = p.stdout.decode(errors="replace").strip()
+    stderr = p.stderr.decode(errors="replace").strip()
+    return dict(status=p.returncode, stdout=stdout, stderr=stderr)
+
+
+def put_file(request: dict) -> dict:
+    """
+    Write data to a file.
+
+    :param request: file request
+    :return: response with exit status
+    """
+    path = request["path"]
+    data = base64.b64decode(request["data"])
+    with open(path, "wb") as f:
+        f.write(data)
+    mode = request.get("mode")
+    if mode is not None:
+        os.chmod(path, mode)
+    return dict(status=0, stdout="", stderr="")
+
+
+def run_batch(request: dict) -> dict:
+    """
+    Run a batch of requests in order.
+
+    :param request: batch request
+    :return: response with the response for each request
+    """
+    responses = [handle(x) for x in request["requests"]]
+    return dict(status=0, stdout="", stderr="", responses=responses)
+
+
+def handle(request: dict) -> dict:
+    """
+    Handle a request, capturing errors as a failed response.
+
+    :param request: request to handle
+    :return: response for request
+    """
+    try:
+        if request["type"] == "put":
+            response = put_file(request)
+        elif request["type"] == "batch":
+            response = run_batch(request)
+        else:
+            response = run_cmd(request)
+    except Exception as e:
+        response = dict(status=1, stdout="", stderr=str(e))
+    if "id" in request:
+        response["id"] = request["id"]
+    return response
+
+
+def main() -> None:
+    lock = threading.Lock()
+
+    def reply(request: dict) -> None:
+        data = json.dumps(handle(request)) + "\n"
+        with lock:
+            sys.stdout.write(data)
+            sys.stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            executor.submit(reply, json.loads(line))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from collections.abc import Callable
 from typing import TypeVar
 
+from core import metrics
 from core.emulator.data import AlertData, EventData, LinkData, NodeData
 from core.errors import CoreError
 
@@ -14,6 +15,7 @@ class BroadcastManager:
         """
         self.handlers: dict[type[T], set[Callable[[T], None]]] = {}
 
+    @metrics.timed("broadcast", lambda self, data: type(data).__name__)
     def send(self, data: T) -> None:
         """
         Retrieve handlers for data, and run all current handlers.
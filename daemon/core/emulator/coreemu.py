@@ -1,17 +1,18 @@
 import logging
 import os
+import time
 from pathlib import Path
 
-from core import utils
+from core import metrics, utils
 from core.emane.modelmanager import EmaneModelManager
 from core.emulator.session import Session
+from core.emulator.startup import DEFAULT_EMANE_PREFIX, StartupCache
 from core.executables import get_requirements
+from core.services.base import TEMPLATE_CACHE
 from core.services.manager import ServiceManager
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_EMANE_PREFIX: str = "/usr"
-
 
 class CoreEmu:
     """
@@ -34,17 +35,71 @@ class CoreEmu:
         # session management
         self.sessions: dict[int, Session] = {}
 
+        # load cached startup data
+        start = time.perf_counter()
+        self.startup_times: dict[str, float] = {}
+        self.startup_cache: StartupCache = self._load_startup_cache()
+        self._record_startup_time("cache", start)
+
         # load services
         self.service_errors: list[str] = []
         self.service_manager: ServiceManager = ServiceManager()
+        self.service_manager.which = self.startup_cache.which
         self._load_services()
+        self._record_startup_time("services", start)
 
         # check and load emane
         self.has_emane: bool = False
         self._load_emane()
+        self._record_startup_time("emane", start)
+
+        # enable recording metrics
+        metrics.METRICS.enabled = self.config.get("metrics") == "1"
 
         # check executables exist on path
         self._validate_env()
+        self._record_startup_time("validate", start)
+
+        # persist startup data for future starts
+        self.startup_cache.save()
+        self._record_startup_time("save", start)
+        self._report_startup(start)
+
+    def _load_startup_cache(self) -> StartupCache:
+        """
+        Load cached startup data, when a cache file has been configured.
+
+        :return: startup cache
+        """
+        cache_path = self.config.get("startup_cache")
+        cache_path = Path(cache_path) if cache_path else None
+        rebuild = self.config.get("rebuild_cache") == "1"
+        startup_cache = StartupCache(cache_path, rebuild)
+        startup_cache.load(self.config)
+        return startup_cache
+
+    def _record_startup_time(self, name: str, start: float) -> None:
+        """
+        Record time taken for a startup stage, since the prior stage completed.
+
+        :param name: name of stage
+        :param start: time startup began
+        :return: nothing
+        """
+        elapsed = time.perf_counter() - start
+        self.startup_times[name] = elapsed - sum(self.startup_times.values())
+
+    def _report_startup(self, start: float) -> None:
+        """
+        Log a report of time taken for each startup stage.
+
+        :param start: time startup began
+        :return: nothing
+        """
+        total = time.perf_counter() - start
+        stages = " ".join(f"{k}({v:.3f}s)" for k, v in self.startup_times.items())
+        cache = "hit" if self.startup_cache.hit else "miss"
+        logger.info("startup completed in %.3fs cache(%s) %s", total, cache, stages)
 
     def _validate_env(self) -> None:
         """
@@ -55,7 +110,7 @@ class CoreEmu:
         """
         use_ovs = self.config.get("ovs") == "1"
         for requirement in get_requirements(use_ovs):
-            utils.which(requirement, required=True)
+            self.startup_cache.which(requirement, True)
 
     def _load_services(self) -> None:
         """
@@ -63,8 +118,14 @@ class CoreEmu:
 
         :return: nothing
         """
-        # load default services
-        self.service_manager.load_locals()
+        # persist compiled service templates when configured
+        template_dir = self.config.get("service_template_dir")
+        if template_dir is not None:
+            TEMPLATE_CACHE.set_module_dir(Path(template_dir))
+        # load default services, using cached modules when available
+        if self.startup_cache.service_modules is None:
+            self.startup_cache.service_modules = self.service_manager.find_locals()
+        self.service_manager.load_locals(self.startup_cache.service_modules)
         # load custom services
         custom_dir = self.config.get("custom_services_dir")
         if custom_dir is not None:
@@ -78,13 +139,16 @@ class CoreEmu:
         :return: nothing
         """
         # check for emane
-        path = utils.which("emane", required=False)
+        path = self.startup_cache.which("emane", False)
         self.has_emane = path is not None
         if not self.has_emane:
             logger.info("emane is not installed, emane functionality disabled")
             return
         # get version
-        emane_version = utils.cmd("emane --version")
+        emane_version = self.startup_cache.emane_version
+        if emane_version is None:
+            emane_version = utils.cmd("emane --version")
+            self.startup_cache.emane_version = emane_version
         logger.info("using emane: %s", emane_version)
         emane_prefix = self.config.get("emane_prefix", DEFAULT_EMANE_PREFIX)
         emane_prefix = Path(emane_prefix)
@@ -13,17 +13,17 @@ if TYPE_CHECKING:
     from core.nodes.base import CoreNode, NodeBase
 
 
-@dataclass
+@dataclass(slots=True)
 class EventData:
     node: int = None
     event_type: EventTypes = None
     name: str = None
     data: str = None
-    time: str = None
+    time: float = None
     session: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AlertData:
     node: int = None
     session: int = None
@@ -97,7 +97,7 @@ class NodeOptions:
         self.alt = alt
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeData:
     """
     Node to broadcast.
@@ -108,7 +108,7 @@ class NodeData:
     source: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class InterfaceData:
     """
     Convenience class for storing interface data.
@@ -137,7 +137,7 @@ class InterfaceData:
         return ips
 
 
-@dataclass
+@dataclass(slots=True)
 class LinkOptions:
     """
     Options for creating and updating links within core.
@@ -217,10 +217,11 @@ class LinkOptions:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LinkData:
     """
-    Represents all data associated with a link.
+    Represents all data associated with a link. Producers sending many link
+    messages may share options between them, so options are not to be modified.
     """
 
     message_type: MessageFlags = None
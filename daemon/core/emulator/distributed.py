@@ -2,19 +2,27 @@
 Defines distributed server functionality.
 """
 
+import base64
+import concurrent.futures
+import functools
+import inspect
+import json
 import logging
 import os
+import shlex
 import threading
 from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable
 
 import netaddr
 from fabric import Connection
 from invoke import UnexpectedExit
 
-from core import utils
+from core import tracing, utils
+from core.emulator import agent
 from core.emulator.links import CoreLink
 from core.errors import CoreCommandError, CoreError
 from core.executables import get_requirements
@@ -28,6 +36,179 @@ if TYPE_CHECKING:
 
 LOCK = threading.Lock()
 CMD_HIDE = True
+AGENT_SOURCE: str = inspect.getsource(agent)
+AGENT_TIMEOUT: float = 10.0
+# limit for internal setup requests, commands run for users are not limited
+AGENT_CMD_TIMEOUT: float = 300.0
+MAX_WORKERS: int = 16
+
+
+class AgentChannel:
+    """
+    Client for a command agent running on a distributed server. Requests from
+    any thread are multiplexed over one stream and sent without waiting on prior
+    replies, with replies matched to requests by id.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        reader: BinaryIO,
+        writer: BinaryIO,
+        close: Callable[[], None],
+    ) -> None:
+        """
+        Create an AgentChannel instance.
+
+        :param name: name of server channel is for
+        :param reader: stream to read agent replies from
+        :param writer: stream to write agent requests to
+        :param close: function to close streams and stop the agent
+        """
+        self.name: str = name
+        self.reader: BinaryIO = reader
+        self.writer: BinaryIO = writer
+        self.close_func: Callable[[], None] = close
+        self.lock: threading.Lock = threading.Lock()
+        self.pending: dict[int, Future] = {}
+        self.next_id: int = 0
+        self.closed: bool = False
+        self.thread: threading.Thread = threading.Thread(target=self.read, daemon=True)
+        self.thread.start()
+
+    def send(self, requests: list[dict]) -> list[Future]:
+        """
+        Send requests to the agent, which are run concurrently.
+
+        :param requests: requests to send
+        :return: futures resolving to the reply of each request
+        :raises CoreError: when the channel is closed
+        """
+        futures = []
+        with self.lock:
+            if self.closed:
+                raise CoreError(f"server({self.name}) agent channel is closed")
+            lines = []
+            for request in requests:
+                self.next_id += 1
+                request["id"] = self.next_id
+                future = Future()
+                self.pending[self.next_id] = future
+                futures.append(future)
+                lines.append(json.dumps(request).encode() + b"\n")
+            try:
+                self.writer.write(b"".join(lines))
+                self.writer.flush()
+            except OSError as e:
+                for request in requests:
+                    self.pending.pop(request["id"], None)
+                raise CoreError(f"server({self.name}) agent channel error: {e}")
+        return futures
+
+    def read(self) -> None:
+        """
+        Read agent replies, resolving the futures of the requests replied to,
+        until the stream ends.
+
+        :return: nothing
+        """
+        try:
+            for line in self.reader:
+                reply = json.loads(line)
+                with self.lock:
+                    future = self.pending.pop(reply["id"], None)
+                if future:
+                    future.set_result(reply)
+        except (OSError, ValueError):
+            logger.exception("server(%s) agent channel error", self.name)
+        with self.lock:
+            self.closed = True
+            pending = list(self.pending.values())
+            self.pending.clear()
+        for future in pending:
+            future.set_exception(CoreError(f"server({self.name}) agent channel closed"))
+
+    def close(self) -> None:
+        """
+        Close the channel, stopping the agent.
+
+        :return: nothing
+        """
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+        try:
+            self.close_func()
+        except OSError:
+            logger.exception("server(%s) error closing agent channel", self.name)
+
+
+def wait_agent_reply(future: Future, cmd: str, timeout: float | None = None) -> dict:
+    """
+    Wait for the reply to an agent request.
+
+    :param future: future for the request
+    :param cmd: command the request was for
+    :param timeout: seconds to wait for a reply, None to wait indefinitely
+    :return: reply to request
+    :raises CoreError: when a reply is not received within the timeout
+    """
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        raise CoreError(f"agent reply timed out after {timeout}s: {cmd}")
+
+
+def get_agent_output(future: Future, cmd: str, timeout: float | None = None) -> str:
+    """
+    Wait for the reply to an agent request and retrieve its output.
+
+    :param future: future for the request
+    :param cmd: command the request was for
+    :param timeout: seconds to wait for a reply, None to wait indefinitely
+    :return: stdout when success
+    :raises CoreCommandError: when a non-zero exit status occurs
+    :raises CoreError: when a reply is not received within the timeout
+    """
+    reply = wait_agent_reply(future, cmd, timeout)
+    return get_reply_output(reply, cmd)
+
+
+def get_reply_output(reply: dict, cmd: str) -> str:
+    """
+    Retrieve the output of an agent reply.
+
+    :param reply: reply to a request
+    :param cmd: command the request was for
+    :return: stdout when success
+    :raises CoreCommandError: when a non-zero exit status occurs
+    """
+    if reply["status"] != 0:
+        raise CoreCommandError(reply["status"], cmd, reply["stdout"], reply["stderr"])
+    return reply["stdout"]
+
+
+def run_parallel(funcs: list[Callable[[], Any]]) -> list[Any]:
+    """
+    Run functions concurrently, waiting for all of them to complete.
+
+    :param funcs: functions to run
+    :return: results of functions, in the order provided
+    :raises Exception: the first error raised by a function, in the order
+        provided, after all functions complete
+    """
+    if len(funcs) <= 1:
+        return [x() for x in funcs]
+    workers = min(len(funcs), MAX_WORKERS)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(x) for x in funcs]
+    errors = [x.exception() for x in futures if x.exception()]
+    for error in errors[1:]:
+        logger.error("distributed error: %s", error)
+    if errors:
+        raise errors[0]
+    return [x.result() for x in futures]
 
 
 class DistributedServer:
@@ -35,18 +216,103 @@ class DistributedServer:
     Provides distributed server interactions.
     """
 
-    def __init__(self, name: str, host: str) -> None:
+    def __init__(self, name: str, host: str, use_agent: bool = True) -> None:
         """
         Create a DistributedServer instance.
 
         :param name: convenience name to associate with host
         :param host: host to connect to
+        :param use_agent: True to run commands over a persistent agent channel,
+            False to run each command as a separate ssh command
         """
         self.name: str = name
         self.host: str = host
         self.conn: Connection = Connection(host, user="root")
         self.lock: threading.Lock = threading.Lock()
+        self.use_agent: bool = use_agent
+        self.agent: AgentChannel | None = None
+        self.agent_lock: threading.Lock = threading.Lock()
+
+    def start_agent(self) -> AgentChannel:
+        """
+        Start the command agent on the server, over the server connection.
+
+        :return: channel to started agent
+        """
+        self.conn.open()
+        channel = self.conn.client.get_transport().open_session()
+        channel.exec_command(f"python3 -u -c {shlex.quote(AGENT_SOURCE)}")
+
+        def close() -> None:
+            channel.shutdown_write()
+            channel.close()
+
+        return AgentChannel(
+            self.name, channel.makefile("rb"), channel.makefile_stdin("wb"), close
+        )
 
+    def get_agent(self) -> AgentChannel | None:
+        """
+        Retrieve the agent channel for this server, starting the agent when
+        needed. Falls back to running separate commands, when an agent can not
+        be started.
+
+        :return: agent channel, None when not being used
+        """
+        if not self.use_agent:
+            return None
+        with self.agent_lock:
+            if self.agent and not self.agent.closed:
+                return self.agent
+            try:
+                agent_channel = self.start_agent()
+                request = dict(type="cmd", cmd="true")
+                future = agent_channel.send([request])[0]
+                future.result(timeout=AGENT_TIMEOUT)
+            except Exception as e:
+                logger.warning(
+                    "server(%s) unable to start command agent, "
+                    "running commands separately: %s",
+                    self.name,
+                    e,
+                )
+                self.use_agent = False
+                return None
+            self.agent = agent_channel
+            return self.agent
+
+    def close(self) -> None:
+        """
+        Close the agent channel, if one is running.
+
+        :return: nothing
+        """
+        with self.agent_lock:
+            if self.agent:
+                self.agent.close()
+                self.agent = None
+
+    def remote_cmds(self, cmds: list[str]) -> list[str]:
+        """
+        Run several short setup commands remotely in order, sending them as a
+        single batch, limited to AGENT_CMD_TIMEOUT, when using an agent channel.
+
+        :param cmds: commands to run
+        :return: stdout for each command when all succeed
+        :raises CoreCommandError: when a command has a non-zero exit status
+        :raises CoreError: when the agent does not reply within the timeout
+        """
+        agent_channel = self.get_agent()
+        if agent_channel is None:
+            return [self.remote_cmd(x) for x in cmds]
+        logger.debug("remote cmds server(%s): %s", self.host, cmds)
+        requests = [dict(type="cmd", cmd=x) for x in cmds]
+        request = dict(type="batch", requests=requests)
+        future = agent_channel.send([request])[0]
+        reply = wait_agent_reply(future, "; ".join(cmds), AGENT_CMD_TIMEOUT)
+        return [get_reply_output(x, y) for x, y in zip(reply["responses"], cmds)]
+
+    @tracing.traced(remote=True)
     def remote_cmd(
         self, cmd: str, env: dict[str, str] = None, cwd: str = None, wait: bool = True
     ) -> str:
@@ -61,7 +327,15 @@ class DistributedServer:
         :return: stdout when success
         :raises CoreCommandError: when a non-zero exit status occurs
         """
-
+        agent_channel = self.get_agent()
+        if agent_channel is not None:
+            logger.debug(
+                "remote cmd server(%s) cwd(%s) wait(%s): %s", self.host, cwd, wait, cmd
+            )
+            cwd = None if cwd is None else str(cwd)
+            request = dict(type="cmd", cmd=cmd, env=env, cwd=cwd, wait=wait)
+            future = agent_channel.send([request])[0]
+            return get_agent_output(future, cmd)
         replace_env = env is not None
         if not wait:
             cmd += " &"
@@ -91,6 +365,11 @@ class DistributedServer:
         :param dst_path: destination file location
         :return: nothing
         """
+        agent_channel = self.get_agent()
+        if agent_channel is not None:
+            mode = src_path.stat().st_mode & 0o7777
+            self.agent_put(agent_channel, dst_path, src_path.read_bytes(), mode)
+            return
         with self.lock:
             self.conn.put(str(src_path), str(dst_path))
 
@@ -103,6 +382,10 @@ class DistributedServer:
         :param data: data to store in remote file
         :return: nothing
         """
+        agent_channel = self.get_agent()
+        if agent_channel is not None:
+            self.agent_put(agent_channel, dst_path, data.encode())
+            return
         with self.lock:
             temp = NamedTemporaryFile(delete=False)
             temp.write(data.encode())
@@ -110,6 +393,29 @@ class DistributedServer:
             self.conn.put(temp.name, str(dst_path))
             os.unlink(temp.name)
 
+    def agent_put(
+        self, agent_channel: AgentChannel, dst_path: Path, data: bytes, mode: int = None
+    ) -> None:
+        """
+        Write file contents on the remote server using an agent channel.
+
+        :param agent_channel: agent channel to use
+        :param dst_path: file destination for data
+        :param data: data to store in remote file
+        :param mode: file mode to set, None to use the default
+        :return: nothing
+        :raises CoreCommandError: when the file could not be written
+        """
+        logger.debug("remote put server(%s): %s", self.host, dst_path)
+        request = dict(
+            type="put",
+            path=str(dst_path),
+            data=base64.b64encode(data).decode(),
+            mode=mode,
+        )
+        future = agent_channel.send([request])[0]
+        get_agent_output(future, f"put {dst_path}", AGENT_CMD_TIMEOUT)
+
 
 class DistributedController:
     """
@@ -125,6 +431,7 @@ class DistributedController:
         self.session: "Session" = session
         self.servers: dict[str, DistributedServer] = OrderedDict()
         self.tunnels: dict[int, tuple[GreTap, GreTap]] = {}
+        self.tunnels_lock: threading.Lock = threading.Lock()
         self.address: str = self.session.options.get("distributed_address")
 
     def add_server(self, name: str, host: str) -> None:
@@ -136,29 +443,55 @@ class DistributedController:
         :return: nothing
         :raises CoreError: when there is an error validating server
         """
+        self.add_servers([(name, host)])
+
+    def add_servers(self, servers: list[tuple[str, str]]) -> None:
+        """
+        Add several distributed server configurations, validating and preparing
+        them concurrently.
+
+        :param servers: distributed server names and host addresses
+        :return: nothing
+        :raises CoreError: when there is an error validating a server
+        """
+        funcs = [functools.partial(self.create_server, *x) for x in servers]
+        for server in run_parallel(funcs):
+            self.servers[server.name] = server
+
+    def create_server(self, name: str, host: str) -> DistributedServer:
+        """
+        Create a distributed server, validating it has all required executables
+        and creating the session directory.
+
+        :param name: distributed server name
+        :param host: distributed server host address
+        :return: created distributed server
+        :raises CoreError: when there is an error validating server
+        """
         server = DistributedServer(name, host)
-        for requirement in get_requirements(self.session.use_ovs()):
-            try:
-                server.remote_cmd(f"which {requirement}")
-            except CoreCommandError:
-                raise CoreError(
-                    f"server({server.name}) failed validation for "
-                    f"command({requirement})"
-                )
-        self.servers[name] = server
+        requirements = get_requirements(self.session.use_ovs())
+        try:
+            server.remote_cmds([f"which {x}" for x in requirements])
+        except CoreCommandError as e:
+            requirement = e.cmd.removeprefix("which ")
+            raise CoreError(
+                f"server({server.name}) failed validation for "
+                f"command({requirement})"
+            )
         cmd = f"mkdir -p {self.session.directory}"
         server.remote_cmd(cmd)
+        return server
 
-    def execute(self, func: Callable[[DistributedServer], None]) -> None:
+    def execute(self, func: Callable[[DistributedServer], Any]) -> list[Any]:
         """
-        Convenience for executing logic against all distributed servers.
+        Convenience for executing logic against all distributed servers,
+        concurrently when there are several.
 
         :param func: function to run, that takes a DistributedServer as a parameter
-        :return: nothing
+        :return: results from each server, in server order
         """
-        for name in self.servers:
-            server = self.servers[name]
-            func(server)
+        funcs = [functools.partial(func, x) for x in self.servers.values()]
+        return run_parallel(funcs)
 
     def shutdown(self) -> None:
         """
@@ -168,15 +501,16 @@ class DistributedController:
         :return: nothing
         """
         # shutdown all tunnels
-        for key in self.tunnels:
-            tunnels = self.tunnels[key]
-            for tunnel in tunnels:
-                tunnel.shutdown()
+        taps = [tap for tunnel in self.tunnels.values() for tap in tunnel]
+        run_parallel([x.shutdown for x in taps])
+
         # remove all remote session directories
-        for name in self.servers:
-            server = self.servers[name]
+        def shutdown_server(server: DistributedServer) -> None:
             cmd = f"rm -rf {self.session.directory}"
             server.remote_cmd(cmd)
+            server.close()
+
+        self.execute(shutdown_server)
         # clear tunnels
         self.tunnels.clear()
 
@@ -187,13 +521,14 @@ class DistributedController:
         :return: nothing
         """
         mtu = self.session.options.get_int("mtu")
-        for node in self.session.control_nodes.values():
-            if node.serverintf is not None:
-                continue
-            for name in self.servers:
-                server = self.servers[name]
+        nodes = [x for x in self.session.control_nodes.values() if x.serverintf is None]
+
+        def start_server(server: DistributedServer) -> None:
+            for node in nodes:
                 self.create_gre_tunnel(node, server, mtu, True)
 
+        self.execute(start_server)
+
     def create_gre_tunnels(self, core_link: CoreLink) -> None:
         """
         Creates gre tunnels for a core link with a ptp network connection.
@@ -208,14 +543,14 @@ class DistributedController:
                 "attempted to create gre tunnel for core link without a ptp network"
             )
         mtu = self.session.options.get_int("mtu")
-        for server in self.servers.values():
-            self.create_gre_tunnel(core_link.ptp, server, mtu, True)
+        self.execute(lambda x: self.create_gre_tunnel(core_link.ptp, x, mtu, True))
 
     def create_gre_tunnel(
         self, node: CoreNetwork, server: DistributedServer, mtu: int, start: bool
     ) -> tuple[GreTap, GreTap]:
         """
-        Create gre tunnel using a pair of gre taps between the local and remote server.
+        Create gre tunnel using a pair of gre taps between the local and remote
+        server, setting up both sides concurrently.
 
         :param node: node to create gre tunnel for
         :param server: server to create tunnel for
@@ -225,28 +560,42 @@ class DistributedController:
         """
         host = server.host
         key = self.tunnel_key(node.id, netaddr.IPAddress(host).value)
-        tunnel = self.tunnels.get(key)
+        with self.tunnels_lock:
+            tunnel = self.tunnels.get(key)
         if tunnel is not None:
             return tunnel
         # local to server
         logger.info("local tunnel node(%s) to remote(%s) key(%s)", node.name, host, key)
         local_tap = GreTap(self.session, host, key=key, mtu=mtu)
-        if start:
-            local_tap.startup()
-            local_tap.net_client.set_iface_master(node.brname, local_tap.localname)
         # server to local
         logger.info(
             "remote tunnel node(%s) to local(%s) key(%s)", node.name, self.address, key
         )
         remote_tap = GreTap(self.session, self.address, key=key, server=server, mtu=mtu)
         if start:
-            remote_tap.startup()
-            remote_tap.net_client.set_iface_master(node.brname, remote_tap.localname)
+            run_parallel(
+                [
+                    functools.partial(self.start_tap, node, local_tap),
+                    functools.partial(self.start_tap, node, remote_tap),
+                ]
+            )
         # save tunnels for shutdown
         tunnel = (local_tap, remote_tap)
-        self.tunnels[key] = tunnel
+        with self.tunnels_lock:
+            self.tunnels[key] = tunnel
         return tunnel
 
+    def start_tap(self, node: CoreNetwork, tap: GreTap) -> None:
+        """
+        Start a gre tap and attach it to a network bridge.
+
+        :param node: network to attach gre tap to
+        :param tap: gre tap to start
+        :return: nothing
+        """
+        tap.startup()
+        tap.net_client.set_iface_master(node.brname, tap.localname)
+
     def tunnel_key(self, node1_id: int, node2_id: int) -> int:
         """
         Compute a 32-bit key used to uniquely identify a GRE tunnel.
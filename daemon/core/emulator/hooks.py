@@ -1,14 +1,33 @@
 import logging
 import subprocess
+import threading
+import time
 from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
 
-from core.emulator.enumerations import EventTypes
+from core import utils
+from core.emulator.enumerations import AlertLevels, EventTypes
 from core.errors import CoreError
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class HookOptions:
+    """
+    Options for how a script hook is run.
+    """
+
+    detached: bool = False
+    """run in the background without blocking the state change, reporting the
+    result as an alert"""
+    group: str = ""
+    """hooks within the same group are run in parallel, empty to run alone"""
+    timeout: float = 0.0
+    """time in seconds before the hook is stopped and fails, 0 for no timeout"""
+
+
 def _run_callback(state: EventTypes, hook: Callable[[EventTypes], None]) -> None:
     """
     Run a callback hook.
@@ -27,7 +46,12 @@ def _run_callback(state: EventTypes, hook: Callable[[EventTypes], None]) -> None
 
 
 def _run_script(
-    state: EventTypes, directory: Path, file_name: str, data: str, env: dict[str, str]
+    state: EventTypes,
+    directory: Path,
+    file_name: str,
+    data: str,
+    env: dict[str, str],
+    timeout: float = None,
 ) -> None:
     """
     Run a script hook.
@@ -37,6 +61,7 @@ def _run_script(
     :param file_name: name of script to run
     :param data: script content
     :param env: environment to run script with
+    :param timeout: time in seconds before script is stopped, None for no timeout
     :return: nothing
     """
     logger.info("running hook %s", file_name)
@@ -54,8 +79,9 @@ def _run_script(
                 close_fds=True,
                 cwd=directory,
                 env=env,
+                timeout=timeout,
             )
-    except (OSError, subprocess.CalledProcessError) as e:
+    except (OSError, subprocess.SubprocessError) as e:
         raise CoreError(
             f"failure running state({state.name}) " f"hook script({file_name}): {e}"
         )
@@ -66,12 +92,19 @@ class HookManager:
     Provides functionality for managing and running script/callback hooks.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, alert: Callable[[AlertLevels, str, str], None] = None) -> None:
         """
         Create a HookManager instance.
+
+        :param alert: function to report detached script hook results with,
+            taking an alert level, source and text
         """
+        self.alert: Callable[[AlertLevels, str, str], None] | None = alert
         self.script_hooks: dict[EventTypes, dict[str, str]] = {}
+        self.script_options: dict[EventTypes, dict[str, HookOptions]] = {}
         self.callback_hooks: dict[EventTypes, list[Callable[[EventTypes], None]]] = {}
+        self.durations: dict[tuple[EventTypes, str], float] = {}
+        self.durations_lock: threading.Lock = threading.Lock()
 
     def reset(self) -> None:
         """
@@ -80,6 +113,19 @@ class HookManager:
         :return: nothing
         """
         self.script_hooks.clear()
+        self.script_options.clear()
+        with self.durations_lock:
+            self.durations.clear()
+
+    def get_options(self, state: EventTypes, file_name: str) -> HookOptions:
+        """
+        Retrieve the options for a script hook.
+
+        :param state: state of script hook
+        :param file_name: name of script hook
+        :return: script hook options
+        """
+        return self.script_options.get(state, {}).get(file_name, HookOptions())
 
     def add_script_hook(
         self,
@@ -89,6 +135,7 @@ class HookManager:
         directory: Path,
         env: dict[str, str],
         should_run: bool = False,
+        options: HookOptions = None,
     ) -> None:
         """
         Add a hook script to run for a given state.
@@ -99,6 +146,7 @@ class HookManager:
         :param directory: directory to run script within
         :param env: environment to run script with
         :param should_run: True if should run script now, False otherwise
+        :param options: options for running script, None for defaults
         :return: nothing
         """
         logger.info("setting state hook: %s - %s", state, file_name)
@@ -108,8 +156,10 @@ class HookManager:
                 f"adding duplicate state({state.name}) hook script({file_name})"
             )
         state_hooks[file_name] = data
+        if options:
+            self.script_options.setdefault(state, {})[file_name] = options
         if should_run:
-            _run_script(state, directory, file_name, data, env)
+            self.run_scripts(state, directory, env, [file_name])
 
     def delete_script_hook(self, state: EventTypes, file_name: str) -> None:
         """
@@ -126,6 +176,7 @@ class HookManager:
                 "that does not exist"
             )
         del state_hooks[file_name]
+        self.script_options.get(state, {}).pop(file_name, None)
 
     def add_callback_hook(
         self,
@@ -170,6 +221,117 @@ class HookManager:
             )
         hooks.remove(hook)
 
+    def run_script(
+        self,
+        state: EventTypes,
+        directory: Path,
+        env: dict[str, str],
+        file_name: str,
+    ) -> None:
+        """
+        Run a script hook, recording the time it took.
+
+        :param state: state to run script hook for
+        :param directory: directory to run script hook within
+        :param env: environment to run script hook with
+        :param file_name: name of script hook to run
+        :return: nothing
+        :raises CoreError: when script hook fails
+        """
+        data = self.script_hooks[state][file_name]
+        options = self.get_options(state, file_name)
+        timeout = options.timeout or None
+        start = time.monotonic()
+        try:
+            _run_script(state, directory, file_name, data, env, timeout)
+        finally:
+            duration = time.monotonic() - start
+            with self.durations_lock:
+                self.durations[(state, file_name)] = duration
+            logger.info(
+                "state(%s) hook script(%s) ran for %.3fs",
+                state.name,
+                file_name,
+                duration,
+            )
+
+    def run_detached(
+        self,
+        state: EventTypes,
+        directory: Path,
+        env: dict[str, str],
+        file_name: str,
+    ) -> None:
+        """
+        Run a script hook in the background, reporting the result as an alert.
+
+        :param state: state to run script hook for
+        :param directory: directory to run script hook within
+        :param env: environment to run script hook with
+        :param file_name: name of script hook to run
+        :return: nothing
+        """
+
+        def run() -> None:
+            source = f"hook:{file_name}"
+            try:
+                self.run_script(state, directory, env, file_name)
+                level = AlertLevels.NOTICE
+                duration = self.durations.get((state, file_name), 0.0)
+                text = f"state({state.name}) hook script({file_name}) completed "
+                text += f"in {duration:.3f}s"
+            except CoreError as e:
+                logger.error("detached hook failed: %s", e)
+                level = AlertLevels.ERROR
+                text = str(e)
+            if self.alert:
+                self.alert(level, source, text)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+
+    def run_scripts(
+        self,
+        state: EventTypes,
+        directory: Path,
+        env: dict[str, str],
+        file_names: list[str],
+    ) -> None:
+        """
+        Run script hooks, starting detached hooks in the background and then
+        running blocking hooks in order, with hooks sharing a group run in
+        parallel.
+
+        :param state: state to run script hooks for
+        :param directory: directory to run script hooks within
+        :param env: environment to run script hooks with
+        :param file_names: names of script hooks to run
+        :return: nothing
+        :raises CoreError: when a blocking script hook fails
+        """
+        groups = []
+        named_groups = {}
+        for file_name in file_names:
+            options = self.get_options(state, file_name)
+            if options.detached:
+                self.run_detached(state, directory, env, file_name)
+            elif not options.group:
+                groups.append([file_name])
+            elif options.group in named_groups:
+                named_groups[options.group].append(file_name)
+            else:
+                group = [file_name]
+                named_groups[options.group] = group
+                groups.append(group)
+        for group in groups:
+            if len(group) == 1:
+                self.run_script(state, directory, env, group[0])
+                continue
+            funcs = [(self.run_script, (state, directory, env, x), {}) for x in group]
+            _, exceptions = utils.threadpool(funcs, workers=len(group))
+            if exceptions:
+                raise exceptions[0]
+
     def run_hooks(
         self, state: EventTypes, directory: Path, env: dict[str, str]
     ) -> None:
@@ -182,8 +344,7 @@ class HookManager:
         :return: nothing
         """
         state_hooks = self.script_hooks.get(state, {})
-        for file_name, data in state_hooks.items():
-            _run_script(state, directory, file_name, data, env)
+        self.run_scripts(state, directory, env, list(state_hooks))
         callback_hooks = self.callback_hooks.get(state, [])
         for hook in callback_hooks:
             _run_callback(state, hook)
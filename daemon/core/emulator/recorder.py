@@ -0,0 +1,292 @@
+"""
+Records live session activity in the core player file format, for later
+playback.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from core.emulator.data import LinkData, NodeData
+from core.emulator.enumerations import LinkTypes, MessageFlags
+from core.nodes.network import WlanNode
+from core.nodes.wireless import WirelessNode, get_key
+from core.player import CorePlayerWriter, PlayerEvents, RotatingPlayerWriter
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from core.emulator.session import Session
+
+DEFAULT_INTERVAL: float = 0.1
+MAX_PENDING_EVENTS: int = 100_000
+
+
+class SessionRecorder:
+    """
+    Records node positions, wireless links and wireless link configuration
+    broadcast by a session. Broadcast handlers only store events, which are
+    written by a separate thread every interval. Positions are coalesced to the
+    latest position for each node within an interval, and are only recorded when
+    they moved at least the minimum distance since last recorded.
+    """
+
+    def __init__(
+        self,
+        session: "Session",
+        writer: CorePlayerWriter,
+        interval: float = DEFAULT_INTERVAL,
+        min_distance: float = 0.0,
+    ) -> None:
+        """
+        Create a SessionRecorder instance.
+
+        :param session: session to record
+        :param writer: writer for recorded events
+        :param interval: interval in seconds to write events at
+        :param min_distance: distance a node must move before a new position is
+            recorded, 0 to record every change
+        """
+        self.session: "Session" = session
+        self.writer: CorePlayerWriter = writer
+        self.interval: float = interval
+        self.min_distance: float = min_distance
+        self.start_time: float = 0.0
+        self.lock: threading.Lock = threading.Lock()
+        self.flush_lock: threading.Lock = threading.Lock()
+        self.positions: dict[int, tuple[float, float, float]] = {}
+        self.events: list[tuple[float, PlayerEvents, tuple]] = []
+        self.recorded: dict[int, tuple[float, float]] = {}
+        self.links: dict[tuple, tuple[PlayerEvents, tuple]] = {}
+        self.rotations: int = 0
+        self.file_start: float = 0.0
+        self.written: int = 0
+        self.skipped: int = 0
+        self.dropped: int = 0
+        self.stopped: threading.Event = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    @classmethod
+    def to_file(
+        cls,
+        session: "Session",
+        file_path: str,
+        max_bytes: int = 0,
+        backups: int = 0,
+        interval: float = DEFAULT_INTERVAL,
+        min_distance: float = 0.0,
+    ) -> "SessionRecorder":
+        """
+        Create a recorder writing to a file, rotated by size.
+
+        :param session: session to record
+        :param file_path: path to write recording to
+        :param max_bytes: size to rotate file at, 0 to never rotate
+        :param backups: number of rotated files to keep
+        :param interval: interval in seconds to write events at
+        :param min_distance: distance a node must move before a new position is
+            recorded
+        :return: created recorder
+        """
+        writer = RotatingPlayerWriter(file_path, max_bytes, backups)
+        return cls(session, writer, interval, min_distance)
+
+    def start(self) -> None:
+        """
+        Start recording session events.
+
+        :return: nothing
+        """
+        self.writer.open()
+        self.start_time = time.monotonic()
+        self.stopped.clear()
+        self.session.broadcast_manager.add_handler(NodeData, self.handle_node)
+        self.session.broadcast_manager.add_handler(LinkData, self.handle_link)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop recording, writing any pending events.
+
+        :return: nothing
+        """
+        self.session.broadcast_manager.remove_handler(NodeData, self.handle_node)
+        self.session.broadcast_manager.remove_handler(LinkData, self.handle_link)
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+        self.writer.close()
+        logger.info(
+            "session(%s) recording stopped, written(%s) skipped(%s) dropped(%s)",
+            self.session.id,
+            self.written,
+            self.skipped,
+            self.dropped,
+        )
+
+    def get_time(self) -> float:
+        return round(time.monotonic() - self.start_time, 3)
+
+    def handle_node(self, node_data: NodeData) -> None:
+        """
+        Store the latest position of a broadcast node.
+
+        :param node_data: node data broadcast
+        :return: nothing
+        """
+        if node_data.message_type == MessageFlags.DELETE:
+            return
+        position = node_data.node.position
+        if position.x is None or position.y is None:
+            return
+        with self.lock:
+            self.positions[node_data.node.id] = (
+                self.get_time(),
+                position.x,
+                position.y,
+            )
+
+    def handle_link(self, link_data: LinkData) -> None:
+        """
+        Store wireless link changes and wireless link configuration edits.
+
+        :param link_data: link data broadcast
+        :return: nothing
+        """
+        if link_data.type != LinkTypes.WIRELESS:
+            return
+        net = self.session.nodes.get(link_data.network_id)
+        node1_id, node2_id = link_data.node1_id, link_data.node2_id
+        linked = link_data.message_type == MessageFlags.ADD
+        is_link_change = link_data.message_type in (
+            MessageFlags.ADD,
+            MessageFlags.DELETE,
+        )
+        if isinstance(net, WlanNode) and is_link_change:
+            event = (PlayerEvents.WLINK, (net.id, node1_id, node2_id, linked))
+        elif isinstance(net, WirelessNode) and is_link_change:
+            event = (PlayerEvents.WILINK, (net.id, node1_id, node2_id, linked))
+        elif isinstance(net, WirelessNode):
+            link = net.links.get(get_key(node1_id, node2_id))
+            if not link or not link.options1:
+                return
+            options1, options2 = link.options1, link.options2
+            args = (
+                net.id,
+                node1_id,
+                node2_id,
+                options1.loss,
+                options1.delay,
+                options2.loss,
+                options2.delay,
+            )
+            event = (PlayerEvents.WICONFIG, args)
+        else:
+            return
+        with self.lock:
+            if len(self.events) >= MAX_PENDING_EVENTS:
+                self.dropped += 1
+                return
+            self.events.append((self.get_time(), *event))
+
+    def run(self) -> None:
+        """
+        Write pending events every interval, until stopped.
+
+        :return: nothing
+        """
+        while not self.stopped.wait(self.interval):
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("session(%s) error writing recording", self.session.id)
+
+    def is_moved(self, node_id: int, x: float, y: float) -> bool:
+        recorded = self.recorded.get(node_id)
+        if recorded is None:
+            return True
+        distance = math.hypot(x - recorded[0], y - recorded[1])
+        if self.min_distance:
+            return distance >= self.min_distance
+        return distance > 0
+
+    def flush(self) -> None:
+        """
+        Write pending events, in time order. Flushes are serialized, since they
+        may be requested while the recording thread is flushing.
+
+        :return: nothing
+        """
+        with self.flush_lock:
+            with self.lock:
+                positions, self.positions = self.positions, {}
+                events, self.events = self.events, []
+            for node_id, (event_time, x, y) in positions.items():
+                if not self.is_moved(node_id, x, y):
+                    self.skipped += 1
+                    continue
+                events.append((event_time, PlayerEvents.XY, (node_id, x, y)))
+            if not events:
+                return
+            events.sort(key=lambda x: x[0])
+            for event_time, event, args in events:
+                self.writer.set_time(event_time - self.file_start)
+                self.write_event(event, args)
+                self.check_rotation(event_time)
+            self.written += len(events)
+            self.writer.flush()
+
+    def write_event(self, event: PlayerEvents, args: tuple) -> None:
+        """
+        Write an event, tracking the state it leaves nodes and links in.
+
+        :param event: event to write
+        :param args: event arguments
+        :return: nothing
+        """
+        if event == PlayerEvents.XY:
+            self.recorded[args[0]] = args[1:]
+            self.writer.write_xy(*args)
+        elif event == PlayerEvents.WLINK:
+            self.update_link(event, args)
+            self.writer.write_wlan_link(*args)
+        elif event == PlayerEvents.WILINK:
+            self.update_link(event, args)
+            self.writer.write_wireless_link(*args)
+        elif event == PlayerEvents.WICONFIG:
+            self.links[(event, *args[:3])] = (event, args)
+            self.writer.write_wireless_config(*args)
+
+    def update_link(self, event: PlayerEvents, args: tuple) -> None:
+        key = (event, *args[:3])
+        linked = args[3]
+        if linked:
+            self.links[key] = (event, args)
+        else:
+            self.links.pop(key, None)
+            self.links.pop((PlayerEvents.WICONFIG, *args[:3]), None)
+
+    def check_rotation(self, event_time: float) -> None:
+        """
+        Write the current state of all nodes and wireless links to a newly
+        rotated file, with times rebased to start from the rotation, so each file
+        can be played on its own.
+
+        :param event_time: time of last written event
+        :return: nothing
+        """
+        rotations = getattr(self.writer, "rotations", 0)
+        if rotations == self.rotations:
+            return
+        self.rotations = rotations
+        self.file_start = event_time
+        self.writer.set_time(0.0)
+        for node_id, (x, y) in self.recorded.items():
+            self.writer.write_xy(node_id, x, y)
+        for event, args in list(self.links.values()):
+            self.write_event(event, args)
@@ -0,0 +1,146 @@
+"""
+Tracks revisions of session state, allowing converted session snapshots to be
+reused and changes since a given revision to be determined.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class SessionChanges:
+    """
+    Changes made to a session since a given revision. When full is True, changes
+    could not be determined and everything should be considered changed.
+    """
+
+    revision: int
+    full: bool = False
+    node_ids: set[int] = field(default_factory=set)
+    deleted_node_ids: set[int] = field(default_factory=set)
+    links: bool = False
+
+
+class SessionRevisions:
+    """
+    Monotonically increasing revision counter for a session, recording the
+    revision nodes, links and session level data last changed at.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a SessionRevisions instance.
+        """
+        self.revision: int = 0
+        self.reset_revision: int = 0
+        self.links_revision: int = 0
+        self.nodes: dict[int, int] = {}
+        self.deleted: dict[int, int] = {}
+        self._snapshot: tuple[int, Any] | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _next(self) -> int:
+        self.revision += 1
+        self._snapshot = None
+        return self.revision
+
+    def node_changed(self, node_id: int) -> None:
+        """
+        Record a change to a node.
+
+        :param node_id: id of node that changed
+        :return: nothing
+        """
+        with self._lock:
+            self.nodes[node_id] = self._next()
+            self.deleted.pop(node_id, None)
+
+    def node_deleted(self, node_id: int) -> None:
+        """
+        Record the deletion of a node, which also removes its links.
+
+        :param node_id: id of node deleted
+        :return: nothing
+        """
+        with self._lock:
+            revision = self._next()
+            self.nodes.pop(node_id, None)
+            self.deleted[node_id] = revision
+            self.links_revision = revision
+
+    def links_changed(self) -> None:
+        """
+        Record a change to session links.
+
+        :return: nothing
+        """
+        with self._lock:
+            self.links_revision = self._next()
+
+    def session_changed(self) -> None:
+        """
+        Record a change to session level data, such as state or options.
+
+        :return: nothing
+        """
+        with self._lock:
+            self._next()
+
+    def reset(self) -> None:
+        """
+        Record a change invalidating all prior revisions, such as the session
+        being cleared.
+
+        :return: nothing
+        """
+        with self._lock:
+            self.reset_revision = self._next()
+            self.links_revision = self.reset_revision
+            self.nodes.clear()
+            self.deleted.clear()
+
+    def get_changes(self, revision: int) -> SessionChanges:
+        """
+        Retrieve changes made after the provided revision.
+
+        :param revision: revision to get changes since
+        :return: session changes
+        """
+        with self._lock:
+            changes = SessionChanges(self.revision)
+            if revision < self.reset_revision or revision > self.revision:
+                changes.full = True
+                return changes
+            for node_id, node_revision in self.nodes.items():
+                if node_revision > revision:
+                    changes.node_ids.add(node_id)
+            for node_id, node_revision in self.deleted.items():
+                if node_revision > revision:
+                    changes.deleted_node_ids.add(node_id)
+            changes.links = self.links_revision > revision
+            return changes
+
+    def get_snapshot(self) -> tuple[int, Any | None]:
+        """
+        Retrieve the current revision and the snapshot cached for it, if any.
+
+        :return: current revision and cached snapshot or None
+        """
+        with self._lock:
+            if self._snapshot and self._snapshot[0] == self.revision:
+                return self.revision, self._snapshot[1]
+            return self.revision, None
+
+    def set_snapshot(self, revision: int, snapshot: Any) -> None:
+        """
+        Cache a snapshot converted at the given revision, ignored when changes
+        have occurred since.
+
+        :param revision: revision snapshot was created at
+        :param snapshot: snapshot to cache
+        :return: nothing
+        """
+        with self._lock:
+            if revision == self.revision:
+                self._snapshot = (revision, snapshot)
@@ -15,7 +15,7 @@ import time
 from pathlib import Path
 from typing import Callable, TypeVar
 
-from core import constants, utils
+from core import constants, tracing, utils
 from core.emane.emanemanager import EmaneManager, EmaneState
 from core.emane.nodes import EmaneNet
 from core.emulator.broadcast import BroadcastManager
@@ -30,14 +30,23 @@ from core.emulator.data import (
 )
 from core.emulator.distributed import DistributedController
 from core.emulator.enumerations import AlertLevels, EventTypes, MessageFlags, NodeTypes
-from core.emulator.hooks import HookManager
+from core.emulator.hooks import HookManager, HookOptions
 from core.emulator.links import CoreLink, LinkManager
+from core.emulator.revisions import SessionRevisions
 from core.emulator.sessionconfig import SessionConfig
+from core.emulator.topology import TopologyView
 from core.errors import CoreError
 from core.location.event import EventLoop
 from core.location.geo import GeoLocation
 from core.location.mobility import BasicRangeModel, MobilityManager
-from core.nodes.base import CoreNode, CoreNodeBase, NodeBase, NodeOptions, Position
+from core.nodes.base import (
+    CoreNetworkBase,
+    CoreNode,
+    CoreNodeBase,
+    NodeBase,
+    NodeOptions,
+    Position,
+)
 from core.nodes.docker import DockerNode
 from core.nodes.interface import DEFAULT_MTU, CoreInterface
 from core.nodes.network import (
@@ -53,7 +62,9 @@ from core.nodes.physical import PhysicalNode, Rj45Node
 from core.nodes.podman import PodmanNode
 from core.nodes.wireless import WirelessNode
 from core.plugins.sdt import Sdt
+from core.services.base import TopologyDep
 from core.services.manager import ServiceManager
+from core.tracing import CommandTracer
 from core.xml import corexml, corexmldeployment
 from core.xml.corexml import CoreXmlReader, CoreXmlWriter
 
@@ -120,6 +131,8 @@ class Session:
         self.control_nodes: dict[int, CtrlNet] = {}
         self.nodes_lock: threading.Lock = threading.Lock()
         self.link_manager: LinkManager = LinkManager()
+        self.topology: TopologyView = TopologyView(self)
+        self.revisions: SessionRevisions = SessionRevisions()
 
         # states and hooks handlers
         self.state: EventTypes = EventTypes.DEFINITION_STATE
@@ -135,7 +148,7 @@ class Session:
         # initialize session feature helpers
         self.control_net_manager: ControlNetManager = ControlNetManager(self)
         self.broadcast_manager: BroadcastManager = BroadcastManager()
-        self.hook_manager: HookManager = HookManager()
+        self.hook_manager: HookManager = HookManager(self.broadcast_alert)
         self.hook_manager.add_callback_hook(
             EventTypes.RUNTIME_STATE, self.runtime_state_hook
         )
@@ -144,6 +157,8 @@ class Session:
         self.emane: EmaneManager = EmaneManager(self)
         self.service_manager: ServiceManager | None = None
         self.sdt: Sdt = Sdt(self)
+        self.tracer: CommandTracer | None = None
+        self.set_tracing()
 
     @classmethod
     def get_node_class(cls, _type: NodeTypes) -> type[NodeBase]:
@@ -277,6 +292,10 @@ class Session:
         if isinstance(node2, TunnelNode):
             logger.info("setting tunnel key for: %s", node2.name)
             node2.setkey(key, iface2_data)
+        self.topology.update_iface(iface1)
+        self.topology.update_iface(iface2)
+        self.update_services([node1, node2], TopologyDep.IFACES)
+        self.revisions.links_changed()
         self.sdt.add_link(node1_id, node2_id)
         return iface1, iface2
 
@@ -396,6 +415,14 @@ class Session:
         core_link = self.link_manager.delete(node1, iface1, node2, iface2)
         if core_link.ptp:
             self.delete_ptp(core_link.ptp.id)
+            self.topology.remove_net(core_link.ptp)
+        for node in (node1, node2):
+            if isinstance(node, CoreNetworkBase):
+                self.topology.update_net(node)
+            elif isinstance(node, CoreNodeBase):
+                self.topology.update_node(node)
+        self.update_services([node1, node2], TopologyDep.IFACES)
+        self.revisions.links_changed()
         self.sdt.delete_link(node1_id, node2_id)
 
     def update_link(
@@ -441,6 +468,42 @@ class Session:
             iface1.update_options(options)
         if iface2 and options and not options.unidirectional:
             iface2.update_options(options)
+        self.topology.update_iface(iface1)
+        self.topology.update_iface(iface2)
+        self.update_services([node1, node2], TopologyDep.LINK_OPTIONS)
+        self.revisions.links_changed()
+
+    def update_services(self, nodes: list[NodeBase], change: TopologyDep) -> None:
+        """
+        Update service files affected by a runtime topology change, for changed
+        nodes and nodes connected to changed networks. The change has already been
+        applied, so service failures are broadcast as alerts.
+
+        :param nodes: nodes and networks that changed
+        :param change: topology change that occurred
+        :return: nothing
+        """
+        if not self.is_running():
+            return
+        changes = {}
+        for node in nodes:
+            if isinstance(node, CoreNodeBase):
+                changes.setdefault(node, set()).add(change)
+            elif change != TopologyDep.LINK_OPTIONS:
+                for iface in node.get_ifaces():
+                    if isinstance(iface.node, CoreNodeBase):
+                        peer_changes = changes.setdefault(iface.node, set())
+                        peer_changes.add(TopologyDep.NETWORKS)
+        funcs = []
+        for node, node_changes in changes.items():
+            if any(x.topology_deps for x in node.services.values()):
+                funcs.append((node.update_services, (node_changes,), {}))
+        if not funcs:
+            return
+        _, exceptions = utils.threadpool(funcs)
+        for exception in exceptions:
+            logger.error("error updating services: %s", exception)
+            self.broadcast_alert(AlertLevels.ERROR, "services", str(exception))
 
     def next_node_id(self, start_id: int = 1) -> int:
         """
@@ -504,11 +567,13 @@ class Session:
         # boot core nodes after runtime
         if self.is_running() and isinstance(node, CoreNode):
             self.boot_node(node)
+        self.revisions.node_changed(node.id)
         self.sdt.add_node(node)
         return node
 
     def set_node_pos(self, node: NodeBase, x: float, y: float) -> None:
         node.setposition(x, y, None)
+        self.revisions.node_changed(node.id)
         self.sdt.edit_node(
             node, node.position.lon, node.position.lat, node.position.alt
         )
@@ -521,6 +586,7 @@ class Session:
             )
         node.setposition(x, y, None)
         node.position.set_geo(lon, lat, alt)
+        self.revisions.node_changed(node.id)
         self.sdt.edit_node(node, lon, lat, alt)
 
     def open_xml(self, file_path: Path, start: bool = False) -> None:
@@ -554,19 +620,33 @@ class Session:
         """
         CoreXmlWriter(self).write(file_path)
 
-    def add_hook(self, state: EventTypes, file_name: str, data: str) -> None:
+    def add_hook(
+        self,
+        state: EventTypes,
+        file_name: str,
+        data: str,
+        options: HookOptions = None,
+    ) -> None:
         """
         Store a hook from a received file message.
 
         :param state: when to run hook
         :param file_name: file name for hook
         :param data: file data
+        :param options: options for running hook, None for defaults
         :return: nothing
         """
         should_run = self.state == state
         self.hook_manager.add_script_hook(
-            state, file_name, data, self.directory, self.get_environment(), should_run
+            state,
+            file_name,
+            data,
+            self.directory,
+            self.get_environment(),
+            should_run,
+            options,
         )
+        self.revisions.session_changed()
 
     def clear(self) -> None:
         """
@@ -577,6 +657,7 @@ class Session:
         self.emane.shutdown()
         self.delete_nodes()
         self.link_manager.reset()
+        self.topology.reset()
         self.distributed.shutdown()
         self.hook_manager.reset()
         self.emane.reset()
@@ -585,6 +666,7 @@ class Session:
         self.mobility.config_reset()
         self.link_colors.clear()
         self.control_net_manager.remove_nets()
+        self.revisions.reset()
 
     def set_location(self, lat: float, lon: float, alt: float, scale: float) -> None:
         """
@@ -598,6 +680,7 @@ class Session:
         """
         self.location.setrefgeo(lat, lon, alt)
         self.location.refscale = scale
+        self.revisions.session_changed()
 
     def shutdown(self) -> None:
         """
@@ -612,6 +695,10 @@ class Session:
             self.clear()
             # shutdown sdt
             self.sdt.shutdown()
+        # write trace including teardown, before the session directory is removed
+        self.write_trace()
+        tracing.stop(self)
+        self.tracer = None
         # remove this sessions working directory
         preserve = self.options.get_int("preservedir") == 1
         if not preserve:
@@ -639,7 +726,7 @@ class Session:
             event_type=event_type,
             name=name,
             data=data,
-            time=str(time.monotonic()),
+            time=time.monotonic(),
             session=self.id,
         )
         self.broadcast_manager.send(event_data)
@@ -680,6 +767,10 @@ class Session:
         :param source: source of broadcast, None by default
         :return: nothing
         """
+        if message_type == MessageFlags.DELETE:
+            self.revisions.node_deleted(node.id)
+        else:
+            self.revisions.node_changed(node.id)
         node_data = NodeData(node=node, message_type=message_type, source=source)
         self.broadcast_manager.send(node_data)
 
@@ -690,6 +781,7 @@ class Session:
         :param link_data: link data to send out
         :return: nothing
         """
+        self.revisions.links_changed()
         self.broadcast_manager.send(link_data)
 
     def set_state(self, state: EventTypes, send_event: bool = False) -> None:
@@ -704,6 +796,7 @@ class Session:
             return
         self.state = state
         self.state_time = time.monotonic()
+        self.revisions.session_changed()
         logger.info("changing session(%s) to state %s", self.id, state.name)
         self.hook_manager.run_hooks(state, self.directory, self.get_environment())
         if send_event:
@@ -796,6 +889,7 @@ class Session:
         :return: nothing
         """
         self.user = user
+        self.revisions.session_changed()
         try:
             uid = pwd.getpwnam(user).pw_uid
             gid = self.directory.stat().st_gid
@@ -959,6 +1053,7 @@ class Session:
                 logger.info("deleted node(%s)", node.name)
         if node:
             node.shutdown()
+            self.revisions.node_deleted(_id)
             self.sdt.delete_node(_id)
         return node is not None
 
@@ -996,7 +1091,8 @@ class Session:
         # instantiate will be invoked again upon emane configure
         if self.emane.startup() == EmaneState.NOT_READY:
             return []
-        # boot node services and then start mobility
+        # snapshot topology used by services and then boot node services
+        self.topology.build()
         exceptions = self.boot_nodes()
         if not exceptions:
             # complete wireless node
@@ -1006,6 +1102,7 @@ class Session:
             self.mobility.startup()
             # notify listeners that instantiation is complete
             self.broadcast_event(EventTypes.INSTANTIATION_COMPLETE)
+            self.write_trace()
             # startup event loop
             self.event_loop.run()
         self.set_state(EventTypes.RUNTIME_STATE, send_event=True)
@@ -1060,6 +1157,7 @@ class Session:
 
         # update control interface hosts
         self.control_net_manager.clear_etc_hosts()
+        self.write_trace()
 
     def short_session_id(self) -> str:
         """
@@ -1204,3 +1302,45 @@ class Session:
         :return: nothing
         """
         self.control_net_manager.parse_options(self.options)
+        tangent_plane = self.options.get_bool("geo_tangent_plane", False)
+        self.location.set_tangent_plane(tangent_plane)
+        self.set_tracing()
+
+    def set_tracing(self) -> None:
+        """
+        Start or stop tracing commands run for this session, based on the
+        current session options.
+
+        :return: nothing
+        """
+        if self.options.get_int("trace_commands", 0) == 1:
+            self.tracer = tracing.start(self)
+        elif self.tracer is not None:
+            tracing.stop(self)
+            self.tracer = None
+
+    def write_trace(self, limit: int = 10) -> None:
+        """
+        Write commands traced for this session next to the session directory, so
+        it remains after shutdown, and log the sources running the most commands.
+
+        :param limit: number of sources to log
+        :return: nothing
+        """
+        if self.tracer is None:
+            return
+        path = self.directory.with_name(f"{self.directory.name}.{tracing.TRACE_FILE}")
+        try:
+            self.tracer.write(path)
+        except OSError:
+            logger.exception("session(%s) error writing trace: %s", self.id, path)
+        total = len(self.tracer.events)
+        logger.info("session(%s) traced %s commands: %s", self.id, total, path)
+        for source, count, duration in self.tracer.summary(limit):
+            logger.info(
+                "session(%s) command source(%s) count(%s) time(%.3fs)",
+                self.id,
+                source,
+                count,
+                duration,
+            )
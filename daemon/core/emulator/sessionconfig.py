@@ -19,7 +19,12 @@ class SessionConfig:
         ConfigBool(id="preservedir", default="0", label="Preserve session dir"),
         ConfigBool(id="enablesdt", default="0", label="Enable SDT3D output"),
         ConfigString(id="sdturl", default=Sdt.DEFAULT_SDT_URL, label="SDT3D URL"),
+        ConfigInt(id="sdt_interval", default="100", label="SDT3D Update Interval (ms)"),
+        ConfigInt(id="sdt_mtu", default="1400", label="SDT3D Datagram Size"),
         ConfigBool(id="ovs", default="0", label="Enable OVS"),
+        ConfigBool(
+            id="geo_tangent_plane", default="0", label="Fast Local Geo Conversion"
+        ),
         ConfigInt(id="platform_id_start", default="1", label="EMANE Platform ID Start"),
         ConfigInt(id="nem_id_start", default="1", label="EMANE NEM ID Start"),
         ConfigBool(id="link_enabled", default="1", label="EMANE Links?"),
@@ -32,6 +37,7 @@ class SessionConfig:
         ConfigInt(id="link_timeout", default="4", label="EMANE Link Timeout (sec)"),
         ConfigInt(id="mtu", default="0", label="MTU for All Devices"),
         ConfigBool(id="checksums", default="0", label="Enable Eth Checksums?"),
+        ConfigBool(id="trace_commands", default="0", label="Trace Commands"),
     ]
 
     def __init__(self, config: dict[str, str] = None) -> None:
@@ -0,0 +1,208 @@
+"""
+Persistent cache of data gathered during daemon startup, allowing warm starts to
+skip searching for service modules, resolving executables and parsing emane
+manifests, when nothing they depend on has changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+from core import utils
+from core.config import Configuration
+from core.constants import COREDPY_VERSION
+from core.emane import emanemanifest, emanemodel
+from core.emane import models as emane_models
+from core.emulator.enumerations import ConfigDataTypes
+from core.errors import CoreError
+from core.services import defaults as service_defaults
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION: int = 1
+DEFAULT_EMANE_PREFIX: str = "/usr"
+
+
+def get_mtimes(path: Path, modules: bool) -> dict[str, int]:
+    """
+    Retrieve modification times for a path, and optionally all python modules
+    within it.
+
+    :param path: file or directory to get modification times for
+    :param modules: True to include python modules within a directory
+    :return: mapping of file paths to modification times
+    """
+    mtimes = {}
+    if not path.exists():
+        return mtimes
+    mtimes[str(path)] = path.stat().st_mtime_ns
+    if modules and path.is_dir():
+        for file_path in path.rglob("*.py"):
+            mtimes[str(file_path)] = file_path.stat().st_mtime_ns
+    return mtimes
+
+
+def to_config_dict(config: Configuration) -> dict[str, Any]:
+    """
+    Convert a configuration to a json serializable dict.
+
+    :param config: configuration to convert
+    :return: configuration dict
+    """
+    return dict(
+        id=config.id,
+        type=config.type.name,
+        label=config.label,
+        default=config.default,
+        options=config.options,
+        group=config.group,
+        regex=config.regex,
+    )
+
+
+def from_config_dict(data: dict[str, Any]) -> Configuration:
+    """
+    Create a configuration from a dict created by to_config_dict.
+
+    :param data: configuration dict
+    :return: configuration
+    """
+    data = dict(data)
+    data["type"] = ConfigDataTypes[data["type"]]
+    return Configuration(**data)
+
+
+class StartupCache:
+    """
+    Cache of startup data, stored as json and invalidated when core modules,
+    the executable search path, configured directories or the installed emane
+    version change.
+    """
+
+    def __init__(self, path: Path | None, rebuild: bool = False) -> None:
+        """
+        Create a StartupCache instance.
+
+        :param path: file to persist cache to, None to disable persistence
+        :param rebuild: True to ignore any currently persisted data
+        """
+        self.path: Path | None = path
+        self.rebuild: bool = rebuild
+        self.fingerprint: str | None = None
+        self.hit: bool = False
+        self.changed: bool = False
+        self.executables: dict[str, str | None] = {}
+        self.service_modules: list[str] | None = None
+        self.emane_version: str | None = None
+
+    def create_fingerprint(self, config: dict[str, str]) -> str:
+        """
+        Create a fingerprint of everything cached data depends on.
+
+        :param config: core configuration
+        :return: fingerprint
+        """
+        search_paths = os.environ.get("PATH", "").split(os.pathsep)
+        module_paths = [
+            Path(service_defaults.__file__).parent,
+            Path(emane_models.__file__).parent,
+        ]
+        for key in ("custom_services_dir", "emane_models_dir"):
+            value = config.get(key)
+            if value:
+                module_paths.append(Path(value))
+        paths = [Path(x) for x in search_paths if x]
+        emane_prefix = config.get("emane_prefix", DEFAULT_EMANE_PREFIX)
+        paths.append(Path(emane_prefix) / emanemodel.MANIFEST_PATH)
+        mtimes = {}
+        for path in module_paths:
+            mtimes.update(get_mtimes(path, modules=True))
+        for path in paths:
+            mtimes.update(get_mtimes(path, modules=False))
+        data = dict(
+            cache_version=CACHE_VERSION,
+            core_version=COREDPY_VERSION,
+            python=sys.version,
+            search_paths=search_paths,
+            emane_prefix=emane_prefix,
+            mtimes=mtimes,
+        )
+        value = json.dumps(data, sort_keys=True).encode()
+        return hashlib.sha1(value).hexdigest()
+
+    def load(self, config: dict[str, str]) -> bool:
+        """
+        Load persisted cache data, when it matches the current environment.
+
+        :param config: core configuration
+        :return: True if valid cached data was loaded, False otherwise
+        """
+        self.fingerprint = self.create_fingerprint(config)
+        if self.path is None or self.rebuild or not self.path.is_file():
+            return False
+        try:
+            with self.path.open("r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.exception("error reading startup cache: %s", self.path)
+            return False
+        if data.get("fingerprint") != self.fingerprint:
+            logger.info("startup cache is out of date, rebuilding")
+            return False
+        self.executables = data["executables"]
+        self.service_modules = data["service_modules"]
+        self.emane_version = data["emane_version"]
+        for key, configs in data["manifests"].items():
+            emanemanifest.MANIFEST_CACHE[key] = [from_config_dict(x) for x in configs]
+        self.hit = True
+        return True
+
+    def save(self) -> None:
+        """
+        Persist cache data, when it was not loaded or has changed since.
+
+        :return: nothing
+        """
+        if self.path is None or (self.hit and not self.changed):
+            return
+        manifests = {}
+        for key, configs in emanemanifest.MANIFEST_CACHE.items():
+            manifests[key] = [to_config_dict(x) for x in configs]
+        data = dict(
+            fingerprint=self.fingerprint,
+            executables=self.executables,
+            service_modules=self.service_modules,
+            emane_version=self.emane_version,
+            manifests=manifests,
+        )
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with temp_path.open("w") as f:
+                json.dump(data, f)
+            temp_path.replace(self.path)
+            self.changed = False
+        except OSError as e:
+            logger.warning("unable to write startup cache(%s): %s", self.path, e)
+
+    def which(self, command: str, required: bool) -> str | None:
+        """
+        Find location of desired executable within current PATH, using cached
+        results when available.
+
+        :param command: command to find location for
+        :param required: command is required to be found, false otherwise
+        :return: command location or None
+        :raises CoreError: when not found and required
+        """
+        if command not in self.executables:
+            self.executables[command] = utils.which(command, required=False)
+            self.changed = True
+        path = self.executables[command]
+        if path is None and required:
+            raise CoreError(f"failed to find required executable({command}) in path")
+        return path
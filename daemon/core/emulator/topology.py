@@ -0,0 +1,272 @@
+"""
+Provides a snapshot of session topology facts commonly needed when rendering
+service configurations, avoiding repeated walks of network interfaces.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from core.emane.nodes import EmaneNet
+from core.nodes.base import CoreNetworkBase, CoreNodeBase, NodeBase
+from core.nodes.interface import DEFAULT_MTU, CoreInterface
+from core.nodes.network import WlanNode
+from core.nodes.physical import Rj45Node
+from core.nodes.wireless import WirelessNode
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from core.emulator.session import Session
+
+DEFAULT_ROUTER_ID: str = "0.0.0.0"
+
+
+@dataclass
+class NetworkView:
+    """
+    Precomputed facts for a network and the interfaces connected to it.
+    """
+
+    min_mtu: int = DEFAULT_MTU
+    max_mtu: int = DEFAULT_MTU
+    rj45_count: int = 0
+    wireless: bool = False
+
+
+def create_network_view(net: NodeBase) -> NetworkView:
+    """
+    Create a network view for the provided network.
+
+    :param net: network to create view for
+    :return: network view
+    """
+    view = NetworkView(wireless=isinstance(net, (WlanNode, EmaneNet, WirelessNode)))
+    mtus = []
+    for iface in net.get_ifaces():
+        mtus.append(iface.mtu)
+        if isinstance(iface.node, Rj45Node):
+            view.rj45_count += 1
+    if mtus:
+        view.min_mtu = min(mtus)
+        view.max_mtu = max(mtus)
+    return view
+
+
+def find_router_id(node: CoreNodeBase) -> str:
+    """
+    Find the first IPv4 address of a node, to use as its router ID.
+
+    :param node: node to find router id for
+    :return: router id
+    """
+    for iface in node.get_ifaces(control=False):
+        ip4 = iface.get_ip4()
+        if ip4:
+            return str(ip4.ip)
+    return DEFAULT_ROUTER_ID
+
+
+class TopologyView:
+    """
+    Session level snapshot of topology facts, built once during instantiation
+    and updated incrementally as links change.
+    """
+
+    def __init__(self, session: "Session") -> None:
+        """
+        Create a TopologyView instance.
+
+        :param session: session this view is for
+        """
+        self.session: "Session" = session
+        self.networks: dict[NodeBase, NetworkView] = {}
+        self.router_ids: dict[int, str] = {}
+        self.render_times: dict[int, float] = {}
+        self.built: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    def reset(self) -> None:
+        """
+        Clear all current topology data.
+
+        :return: nothing
+        """
+        with self._lock:
+            self.built = False
+            self.networks.clear()
+            self.router_ids.clear()
+            self.render_times.clear()
+
+    def build(self) -> None:
+        """
+        Build topology data for all current session nodes and networks.
+
+        :return: nothing
+        """
+        networks = {}
+        router_ids = {}
+        nodes = list(self.session.nodes.values())
+        nodes.extend(self.session.ptp_nodes.values())
+        for node in nodes:
+            if isinstance(node, CoreNetworkBase):
+                networks[node] = create_network_view(node)
+            elif isinstance(node, CoreNodeBase):
+                router_ids[node.id] = find_router_id(node)
+        with self._lock:
+            self.built = True
+            self.networks = networks
+            self.router_ids = router_ids
+            self.render_times.clear()
+        logger.debug(
+            "built topology view networks(%s) nodes(%s)", len(networks), len(router_ids)
+        )
+
+    def update_iface(self, iface: CoreInterface | None) -> None:
+        """
+        Update topology data affected by a changed interface, refreshing its
+        network and node.
+
+        :param iface: interface that changed
+        :return: nothing
+        """
+        if iface is None:
+            return
+        if iface.net:
+            self.update_net(iface.net)
+        if isinstance(iface.node, CoreNodeBase):
+            self.update_node(iface.node)
+
+    def update_net(self, net: NodeBase) -> None:
+        """
+        Update topology data for a given network. Until topology data has been
+        built, cached data is only discarded, to be recreated when next used.
+
+        :param net: network to update
+        :return: nothing
+        """
+        if not self.built:
+            with self._lock:
+                self.networks.pop(net, None)
+            return
+        view = create_network_view(net)
+        with self._lock:
+            self.networks[net] = view
+
+    def update_node(self, node: CoreNodeBase) -> None:
+        """
+        Update topology data for a given node. Until topology data has been
+        built, cached data is only discarded, to be recreated when next used.
+
+        :param node: node to update
+        :return: nothing
+        """
+        if not self.built:
+            with self._lock:
+                self.router_ids.pop(node.id, None)
+            return
+        router_id = find_router_id(node)
+        with self._lock:
+            self.router_ids[node.id] = router_id
+
+    def remove_net(self, net: NodeBase) -> None:
+        """
+        Remove topology data for a network no longer in use.
+
+        :param net: network to remove
+        :return: nothing
+        """
+        with self._lock:
+            self.networks.pop(net, None)
+
+    def get_net(self, net: NodeBase) -> NetworkView:
+        """
+        Retrieve view for a network, creating it when not already known.
+
+        :param net: network to get view for
+        :return: network view
+        """
+        view = self.networks.get(net)
+        if view is None:
+            view = create_network_view(net)
+            with self._lock:
+                self.networks[net] = view
+        return view
+
+    def get_min_mtu(self, iface: CoreInterface) -> int:
+        """
+        Retrieve the minimum MTU of interfaces linked with the given interface.
+
+        :param iface: interface to get minimum mtu for
+        :return: minimum mtu
+        """
+        if not iface.net:
+            return iface.mtu
+        return min(iface.mtu, self.get_net(iface.net).min_mtu)
+
+    def has_mtu_mismatch(self, iface: CoreInterface) -> bool:
+        """
+        Check if an interface has a non default MTU or is linked with interfaces
+        using a different MTU.
+
+        :param iface: interface to check
+        :return: True if there is an mtu mismatch, False otherwise
+        """
+        if iface.mtu != DEFAULT_MTU:
+            return True
+        if not iface.net:
+            return False
+        view = self.get_net(iface.net)
+        return view.min_mtu != iface.mtu or view.max_mtu != iface.mtu
+
+    def has_rj45(self, iface: CoreInterface) -> bool:
+        """
+        Check if an interface is connected to an external RJ45 link.
+
+        :param iface: interface to check
+        :return: True if connected to an rj45, False otherwise
+        """
+        if not iface.net:
+            return False
+        count = self.get_net(iface.net).rj45_count
+        if isinstance(iface.node, Rj45Node):
+            count -= 1
+        return count > 0
+
+    def is_wireless(self, net: NodeBase | None) -> bool:
+        """
+        Check if a network is a wireless type network.
+
+        :param net: network to check
+        :return: True if wireless, False otherwise
+        """
+        if net is None:
+            return False
+        return self.get_net(net).wireless
+
+    def get_router_id(self, node: CoreNodeBase) -> str:
+        """
+        Retrieve router id for a node.
+
+        :param node: node to get router id for
+        :return: router id
+        """
+        router_id = self.router_ids.get(node.id)
+        if router_id is None:
+            router_id = find_router_id(node)
+            with self._lock:
+                self.router_ids[node.id] = router_id
+        return router_id
+
+    def set_render_time(self, node_id: int, render_time: float) -> None:
+        """
+        Record time spent rendering service files for a node.
+
+        :param node_id: node rendering occurred for
+        :param render_time: time spent rendering, in seconds
+        :return: nothing
+        """
+        with self._lock:
+            current = self.render_times.get(node_id, 0.0)
+            self.render_times[node_id] = current + render_time
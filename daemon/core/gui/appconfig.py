@@ -5,6 +5,7 @@ from pathlib import Path
 import yaml
 
 from core.gui import themes
+from core.gui.eventbuffer import DEFAULT_FPS
 
 HOME_PATH: Path = Path.home().joinpath(".coregui")
 BACKGROUNDS_PATH: Path = HOME_PATH.joinpath("backgrounds")
@@ -92,6 +93,7 @@ class PreferencesConfig(yaml.YAMLObject):
         gui3d: str = "/usr/local/bin/std3d.sh",
         width: int = 1000,
         height: int = 750,
+        fps: int = DEFAULT_FPS,
     ) -> None:
         self.theme: str = theme
         self.editor: str = editor
@@ -99,6 +101,12 @@ class PreferencesConfig(yaml.YAMLObject):
         self.gui3d: str = gui3d
         self.width: int = width
         self.height: int = height
+        self.fps: int = fps
+
+    @classmethod
+    def from_yaml(cls, loader, node):
+        values = loader.construct_mapping(node, deep=True)
+        return cls(**values)
 
 
 class LocationConfig(yaml.YAMLObject):
@@ -40,6 +40,7 @@ from core.gui.appconfig import XMLS_PATH, CoreServer, Observer
 from core.gui.dialogs.emaneinstall import EmaneInstallDialog
 from core.gui.dialogs.mobilityplayer import MobilityPlayer
 from core.gui.dialogs.sessions import SessionsDialog
+from core.gui.eventbuffer import EventBuffer
 from core.gui.graph.edges import CanvasEdge
 from core.gui.graph.node import CanvasNode
 from core.gui.interface import InterfaceManager
@@ -98,6 +99,11 @@ class CoreClient:
         self.handling_cpu_usage: grpc.Future | None = None
         self.handling_events: grpc.Future | None = None
 
+        # buffered node and link events, rendered once per frame
+        self.event_buffer: EventBuffer = EventBuffer()
+        self.event_counts: tuple[int, int] = (0, 0)
+        self.app.after(self.frame_delay(), self.render_events)
+
     @property
     def client(self) -> client.CoreGrpcClient:
         if self.session:
@@ -132,6 +138,7 @@ class CoreClient:
         # clear streams
         self.cancel_throughputs()
         self.cancel_events()
+        self.event_buffer.clear()
 
     def close_mobility_players(self) -> None:
         for mobility_player in self.mobility_players.values():
@@ -166,7 +173,7 @@ class CoreClient:
             )
             return
         if event.link_event:
-            self.app.after(0, self.handle_link_event, event.link_event)
+            self.event_buffer.add(event.link_event)
         elif event.session_event:
             session_event = event.session_event
             if session_event.event <= SessionState.SHUTDOWN.value:
@@ -191,12 +198,41 @@ class CoreClient:
             else:
                 logger.warning("unknown session event: %s", session_event)
         elif event.node_event:
-            self.app.after(0, self.handle_node_event, event.node_event)
+            self.event_buffer.add(event.node_event)
         elif event.alert_event:
             self.handle_alert_event(event.alert_event)
         else:
             logger.info("unhandled event: %s", event)
 
+    def frame_delay(self) -> int:
+        fps = max(self.app.guiconfig.preferences.fps, 1)
+        return int(1000 / fps)
+
+    def render_events(self) -> None:
+        """
+        Apply all buffered node and link events in a single pass and schedule the
+        next frame.
+
+        :return: nothing
+        """
+        events = self.event_buffer.drain()
+        for event in events:
+            try:
+                if isinstance(event, LinkEvent):
+                    self.handle_link_event(event)
+                else:
+                    self.handle_node_event(event)
+            except Exception:
+                logger.exception("error handling event: %s", event)
+        if events:
+            for canvas in self.app.manager.all():
+                canvas.detail.schedule()
+        event_counts = (self.event_buffer.coalesced, self.event_buffer.dropped)
+        if event_counts != self.event_counts:
+            self.event_counts = event_counts
+            self.app.statusbar.set_events(*event_counts)
+        self.app.after(self.frame_delay(), self.render_events)
+
     def handle_link_event(self, event: LinkEvent) -> None:
         logger.debug("Link event: %s", event)
         node1_id = event.link.node1_id
@@ -26,6 +26,7 @@ class PreferencesDialog(Dialog):
         self.theme: tk.StringVar = tk.StringVar(value=preferences.theme)
         self.terminal: tk.StringVar = tk.StringVar(value=preferences.terminal)
         self.gui3d: tk.StringVar = tk.StringVar(value=preferences.gui3d)
+        self.fps: tk.IntVar = tk.IntVar(value=preferences.fps)
         self.draw()
 
     def draw(self) -> None:
@@ -67,11 +68,16 @@ class PreferencesDialog(Dialog):
         entry = ttk.Entry(frame, textvariable=self.gui3d)
         entry.grid(row=3, column=1, sticky=tk.EW)
 
-        label = ttk.Label(frame, text="Scaling")
+        label = ttk.Label(frame, text="Event FPS")
         label.grid(row=4, column=0, pady=PADY, padx=PADX, sticky=tk.W)
+        entry = validation.PositiveIntEntry(frame, textvariable=self.fps)
+        entry.grid(row=4, column=1, sticky=tk.EW)
+
+        label = ttk.Label(frame, text="Scaling")
+        label.grid(row=5, column=0, pady=PADY, padx=PADX, sticky=tk.W)
 
         scale_frame = ttk.Frame(frame)
-        scale_frame.grid(row=4, column=1, sticky=tk.EW)
+        scale_frame.grid(row=5, column=1, sticky=tk.EW)
         scale_frame.columnconfigure(0, weight=1)
         scale = ttk.Scale(
             scale_frame,
@@ -113,6 +119,7 @@ class PreferencesDialog(Dialog):
         preferences.editor = self.editor.get()
         preferences.gui3d = self.gui3d.get()
         preferences.theme = self.theme.get()
+        preferences.fps = max(self.fps.get(), 1)
         self.gui_scale.set(round(self.gui_scale.get(), 2))
         app_scale = self.gui_scale.get()
         self.app.guiconfig.scale = app_scale
@@ -0,0 +1,104 @@
+"""
+Buffering of session events received from the grpc event stream, coalescing
+updates so they can be applied to the canvas once per frame.
+"""
+import logging
+import threading
+from collections.abc import Hashable
+from typing import Union
+
+from core.api.grpc.wrappers import LinkEvent, LinkType, MessageType, NodeEvent
+
+logger = logging.getLogger(__name__)
+
+BufferedEvent = Union[LinkEvent, NodeEvent]
+DEFAULT_FPS: int = 30
+DEFAULT_MAX_PENDING: int = 20000
+
+
+def get_event_key(event: BufferedEvent) -> Hashable:
+    """
+    Retrieve the key used to coalesce updates for the same node or edge.
+
+    :param event: event to get key for
+    :return: coalescing key
+    """
+    if isinstance(event, NodeEvent):
+        return "node", event.node.id
+    link = event.link
+    if link.type == LinkType.WIRELESS:
+        node_ids = tuple(sorted((link.node1_id, link.node2_id)))
+        return "wireless", node_ids, link.network_id
+    iface1_id = link.iface1.id if link.iface1 else None
+    iface2_id = link.iface2.id if link.iface2 else None
+    return "wired", link.node1_id, link.node2_id, iface1_id, iface2_id
+
+
+class EventBuffer:
+    """
+    Thread safe buffer of node and link events. Update events for the same node
+    or edge are coalesced to the latest one, while add and delete events are
+    always kept and preserve ordering.
+    """
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING) -> None:
+        """
+        Create an EventBuffer instance.
+
+        :param max_pending: maximum number of pending events, before new updates
+            are dropped
+        """
+        self.max_pending: int = max_pending
+        self.coalesced: int = 0
+        self.dropped: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._pending: list[BufferedEvent] = []
+        self._updates: dict[Hashable, int] = {}
+
+    def add(self, event: BufferedEvent) -> None:
+        """
+        Add an event to the buffer.
+
+        :param event: event to add
+        :return: nothing
+        """
+        key = get_event_key(event)
+        with self._lock:
+            if event.message_type == MessageType.NONE:
+                index = self._updates.get(key)
+                if index is not None:
+                    self._pending[index] = event
+                    self.coalesced += 1
+                    return
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    return
+                self._updates[key] = len(self._pending)
+            else:
+                # later updates must be applied after this event
+                self._updates.pop(key, None)
+            self._pending.append(event)
+
+    def drain(self) -> list[BufferedEvent]:
+        """
+        Remove and return all pending events, in the order they should be applied.
+
+        :return: pending events
+        """
+        with self._lock:
+            events = self._pending
+            self._pending = []
+            self._updates.clear()
+        return events
+
+    def clear(self) -> None:
+        """
+        Clear pending events and counters.
+
+        :return: nothing
+        """
+        with self._lock:
+            self._pending.clear()
+            self._updates.clear()
+            self.coalesced = 0
+            self.dropped = 0
@@ -0,0 +1,269 @@
+"""
+Level of detail rendering for large canvases, hiding decorations when zoomed out,
+culling them outside of the visible viewport and bundling dense wireless edges.
+"""
+import logging
+import math
+import time
+import tkinter as tk
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from core.gui.graph import tags
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from core.gui.graph.graph import CanvasGraph
+    from core.gui.graph.node import CanvasNode
+
+LABEL_ZOOM: float = 0.6
+BUNDLE_ZOOM: float = 0.4
+BUNDLE_MIN_EDGES: int = 200
+BUNDLE_CELL: int = 100
+BUNDLE_COLOR: str = "#009933"
+BUNDLE_MAX_WIDTH: int = 8
+CULL_MARGIN: int = 50
+
+Line = tuple[float, float, float, float]
+
+
+class DetailLevel(Enum):
+    FULL = 0
+    REDUCED = 1
+    BUNDLED = 2
+
+
+def get_detail_level(ratio: float) -> DetailLevel:
+    """
+    Determine the level of detail to render for a given zoom ratio.
+
+    :param ratio: current canvas zoom ratio
+    :return: level of detail
+    """
+    if ratio < BUNDLE_ZOOM:
+        return DetailLevel.BUNDLED
+    elif ratio < LABEL_ZOOM:
+        return DetailLevel.REDUCED
+    else:
+        return DetailLevel.FULL
+
+
+@dataclass
+class Bundle:
+    """
+    Aggregate of lines running between the same pair of grid cells.
+    """
+
+    count: int = 0
+    x1: float = 0.0
+    y1: float = 0.0
+    x2: float = 0.0
+    y2: float = 0.0
+
+    def add(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        self.count += 1
+        self.x1 += x1
+        self.y1 += y1
+        self.x2 += x2
+        self.y2 += y2
+
+    def line(self) -> Line:
+        return (
+            self.x1 / self.count,
+            self.y1 / self.count,
+            self.x2 / self.count,
+            self.y2 / self.count,
+        )
+
+    def width(self) -> int:
+        return min(1 + int(math.log2(self.count)), BUNDLE_MAX_WIDTH)
+
+
+def create_bundles(lines: Iterable[Line], cell: int = BUNDLE_CELL) -> list[Bundle]:
+    """
+    Aggregate lines into bundles, based on the grid cells their end points fall
+    within. Lines within a single cell are dropped, as they would not be visible.
+
+    :param lines: lines to bundle
+    :param cell: size of grid cells
+    :return: bundles of lines
+    """
+    bundles = {}
+    for x1, y1, x2, y2 in lines:
+        cell1 = (int(x1 // cell), int(y1 // cell))
+        cell2 = (int(x2 // cell), int(y2 // cell))
+        if cell1 == cell2:
+            continue
+        if cell2 < cell1:
+            cell1, cell2 = cell2, cell1
+            x1, y1, x2, y2 = x2, y2, x1, y1
+        key = (cell1, cell2)
+        bundle = bundles.get(key)
+        if bundle is None:
+            bundle = Bundle()
+            bundles[key] = bundle
+        bundle.add(x1, y1, x2, y2)
+    return list(bundles.values())
+
+
+class CanvasDetail:
+    """
+    Manages level of detail for a canvas. Updates are deferred to when the
+    canvas is idle, so multiple zoom or scroll steps only result in one update.
+    """
+
+    def __init__(self, canvas: "CanvasGraph") -> None:
+        """
+        Create a CanvasDetail instance.
+
+        :param canvas: canvas to manage detail for
+        """
+        self.canvas: "CanvasGraph" = canvas
+        self.level: DetailLevel = DetailLevel.FULL
+        self.bundles: list[int] = []
+        self.update_time: float = 0.0
+        self._pending: str | None = None
+
+    def schedule(self) -> None:
+        """
+        Schedule a detail update, when one is not already pending.
+
+        :return: nothing
+        """
+        if self._pending is None:
+            self._pending = self.canvas.after_idle(self.update)
+
+    def cancel(self) -> None:
+        """
+        Cancel a pending detail update.
+
+        :return: nothing
+        """
+        if self._pending is not None:
+            self.canvas.after_cancel(self._pending)
+            self._pending = None
+
+    def update(self) -> None:
+        """
+        Update canvas items to reflect the current zoom and viewport.
+
+        :return: nothing
+        """
+        self._pending = None
+        start = time.perf_counter()
+        self.level = get_detail_level(self.canvas.ratio)
+        visible = self.visible_nodes()
+        self.update_decorations(visible)
+        self.update_wireless()
+        self.update_time = time.perf_counter() - start
+        logger.debug(
+            "detail level(%s) visible nodes(%s) bundles(%s) time(%.4f)",
+            self.level.name,
+            len(visible),
+            len(self.bundles),
+            self.update_time,
+        )
+
+    def viewport(self) -> tuple[float, float, float, float]:
+        """
+        Retrieve the currently visible canvas region, including a margin.
+
+        :return: visible region as x1, y1, x2, y2
+        """
+        x1 = self.canvas.canvasx(0) - CULL_MARGIN
+        y1 = self.canvas.canvasy(0) - CULL_MARGIN
+        x2 = self.canvas.canvasx(self.canvas.winfo_width()) + CULL_MARGIN
+        y2 = self.canvas.canvasy(self.canvas.winfo_height()) + CULL_MARGIN
+        return x1, y1, x2, y2
+
+    def visible_nodes(self) -> list["CanvasNode"]:
+        """
+        Retrieve the shown nodes within the visible viewport.
+
+        :return: visible nodes
+        """
+        nodes = []
+        for item_id in self.canvas.find_overlapping(*self.viewport()):
+            node = self.canvas.nodes.get(item_id)
+            if node and not node.hidden:
+                nodes.append(node)
+        return nodes
+
+    def update_decorations(self, visible: list["CanvasNode"]) -> None:
+        """
+        Hide node labels, antennas and link labels, then show them only for the
+        provided nodes when at full detail.
+
+        :param visible: nodes to show decorations for
+        :return: nothing
+        """
+        for tag in (tags.NODE_LABEL, tags.ANTENNA, tags.LINK_LABEL):
+            self.canvas.itemconfigure(tag, state=tk.HIDDEN)
+        if self.level != DetailLevel.FULL:
+            return
+        manager = self.canvas.manager
+        node_state = manager.show_node_labels.state()
+        link_state = manager.show_link_labels.state()
+        edges = set()
+        for node in visible:
+            node.set_label(node_state)
+            for antenna_id in node.antennas:
+                self.canvas.itemconfigure(antenna_id, state=tk.NORMAL)
+            edges.update(node.edges)
+            edges.update(node.wireless_edges)
+        if link_state == tk.HIDDEN:
+            return
+        for edge in edges:
+            if edge.hidden:
+                continue
+            label_ids = []
+            if edge.src.canvas is self.canvas:
+                label_ids.extend([edge.src_label, edge.middle_label, edge.dst_label])
+            if edge.id2 is not None and edge.dst.canvas is self.canvas:
+                label_ids.extend([edge.src_label2, edge.middle_label2, edge.dst_label2])
+            for label_id in label_ids:
+                if label_id is not None:
+                    self.canvas.itemconfigure(label_id, state=link_state)
+
+    def update_wireless(self) -> None:
+        """
+        Replace wireless edges with bundles when zoomed out on dense wireless
+        networks, otherwise restore individual wireless edges.
+
+        :return: nothing
+        """
+        self.canvas.delete(tags.WIRELESS_BUNDLE)
+        self.bundles.clear()
+        manager = self.canvas.manager
+        edges = [
+            x
+            for x in manager.wireless_edges.values()
+            if x.src.canvas is self.canvas and x.dst.canvas is self.canvas
+        ]
+        state = manager.show_wireless.state()
+        bundle = self.level == DetailLevel.BUNDLED and len(edges) >= BUNDLE_MIN_EDGES
+        self.canvas.itemconfigure(
+            tags.WIRELESS_EDGE, state=tk.HIDDEN if bundle else state
+        )
+        for edge in edges:
+            if edge.hidden:
+                self.canvas.itemconfigure(edge.id, state=tk.HIDDEN)
+        if not bundle or state == tk.HIDDEN:
+            return
+        lines = []
+        for edge in edges:
+            if not edge.hidden:
+                coords = self.canvas.coords(edge.id)
+                lines.append((*coords[:2], *coords[-2:]))
+        for line in create_bundles(lines):
+            bundle_id = self.canvas.create_line(
+                *line.line(),
+                width=line.width(),
+                fill=BUNDLE_COLOR,
+                tags=tags.WIRELESS_BUNDLE,
+            )
+            self.bundles.append(bundle_id)
+        self.canvas.tag_lower(tags.WIRELESS_BUNDLE, tags.NODE)
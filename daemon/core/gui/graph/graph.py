@@ -13,6 +13,7 @@ from core.gui import appconfig
 from core.gui import nodeutils as nutils
 from core.gui.dialogs.shapemod import ShapeDialog
 from core.gui.graph import tags
+from core.gui.graph.detail import CanvasDetail
 from core.gui.graph.edges import EDGE_WIDTH, CanvasEdge
 from core.gui.graph.enums import GraphMode, ScaleOption
 from core.gui.graph.node import CanvasNode, ShadowNode
@@ -67,6 +68,7 @@ class CanvasGraph(tk.Canvas):
         self.offset: tuple[int, int] = (0, 0)
         self.cursor: tuple[int, int] = (0, 0)
         self.to_copy: list[CanvasNode] = []
+        self.detail: CanvasDetail = CanvasDetail(self)
 
         # background related
         self.wallpaper_id: int | None = None
@@ -119,7 +121,8 @@ class CanvasGraph(tk.Canvas):
         self.bind("<Button-4>", lambda e: self.zoom(e, ZOOM_IN))
         self.bind("<Button-5>", lambda e: self.zoom(e, ZOOM_OUT))
         self.bind("<ButtonPress-3>", lambda e: self.scan_mark(e.x, e.y))
-        self.bind("<B3-Motion>", lambda e: self.scan_dragto(e.x, e.y, gain=1))
+        self.bind("<B3-Motion>", self.scan_drag)
+        self.bind("<Configure>", lambda e: self.detail.schedule())
 
     def get_shadow(self, node: CanvasNode) -> ShadowNode:
         shadow_node = self.shadow_core_nodes.get(node.core_node.id)
@@ -344,6 +347,23 @@ class CanvasGraph(tk.Canvas):
         self.app.statusbar.set_zoom(self.ratio)
         if self.wallpaper:
             self.redraw_wallpaper()
+        self.detail.schedule()
+
+    def scan_drag(self, event: tk.Event) -> None:
+        self.scan_dragto(event.x, event.y, gain=1)
+        self.detail.schedule()
+
+    def xview(self, *args: Any) -> Any:
+        result = super().xview(*args)
+        if args:
+            self.detail.schedule()
+        return result
+
+    def yview(self, *args: Any) -> Any:
+        result = super().yview(*args)
+        if args:
+            self.detail.schedule()
+        return result
 
     def click_press(self, event: tk.Event) -> None:
         """
@@ -624,6 +644,7 @@ class CanvasGraph(tk.Canvas):
         self.delete(tags.GRIDLINE)
         self.draw_grid()
         self.app.manager.show_grid.click_handler()
+        self.detail.schedule()
 
     def redraw_wallpaper(self) -> None:
         if self.adjust_to_dim.get():
@@ -41,6 +41,11 @@ class ShowVar(BooleanVar):
     def click_handler(self) -> None:
         for canvas in self.manager.all():
             canvas.itemconfigure(self.tag, state=self.state())
+        self.update_detail()
+
+    def update_detail(self) -> None:
+        for canvas in self.manager.all():
+            canvas.detail.schedule()
 
 
 class ShowNodeLabels(ShowVar):
@@ -50,6 +55,7 @@ class ShowNodeLabels(ShowVar):
             for node in canvas.nodes.values():
                 if not node.hidden:
                     node.set_label(state)
+        self.update_detail()
 
 
 class ShowLinks(ShowVar):
@@ -65,6 +71,7 @@ class ShowLinkLabels(ShowVar):
         for edge in self.manager.edges.values():
             if not edge.hidden:
                 edge.set_labels(state)
+        self.update_detail()
 
 
 class CanvasManager:
@@ -262,9 +269,10 @@ class CanvasManager:
             else:
                 self.add_wired_edge(node1, node2, link, organize=False)
 
-        # organize canvas order
+        # organize canvas order and apply level of detail
         for canvas in self.canvases.values():
             canvas.organize()
+            canvas.detail.schedule()
 
         # parse metada for edge configs and hidden nodes
         self.parse_metadata_edges(session.metadata)
@@ -473,6 +473,7 @@ class CanvasNode:
             other_node = edge.other_node(self)
             if edge.hidden and not other_node.hidden:
                 edge.show()
+        self.canvas.detail.schedule()
 
     def set_label(self, state: str) -> None:
         self.canvas.itemconfig(self.text_id, state=state)
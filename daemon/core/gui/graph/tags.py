@@ -6,6 +6,7 @@ EDGE: str = "edge"
 LOSS_EDGES: str = "loss-edge"
 LINK_LABEL: str = "linklabel"
 WIRELESS_EDGE: str = "wireless"
+WIRELESS_BUNDLE: str = "wirelessbundle"
 ANTENNA: str = "antenna"
 NODE_LABEL: str = "nodename"
 NODE: str = "node"
@@ -20,6 +21,7 @@ ORGANIZE_TAGS: list[str] = [
     SHAPE_TEXT,
     EDGE,
     WIRELESS_EDGE,
+    WIRELESS_BUNDLE,
     LINK_LABEL,
     ANTENNA,
     NODE,
@@ -35,6 +37,7 @@ RESET_TAGS: list[str] = [
     LINK_LABEL,
     ANTENNA,
     WIRELESS_EDGE,
+    WIRELESS_BUNDLE,
     SELECTION,
     SHAPE,
     SHAPE_TEXT,
@@ -21,6 +21,7 @@ class StatusBar(ttk.Frame):
         self.statusvar: tk.StringVar = tk.StringVar()
         self.zoom: ttk.Label | None = None
         self.cpu_label: ttk.Label | None = None
+        self.events_label: ttk.Label | None = None
         self.alerts_button: ttk.Button | None = None
         self.alert_style = Styles.no_alert
         self.running: bool = False
@@ -32,6 +33,7 @@ class StatusBar(ttk.Frame):
         self.columnconfigure(1, weight=1)
         self.columnconfigure(2, weight=1)
         self.columnconfigure(3, weight=1)
+        self.columnconfigure(4, weight=1)
 
         frame = ttk.Frame(self, borderwidth=1, relief=tk.RIDGE)
         frame.grid(row=0, column=0, sticky=tk.EW)
@@ -55,14 +57,23 @@ class StatusBar(ttk.Frame):
         self.cpu_label.grid(row=0, column=2, sticky=tk.EW)
         self.set_cpu(0.0)
 
+        self.events_label = ttk.Label(
+            self, anchor=tk.CENTER, borderwidth=1, relief=tk.RIDGE
+        )
+        self.events_label.grid(row=0, column=3, sticky=tk.EW)
+        self.set_events(0, 0)
+
         self.alerts_button = ttk.Button(
             self, text="Alerts", command=self.click_alerts, style=self.alert_style
         )
-        self.alerts_button.grid(row=0, column=3, sticky=tk.EW)
+        self.alerts_button.grid(row=0, column=4, sticky=tk.EW)
 
     def set_cpu(self, usage: float) -> None:
         self.cpu_label.config(text=f"CPU {usage * 100:.2f}%")
 
+    def set_events(self, coalesced: int, dropped: int) -> None:
+        self.events_label.config(text=f"EVENTS {coalesced} merged {dropped} dropped")
+
     def set_zoom(self, zoom: float) -> None:
         self.zoom.config(text=f"ZOOM {zoom * 100:.0f}%")
 
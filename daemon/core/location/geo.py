@@ -3,6 +3,7 @@ Provides conversions from x,y,z to lon,lat,alt.
 """
 
 import logging
+import math
 
 import pyproj
 from pyproj import Transformer
@@ -11,6 +12,8 @@ logger = logging.getLogger(__name__)
 SCALE_FACTOR: float = 100.0
 CRS_WGS84: int = 4326
 CRS_PROJ: int = 3857
+# sphere radius used by the web mercator projection
+EARTH_RADIUS: float = 6378137.0
 
 
 class GeoLocation:
@@ -35,6 +38,59 @@ class GeoLocation:
         self.refgeo: tuple[float, float, float] = (0.0, 0.0, 0.0)
         self.refxyz: tuple[float, float, float] = (0.0, 0.0, 0.0)
         self.refscale: float = 1.0
+        self.tangent_plane: bool = False
+        self._cos_lat: float = 1.0
+        self._sin_lat: float = 0.0
+        self._sec_lat: float = 1.0
+        self._tan_lat: float = 0.0
+
+    def set_tangent_plane(self, enabled: bool) -> None:
+        """
+        Enable or disable converting positions using a local tangent plane
+        approximation of the projection at the reference point. This avoids
+        projection transforms and is accurate to millimeters for scenarios
+        within tens of kilometers of the reference point.
+
+        :param enabled: True to enable, False to disable
+        :return: nothing
+        """
+        self.tangent_plane = enabled
+
+    def _set_tangent_reference(self) -> None:
+        lat = math.radians(self.refgeo[0])
+        self._cos_lat = math.cos(lat)
+        self._sin_lat = math.sin(lat)
+        self._sec_lat = 1 / self._cos_lat
+        self._tan_lat = math.tan(lat)
+
+    def _tangent_to_geo(self, px: float, py: float) -> tuple[float, float]:
+        """
+        Convert projected offsets from the reference point to lon,lat, using a
+        second order expansion of the inverse projection at the reference point.
+
+        :param px: projected x offset in meters
+        :param py: projected y offset in meters
+        :return: lon,lat
+        """
+        u = py / EARTH_RADIUS
+        dlat = self._cos_lat * u - 0.5 * self._sin_lat * self._cos_lat * u * u
+        lon = self.refgeo[1] + math.degrees(px / EARTH_RADIUS)
+        lat = self.refgeo[0] + math.degrees(dlat)
+        return lon, lat
+
+    def _tangent_to_proj(self, lat: float, lon: float) -> tuple[float, float]:
+        """
+        Convert lat,lon to projected offsets from the reference point, using a
+        second order expansion of the projection at the reference point.
+
+        :param lat: latitude value
+        :param lon: longitude value
+        :return: projected x,y offsets in meters
+        """
+        dlat = math.radians(lat - self.refgeo[0])
+        u = self._sec_lat * dlat + 0.5 * self._sec_lat * self._tan_lat * dlat * dlat
+        px = EARTH_RADIUS * math.radians(lon - self.refgeo[1])
+        return px, EARTH_RADIUS * u
 
     def setrefgeo(self, lat: float, lon: float, alt: float) -> None:
         """
@@ -48,6 +104,7 @@ class GeoLocation:
         self.refgeo = (lat, lon, alt)
         px, py = self.to_pixels.transform(lon, lat)
         self.refproj = (px, py, alt)
+        self._set_tangent_reference()
 
     def reset(self) -> None:
         """
@@ -59,6 +116,7 @@ class GeoLocation:
         self.refgeo = (0.0, 0.0, 0.0)
         self.refscale = 1.0
         self.refproj = self.to_pixels.transform(*self.refgeo)
+        self._set_tangent_reference()
 
     def pixels2meters(self, value: float) -> float:
         """
@@ -90,9 +148,12 @@ class GeoLocation:
         :return: x,y,z representation of provided values
         """
         logger.debug("input lon,lat,alt(%s, %s, %s)", lon, lat, alt)
-        px, py = self.to_pixels.transform(lon, lat)
-        px -= self.refproj[0]
-        py -= self.refproj[1]
+        if self.tangent_plane:
+            px, py = self._tangent_to_proj(lat, lon)
+        else:
+            px, py = self.to_pixels.transform(lon, lat)
+            px -= self.refproj[0]
+            py -= self.refproj[1]
         pz = alt - self.refproj[2]
         x = self.meters2pixels(px) + self.refxyz[0]
         y = -(self.meters2pixels(py) + self.refxyz[1])
@@ -116,9 +177,73 @@ class GeoLocation:
             z = self.refxyz[2]
         else:
             z -= self.refxyz[2]
-        px = self.refproj[0] + self.pixels2meters(x)
-        py = self.refproj[1] + self.pixels2meters(y)
-        lon, lat = self.to_geo.transform(px, py)
+        if self.tangent_plane:
+            lon, lat = self._tangent_to_geo(
+                self.pixels2meters(x), self.pixels2meters(y)
+            )
+        else:
+            px = self.refproj[0] + self.pixels2meters(x)
+            py = self.refproj[1] + self.pixels2meters(y)
+            lon, lat = self.to_geo.transform(px, py)
         alt = self.refgeo[2] + self.pixels2meters(z)
         logger.debug("result lon,lat,alt(%s, %s, %s)", lon, lat, alt)
         return lat, lon, alt
+
+    def getgeo_many(
+        self, positions: list[tuple[float, float, float | None]]
+    ) -> list[tuple[float, float, float]]:
+        """
+        Convert several x,y,z positions to lon,lat,alt, using a single projection
+        transform for all of them.
+
+        :param positions: x,y,z positions to convert
+        :return: lat,lon,alt representations of provided positions, in order
+        """
+        if not positions:
+            return []
+        scale = self.refscale / SCALE_FACTOR
+        ref_x, ref_y, ref_z = self.refxyz
+        pxs, pys, alts = [], [], []
+        for x, y, z in positions:
+            z = ref_z if z is None else z - ref_z
+            pxs.append((x - ref_x) * scale)
+            pys.append((ref_y - y) * scale)
+            alts.append(self.refgeo[2] + z * scale)
+        if self.tangent_plane:
+            geos = [self._tangent_to_geo(px, py) for px, py in zip(pxs, pys)]
+            return [(lat, lon, alt) for (lon, lat), alt in zip(geos, alts)]
+        pxs = [self.refproj[0] + x for x in pxs]
+        pys = [self.refproj[1] + y for y in pys]
+        lons, lats = self.to_geo.transform(pxs, pys)
+        return list(zip(lats, lons, alts))
+
+    def getxyz_many(
+        self, positions: list[tuple[float, float, float]]
+    ) -> list[tuple[float, float, float]]:
+        """
+        Convert several lat,lon,alt positions to x,y,z, using a single projection
+        transform for all of them.
+
+        :param positions: lat,lon,alt positions to convert
+        :return: x,y,z representations of provided positions, in order
+        """
+        if not positions:
+            return []
+        if self.tangent_plane:
+            projs = [self._tangent_to_proj(lat, lon) for lat, lon, _ in positions]
+        else:
+            lats = [x[0] for x in positions]
+            lons = [x[1] for x in positions]
+            pxs, pys = self.to_pixels.transform(lons, lats)
+            ref_px, ref_py, _ = self.refproj
+            projs = [(px - ref_px, py - ref_py) for px, py in zip(pxs, pys)]
+        scale = 0.0 if self.refscale == 0.0 else SCALE_FACTOR / self.refscale
+        ref_x, ref_y, ref_z = self.refxyz
+        ref_alt = self.refproj[2]
+        results = []
+        for (px, py), (_, _, alt) in zip(projs, positions):
+            x = px * scale + ref_x
+            y = -(py * scale + ref_y)
+            z = (alt - ref_alt) * scale + ref_z
+            results.append((x, y, z))
+        return results
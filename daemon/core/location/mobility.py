@@ -11,7 +11,7 @@ from functools import total_ordering
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 
-from core import utils
+from core import metrics, utils
 from core.config import (
     ConfigBool,
     ConfigFloat,
@@ -252,21 +252,20 @@ class BasicRangeModel(WirelessModel):
         self.loss: float | None = None
         self.jitter: int | None = None
         self.promiscuous: bool = False
+        # shared by link messages, replaced rather than modified on changes
+        self.options: LinkOptions = LinkOptions()
 
     def setlinkparams(self) -> None:
         """
         Apply link parameters to all interfaces. This is invoked from
         WlanNode.setmodel() after the position callback has been set.
         """
+        self.options = LinkOptions(
+            bandwidth=self.bw, delay=self.delay, loss=self.loss, jitter=self.jitter
+        )
         with self.iface_lock:
             for iface in self.iface_to_pos:
-                options = LinkOptions(
-                    bandwidth=self.bw,
-                    delay=self.delay,
-                    loss=self.loss,
-                    jitter=self.jitter,
-                )
-                iface.update_options(options)
+                iface.update_options(self.options)
 
     def get_position(self, iface: CoreInterface) -> tuple[float, float, float]:
         """
@@ -416,9 +415,7 @@ class BasicRangeModel(WirelessModel):
             node2_id=iface2.node.id,
             iface2=iface2.get_data(),
             network_id=self.wlan.id,
-            options=LinkOptions(
-                bandwidth=self.bw, delay=self.delay, loss=self.loss, jitter=self.jitter
-            ),
+            options=self.options,
             color=color,
         )
 
@@ -531,6 +528,7 @@ class WayPointMobility(WirelessModel):
     def startup(self):
         raise NotImplementedError
 
+    @metrics.timed("mobility_tick", lambda self: self.net.name)
     def runround(self) -> None:
         """
         Advance script time and move nodes.
@@ -0,0 +1,253 @@
+"""
+Lightweight metrics for emulator hot paths, recording counts and latency
+histograms for operations, which can be retrieved over grpc or served as
+prometheus text. Recording is disabled by default, in which case instrumented
+functions only perform a flag check.
+"""
+
+import bisect
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PROMETHEUS_PREFIX: str = "core"
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4"
+
+
+class Histogram:
+    """
+    Count, total and bucketed counts of observed durations.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a Histogram instance.
+        """
+        self.count: int = 0
+        self.total: float = 0.0
+        self.buckets: list[int] = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, value: float) -> None:
+        """
+        Record an observed duration.
+
+        :param value: duration in seconds
+        :return: nothing
+        """
+        self.count += 1
+        self.total += value
+        self.buckets[bisect.bisect_left(BUCKETS, value)] += 1
+
+    def copy(self) -> "Histogram":
+        """
+        Create a copy of this histogram.
+
+        :return: histogram copy
+        """
+        histogram = Histogram()
+        histogram.count = self.count
+        histogram.total = self.total
+        histogram.buckets = list(self.buckets)
+        return histogram
+
+
+class Metrics:
+    """
+    Histograms of durations, by metric name and label.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a Metrics instance.
+        """
+        self.enabled: bool = False
+        self.lock: threading.Lock = threading.Lock()
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+
+    def observe(self, name: str, label: str, value: float) -> None:
+        """
+        Record an observed duration for a metric.
+
+        :param name: name of metric
+        :param label: label within metric, such as the command or operation
+        :param value: duration in seconds
+        :return: nothing
+        """
+        key = (name, label)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = Histogram()
+                self.histograms[key] = histogram
+            histogram.observe(value)
+
+    def get(self, reset: bool = False) -> dict[tuple[str, str], Histogram]:
+        """
+        Retrieve a snapshot of current metrics.
+
+        :param reset: True to clear metrics after retrieving them
+        :return: histograms by metric name and label
+        """
+        with self.lock:
+            histograms = {k: v.copy() for k, v in sorted(self.histograms.items())}
+            if reset:
+                self.histograms.clear()
+        return histograms
+
+    def reset(self) -> None:
+        """
+        Clear all current metrics.
+
+        :return: nothing
+        """
+        with self.lock:
+            self.histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Convert current metrics to prometheus text exposition format.
+
+        :return: prometheus text
+        """
+        lines = []
+        current = None
+        for (name, label), histogram in self.get().items():
+            metric = f"{PROMETHEUS_PREFIX}_{name}_seconds"
+            if name != current:
+                current = name
+                lines.append(f"# TYPE {metric} histogram")
+            label = label.replace("\\", "\\\\").replace('"', '\\"')
+            count = 0
+            for bound, value in zip(BUCKETS + (float("inf"),), histogram.buckets):
+                count += value
+                bound = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{op="{label}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{op="{label}"}} {histogram.total}')
+            lines.append(f'{metric}_count{{op="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS: Metrics = Metrics()
+
+
+def command_name(args: str, *_: Any, **__: Any) -> str:
+    """
+    Retrieve the name of the program run by a command.
+
+    :param args: command arguments
+    :return: program name
+    """
+    parts = args.split(maxsplit=1)
+    return parts[0].rsplit("/", 1)[-1] if parts else ""
+
+
+def timed(
+    name: str, label: str | Callable[..., str] = None
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator recording the duration of calls to a function, when metrics are
+    enabled.
+
+    :param name: name of metric to record
+    :param label: label to record calls under, or a function provided the call
+        arguments returning the label, defaults to the function name
+    :return: decorator
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        get_label = label if callable(label) else None
+        value = func.__name__ if label is None else label
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                current = get_label(*args, **kwargs) if get_label else value
+                METRICS.observe(name, current, duration)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument(name: str) -> Callable[[type[T]], type[T]]:
+    """
+    Class decorator recording the duration of calls to the public methods
+    defined by a class, labeled by method name.
+
+    :param name: name of metric to record
+    :return: class decorator
+    """
+
+    def decorator(cls: type[T]) -> type[T]:
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not callable(value):
+                continue
+            setattr(cls, attr, timed(name, attr)(value))
+        return cls
+
+    return decorator
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """
+    Serves current metrics as prometheus text.
+    """
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        data = METRICS.to_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("metrics request: %s", format % args)
+
+
+def start_server(address: str, port: int) -> ThreadingHTTPServer:
+    """
+    Start serving prometheus text metrics over http in a background thread.
+
+    :param address: address to listen on
+    :param port: port to listen on
+    :return: http server
+    """
+    server = ThreadingHTTPServer((address, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logger.info("serving prometheus metrics on: %s:%s", address, port)
+    return server
@@ -13,10 +13,11 @@ from typing import TYPE_CHECKING
 
 import netaddr
 
-from core import utils
+from core import metrics, utils
 from core.emulator.data import InterfaceData, LinkOptions
 from core.errors import CoreCommandError, CoreError
 from core.executables import BASH, MOUNT, TEST, VCMD, VNODED
+from core.metrics import command_name
 from core.nodes.interface import DEFAULT_MTU, CoreInterface
 from core.nodes.netclient import LinuxNetClient, get_net_client
 from core.services.dependencies import ServiceDependencies
@@ -26,7 +27,7 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from core.emulator.distributed import DistributedServer
     from core.emulator.session import Session
-    from core.services.base import CoreService
+    from core.services.base import CoreService, TopologyDep
 
     ServiceType = type[CoreService]
 
@@ -301,12 +302,22 @@ class NodeBase(abc.ABC):
                 iface.options.update(options)
             self.ifaces[iface_id] = iface
         if self.up:
-            iface.startup()
-            self.adopt_iface(iface, name)
+            self.start_iface(iface, name)
         else:
             iface.name = name
         return iface
 
+    def start_iface(self, iface: CoreInterface, name: str) -> None:
+        """
+        Start a newly created interface and adopt it with its proper name.
+
+        :param iface: interface to start
+        :param name: proper name to use for interface
+        :return: nothing
+        """
+        iface.startup()
+        self.adopt_iface(iface, name)
+
     def delete_iface(self, iface_id: int) -> CoreInterface:
         """
         Delete an interface.
@@ -517,6 +528,21 @@ class CoreNodeBase(NodeBase):
         for service in self.services.values():
             service.stop()
 
+    def update_services(self, changes: set["TopologyDep"]) -> list[str]:
+        """
+        Update service files affected by runtime topology changes, reloading
+        services whose files were updated.
+
+        :param changes: topology changes affecting this node
+        :return: names of services that were updated
+        :raises CoreError: when a service fails to reload
+        """
+        updated = []
+        for service in self.services.values():
+            if service.update_files(changes):
+                updated.append(service.name)
+        return updated
+
     def makenodedir(self) -> None:
         """
         Create the node directory.
@@ -709,6 +735,7 @@ class CoreNode(CoreNodeBase):
             args = f"{BASH} -c {shlex.quote(args)}"
         return f"{VCMD} -c {self.ctrlchnlname} -- {args}"
 
+    @metrics.timed("node_cmd", lambda node, args, *_, **__: command_name(args))
     def cmd(self, args: str, wait: bool = True, shell: bool = False) -> str:
         """
         Runs a command that is used to configure and setup the network within a
@@ -726,6 +753,25 @@ class CoreNode(CoreNodeBase):
         else:
             return self.server.remote_cmd(args, wait=wait)
 
+    def cmd_stream(self, args: str, shell: bool = False) -> utils.CommandStream:
+        """
+        Start a command within the context of a node, allowing its output to be
+        read as it is produced.
+
+        :param args: command to run
+        :param shell: True to use shell, False otherwise
+        :return: running command
+        :raises CoreError: when node is on a distributed server
+        :raises CoreCommandError: when the command fails to start
+        """
+        if self.server is not None:
+            raise CoreError(
+                f"node({self.name}) command streaming is not supported on "
+                f"distributed servers"
+            )
+        args = self.create_cmd(args, shell)
+        return utils.CommandStream(args, shell=shell)
+
     def create_net_cmd(self, args: str, shell: bool = False) -> str:
         """
         Create command used to run network commands within the context of a node.
@@ -886,6 +932,34 @@ class CoreNode(CoreNodeBase):
         if mode is not None:
             self.host_cmd(f"chmod {mode:o} {host_path}")
 
+    def start_iface(self, iface: CoreInterface, name: str) -> None:
+        """
+        Start a newly created interface, creating it directly within the network
+        namespace of the node, then configuring it as a single batch.
+
+        :param iface: interface to start
+        :param name: proper name for interface
+        :return: nothing
+        """
+        iface_id = self.get_iface_id(iface)
+        if iface_id == -1:
+            raise CoreError(f"starting unknown iface({iface.name})")
+        # use default iface name for container, if a unique name was not provided
+        if iface.name == name:
+            name = f"eth{iface_id}"
+        iface.startup_ns(str(self.pid), name)
+        # configure iface options, before being set up
+        iface.set_config()
+        addresses = []
+        for ip in iface.ips():
+            broadcast = "+" if netaddr.valid_ipv4(str(ip.ip)) else None
+            addresses.append((str(ip), broadcast))
+        checksums_off = self.session.options.get_int("checksums", 0) == 0
+        iface.flow_id = self.node_net_client.setup_iface(
+            iface.name, addresses, checksums_off
+        )
+        logger.debug("interface flow index: %s - %s", iface.name, iface.flow_id)
+
     def adopt_iface(self, iface: CoreInterface, name: str) -> None:
         """
         Adopt interface to the network namespace of the node and setting
@@ -4,6 +4,7 @@ virtual ethernet classes that implement the interfaces available under Linux.
 
 import logging
 import math
+import threading
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Optional
 
@@ -129,6 +130,8 @@ class CoreInterface:
         # configuration data
         self.has_netem: bool = False
         self.options: LinkOptions = LinkOptions()
+        # nodes and networks sharing an interface may shut it down concurrently
+        self.shutdown_lock: threading.Lock = threading.Lock()
 
     def host_cmd(
         self,
@@ -168,20 +171,37 @@ class CoreInterface:
         self.net_client.device_up(self.localname)
         self.up = True
 
+    def startup_ns(self, namespace: str, name: str) -> None:
+        """
+        Startup method for the interface, creating the peer directly within a
+        network namespace using its final name.
+
+        :param namespace: namespace to create interface within
+        :param name: name for interface within namespace
+        :return: nothing
+        """
+        mtu = self.mtu if self.mtu > 0 else None
+        mac = str(self.mac) if self.mac else None
+        self.net_client.create_veth_ns(self.localname, name, namespace, mtu, mac)
+        self.net_client.device_up(self.localname)
+        self.name = name
+        self.up = True
+
     def shutdown(self) -> None:
         """
         Shutdown method for the interface.
 
         :return: nothing
         """
-        if not self.up:
-            return
+        with self.shutdown_lock:
+            if not self.up:
+                return
+            self.up = False
         if self.localname:
             try:
                 self.net_client.delete_device(self.localname)
             except CoreCommandError:
                 pass
-        self.up = False
 
     def add_ip(self, ip: str) -> None:
         """
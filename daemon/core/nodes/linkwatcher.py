@@ -0,0 +1,356 @@
+"""
+Watches for network devices appearing within node network namespaces, using
+rtnetlink link notifications, allowing devices to be waited on without polling.
+"""
+
+import ctypes
+import errno
+import logging
+import os
+import selectors
+import socket
+import struct
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+CLONE_NEWNET: int = 0x40000000
+NETLINK_ROUTE: int = 0
+RTMGRP_LINK: int = 0x1
+NLMSG_ERROR: int = 2
+NLMSG_DONE: int = 3
+RTM_NEWLINK: int = 16
+RTM_GETLINK: int = 18
+NLM_F_REQUEST: int = 0x1
+NLM_F_DUMP: int = 0x300
+IFLA_IFNAME: int = 3
+NLMSG_HEADER: struct.Struct = struct.Struct("=IHHII")
+IFINFO_HEADER: struct.Struct = struct.Struct("=BxHiII")
+RTA_HEADER: struct.Struct = struct.Struct("=HH")
+RECV_SIZE: int = 65536
+
+
+def align(length: int) -> int:
+    """
+    Align a netlink length to 4 bytes.
+
+    :param length: length to align
+    :return: aligned length
+    """
+    return (length + 3) & ~3
+
+
+def create_dump_request(seq: int) -> bytes:
+    """
+    Create a netlink request to dump all links.
+
+    :param seq: sequence number for request
+    :return: request data
+    """
+    length = NLMSG_HEADER.size + IFINFO_HEADER.size
+    header = NLMSG_HEADER.pack(length, RTM_GETLINK, NLM_F_REQUEST | NLM_F_DUMP, seq, 0)
+    return header + IFINFO_HEADER.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+
+
+def parse_messages(data: bytes) -> tuple[list[str], list[int]]:
+    """
+    Parse netlink messages for the names of new links and the sequence numbers
+    of completed requests.
+
+    :param data: netlink data to parse
+    :return: link names and completed sequence numbers
+    """
+    names = []
+    completed = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, _, seq, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            break
+        end = offset + length
+        if msg_type in (NLMSG_DONE, NLMSG_ERROR):
+            completed.append(seq)
+        elif msg_type == RTM_NEWLINK:
+            attr_offset = offset + NLMSG_HEADER.size + IFINFO_HEADER.size
+            while attr_offset + RTA_HEADER.size <= end:
+                attr_length, attr_type = RTA_HEADER.unpack_from(data, attr_offset)
+                if attr_length < RTA_HEADER.size:
+                    break
+                if attr_type == IFLA_IFNAME:
+                    value = data[
+                        attr_offset + RTA_HEADER.size : attr_offset + attr_length
+                    ]
+                    names.append(value.split(b"\0", 1)[0].decode())
+                    break
+                attr_offset += align(attr_length)
+        offset += align(length)
+    return names, completed
+
+
+def setns(fd: int) -> None:
+    """
+    Move the calling thread into the network namespace referred to by a file
+    descriptor.
+
+    :param fd: namespace file descriptor
+    :return: nothing
+    :raises OSError: when unable to set namespace
+    """
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.setns(fd, CLONE_NEWNET) != 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error))
+
+
+def open_socket(pid: int | None) -> socket.socket:
+    """
+    Open a netlink socket subscribed to link notifications, within the network
+    namespace of the provided process.
+
+    :param pid: process within namespace to watch, None for the current namespace
+    :return: netlink socket
+    :raises OSError: when unable to open socket within namespace
+    """
+    if pid is None:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK))
+        return sock
+    current_fd = os.open("/proc/thread-self/ns/net", os.O_RDONLY)
+    try:
+        target_fd = os.open(f"/proc/{pid}/ns/net", os.O_RDONLY)
+        try:
+            setns(target_fd)
+            try:
+                sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+                sock.bind((0, RTMGRP_LINK))
+            finally:
+                setns(current_fd)
+        finally:
+            os.close(target_fd)
+    finally:
+        os.close(current_fd)
+    return sock
+
+
+class NamespaceWatch:
+    """
+    Netlink socket watching a namespace, with the devices currently waited on.
+    """
+
+    def __init__(self, pid: int | None, sock: socket.socket) -> None:
+        """
+        Create a NamespaceWatch instance.
+
+        :param pid: process within namespace being watched
+        :param sock: netlink socket within namespace
+        """
+        self.pid: int | None = pid
+        self.sock: socket.socket = sock
+        self.futures: dict[str, list[Future]] = {}
+        self.seq: int = 0
+        self.dumping: bool = False
+        self.redump: bool = False
+
+    def dump(self) -> None:
+        """
+        Request all current links, which will resolve devices already present.
+        Only one dump can be active on a socket, so requests made during a dump
+        are deferred until it completes.
+
+        :return: nothing
+        """
+        if self.dumping:
+            self.redump = True
+            return
+        self.seq += 1
+        self.dumping = True
+        self.redump = False
+        self.sock.send(create_dump_request(self.seq))
+
+
+class LinkWatcher:
+    """
+    Single watcher thread across node network namespaces, resolving a future
+    for each expected device name once it appears.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a LinkWatcher instance.
+        """
+        self.lock: threading.Lock = threading.Lock()
+        self.watches: dict[int | None, NamespaceWatch] = {}
+        self.selector: selectors.DefaultSelector = selectors.DefaultSelector()
+        self.wake_reader, self.wake_writer = socket.socketpair()
+        self.selector.register(self.wake_reader, selectors.EVENT_READ)
+        self.running: bool = False
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Start watcher thread, when not already running.
+
+        :return: nothing
+        """
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop watcher thread, failing any pending waits.
+
+        :return: nothing
+        """
+        with self.lock:
+            if not self.running:
+                return
+            self.running = False
+            for watch in list(self.watches.values()):
+                for futures in watch.futures.values():
+                    for future in futures:
+                        future.set_result(False)
+                watch.futures.clear()
+                self.release(watch)
+            self.wake_writer.send(b"\0")
+        self.thread.join()
+        self.thread = None
+
+    def watch(self, pid: int | None, name: str) -> Future:
+        """
+        Watch for a device to appear within a namespace.
+
+        :param pid: process within namespace to watch, None for current namespace
+        :param name: name of device to watch for
+        :return: future resolved once device exists
+        :raises OSError: when unable to watch namespace
+        """
+        self.start()
+        future = Future()
+        with self.lock:
+            watch = self.watches.get(pid)
+            if watch is None:
+                watch = NamespaceWatch(pid, open_socket(pid))
+                self.watches[pid] = watch
+                self.selector.register(watch.sock, selectors.EVENT_READ, watch)
+            watch.futures.setdefault(name, []).append(future)
+            watch.dump()
+        return future
+
+    def wait(self, pid: int | None, name: str, timeout: float) -> bool:
+        """
+        Wait for a device to appear within a namespace.
+
+        :param pid: process within namespace to watch, None for current namespace
+        :param name: name of device to wait for
+        :param timeout: maximum time to wait in seconds
+        :return: True if device exists, False if timed out
+        :raises OSError: when unable to watch namespace
+        """
+        future = self.watch(pid, name)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self.discard(pid, name, future)
+            return False
+
+    def discard(self, pid: int | None, name: str, future: Future) -> None:
+        """
+        Stop waiting on a future for a device.
+
+        :param pid: process within namespace being watched
+        :param name: name of device being waited on
+        :param future: future to discard
+        :return: nothing
+        """
+        with self.lock:
+            watch = self.watches.get(pid)
+            if not watch:
+                return
+            futures = watch.futures.get(name, [])
+            if future in futures:
+                futures.remove(future)
+            if not futures:
+                watch.futures.pop(name, None)
+            if not watch.futures:
+                self.release(watch)
+
+    def release(self, watch: NamespaceWatch) -> None:
+        """
+        Close a namespace watch, expected to be called while holding the lock.
+
+        :param watch: watch to close
+        :return: nothing
+        """
+        self.watches.pop(watch.pid, None)
+        self.selector.unregister(watch.sock)
+        watch.sock.close()
+
+    def handle_data(self, watch: NamespaceWatch, data: bytes) -> None:
+        """
+        Handle netlink data received for a namespace, resolving futures for
+        devices that now exist.
+
+        :param watch: watch data was received for
+        :param data: netlink data
+        :return: nothing
+        """
+        names, completed = parse_messages(data)
+        with self.lock:
+            if self.watches.get(watch.pid) is not watch:
+                return
+            for name in names:
+                for future in watch.futures.pop(name, []):
+                    future.set_result(True)
+            if watch.seq in completed and watch.dumping:
+                watch.dumping = False
+                if watch.redump and watch.futures:
+                    watch.dump()
+            if not watch.futures:
+                self.release(watch)
+
+    def resync(self, watch: NamespaceWatch) -> None:
+        """
+        Request all current links again, after notifications have been lost due
+        to the socket receive buffer overflowing.
+
+        :param watch: watch to resync
+        :return: nothing
+        """
+        with self.lock:
+            if self.watches.get(watch.pid) is watch:
+                watch.dumping = False
+                watch.dump()
+
+    def run(self) -> None:
+        """
+        Watcher thread loop, receiving netlink data across all namespaces.
+
+        :return: nothing
+        """
+        while True:
+            for key, _ in self.selector.select():
+                if key.fileobj is self.wake_reader:
+                    self.wake_reader.recv(RECV_SIZE)
+                    continue
+                watch = key.data
+                try:
+                    data = watch.sock.recv(RECV_SIZE)
+                except OSError as e:
+                    if e.errno == errno.ENOBUFS:
+                        self.resync(watch)
+                    else:
+                        logger.debug("error reading link notifications: %s", e)
+                    continue
+                try:
+                    self.handle_data(watch, data)
+                except Exception:
+                    logger.exception("error handling link notifications")
+            with self.lock:
+                if not self.running:
+                    return
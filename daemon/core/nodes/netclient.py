@@ -5,10 +5,11 @@ from typing import Callable
 
 import netaddr
 
-from core import utils
+from core import metrics, utils
 from core.executables import ETHTOOL, IP, OVS_VSCTL, SYSCTL, TC
 
 
+@metrics.instrument("netclient")
 class LinuxNetClient:
     """
     Client for creating Linux bridges and ip interfaces for nodes.
@@ -183,6 +184,62 @@ class LinuxNetClient:
         """
         self.run(f"{IP} link add name {name} type veth peer name {peer}")
 
+    def create_veth_ns(
+        self, name: str, peer: str, namespace: str, mtu: int = None, mac: str = None
+    ) -> None:
+        """
+        Create a veth pair, with the peer created directly within a network
+        namespace.
+
+        :param name: veth name
+        :param peer: peer name within namespace
+        :param namespace: namespace to create peer within
+        :param mtu: mtu to set for both devices, None to use default
+        :param mac: mac address to set for peer, None to use random address
+        :return: nothing
+        """
+        mtu = f" mtu {mtu}" if mtu else ""
+        mac = f" address {mac}" if mac else ""
+        self.run(
+            f"{IP} link add name {name}{mtu} type veth "
+            f"peer name {peer} netns {namespace}{mtu}{mac}"
+        )
+
+    def setup_iface(
+        self,
+        device: str,
+        addresses: list[tuple[str, str | None]],
+        checksums_off: bool,
+    ) -> int:
+        """
+        Configure a device as a single batch of commands, adding addresses,
+        optionally turning checksums off and bringing it up.
+
+        :param device: device to configure
+        :param addresses: addresses with broadcast address to add, when not None
+        :param checksums_off: True to turn checksums off, False otherwise
+        :return: device ifindex
+        """
+        cmds = [f"{IP} -o link show {device}"]
+        if checksums_off:
+            cmds.append(f"{ETHTOOL} -K {device} rx off tx off")
+        for address, broadcast in addresses:
+            if broadcast is not None:
+                cmds.append(
+                    f"{IP} address add {address} broadcast {broadcast} dev {device}"
+                )
+            else:
+                cmds.append(f"{IP} address add {address} dev {device}")
+            if netaddr.valid_ipv6(address.split("/")[0]):
+                # keep IPv6 addresses on interface down
+                sysctl_device = utils.sysctl_devname(device)
+                cmds.append(
+                    f"{SYSCTL} -w net.ipv6.conf.{sysctl_device}.keep_addr_on_down=1"
+                )
+        cmds.append(f"{IP} link set {device} up")
+        output = self.run(" && ".join(cmds), shell=True)
+        return int(output.split()[0].strip(":"))
+
     def create_gretap(
         self, device: str, address: str, local: str, ttl: int, key: int
     ) -> None:
@@ -292,6 +349,7 @@ class LinuxNetClient:
         self.run(f"{IP} link set {name} mtu {value}")
 
 
+@metrics.instrument("netclient")
 class OvsNetClient(LinuxNetClient):
     """
     Client for creating OVS bridges and ip interfaces for nodes.
@@ -10,7 +10,7 @@ from typing import TYPE_CHECKING
 
 import netaddr
 
-from core import utils
+from core import metrics, utils
 from core.emulator.data import InterfaceData, LinkData
 from core.emulator.enumerations import MessageFlags, NetworkPolicy, RegisterTlvs
 from core.errors import CoreCommandError, CoreError
@@ -34,12 +34,16 @@ class NftablesQueue:
     Helper class for queuing up nftables commands into rate-limited
     atomic commits. This improves performance and reliability when there are
     many WLAN link updates.
+
+    Filtering between interfaces is expressed as a verdict map keyed on input and
+    output interface names, so link changes only add or delete map elements.
     """
 
     # update rate is every 300ms
     rate: float = 0.3
     atomic_file: str = "/tmp/pycore.nftables.atomic"
     chain: str = "forward"
+    map: str = "links"
 
     def __init__(self) -> None:
         """
@@ -95,6 +99,7 @@ class NftablesQueue:
             self.build_cmds(net)
             self.commit(net)
 
+    @metrics.timed("nftables_commit", lambda self, net: net.name)
     def commit(self, net: "CoreNetwork") -> None:
         """
         Commit changes to nftables for the provided network.
@@ -105,8 +110,10 @@ class NftablesQueue:
         if not self.cmds:
             return
         # write out nft commands to file
-        for cmd in self.cmds:
-            net.host_cmd(f"echo {cmd} >> {self.atomic_file}", shell=True)
+        data = "\n".join(self.cmds) + "\n"
+        atomic_path = Path(self.atomic_file)
+        atomic_path.write_text(data)
+        net.session.distributed.execute(lambda x: x.remote_put_temp(atomic_path, data))
         # read file as atomic change
         net.host_cmd(f"{NFTABLES} -f {self.atomic_file}")
         # remove file
@@ -115,7 +122,7 @@ class NftablesQueue:
 
     def update(self, net: "CoreNetwork") -> None:
         """
-        Flag this network has an update, so the nftables chain will be rebuilt.
+        Flag this network has an update, so nftables will be updated.
 
         :param net: wlan network
         :return: nothing
@@ -134,46 +141,123 @@ class NftablesQueue:
 
     def build_cmds(self, net: "CoreNetwork") -> None:
         """
-        Inspect linked nodes for a network, and rebuild the nftables chain commands.
+        Inspect linked nodes for a network, and build the nftables commands
+        needed to bring its verdict map up to date. Only pairs of interfaces
+        changed since the last update are inspected, unless the table is being
+        created or a full resync was requested.
 
         :param net: network to build commands for
         :return: nothing
         """
         with net.linked_lock:
-            if net.has_nftables_chain:
-                self.cmds.append(f"flush table bridge {net.brname}")
-            else:
+            if not net.has_nftables_chain:
                 net.has_nftables_chain = True
-                policy = net.policy.value.lower()
-                self.cmds.append(f"add table bridge {net.brname}")
-                self.cmds.append(
-                    f"add chain bridge {net.brname} {self.chain} {{type filter hook "
-                    f"forward priority -1\\; policy {policy}\\;}}"
-                )
-            # add default rule to accept all traffic not for this bridge
+                net.nftables_elements.clear()
+                self.create_table(net)
+                pairs = [(x, y) for x, v in net.linked.items() for y in v]
+            elif net.nftables_resync:
+                pairs = [(x, y) for x, v in net.linked.items() for y in v]
+            else:
+                pairs = list(net.nftables_changes)
+            # elements not determined below are removed when resyncing
+            verdicts = {}
+            if net.nftables_resync:
+                verdicts = {x: None for x in net.nftables_elements}
+            for iface1, iface2 in pairs:
+                verdict = self.get_verdict(net, iface1, iface2)
+                verdicts[(iface1.localname, iface2.localname)] = verdict
+                verdicts[(iface2.localname, iface1.localname)] = verdict
+            net.nftables_changes.clear()
+            net.nftables_resync = False
+        self.update_elements(net, verdicts)
+
+    def create_table(self, net: "CoreNetwork") -> None:
+        """
+        Build commands creating the table, chain, verdict map and rules for a
+        network.
+
+        :param net: network to create table for
+        :return: nothing
+        """
+        policy = net.policy.value.lower()
+        self.cmds.append(f"add table bridge {net.brname}")
+        self.cmds.append(f"flush table bridge {net.brname}")
+        self.cmds.append(
+            f"add chain bridge {net.brname} {self.chain} {{type filter hook "
+            f"forward priority -1; policy {policy};}}"
+        )
+        self.cmds.append(
+            f"add map bridge {net.brname} {self.map} "
+            f"{{type ifname . ifname : verdict;}}"
+        )
+        # add default rule to accept all traffic not for this bridge
+        self.cmds.append(
+            f"add rule bridge {net.brname} {self.chain} "
+            f"ibriport != {net.brname} accept"
+        )
+        self.cmds.append(
+            f"add rule bridge {net.brname} {self.chain} "
+            f"iifname . oifname vmap @{self.map}"
+        )
+
+    def get_verdict(
+        self, net: "CoreNetwork", iface1: CoreInterface, iface2: CoreInterface
+    ) -> str | None:
+        """
+        Determine the verdict needed for traffic between two interfaces, when it
+        differs from the network policy.
+
+        :param net: network interfaces are attached to
+        :param iface1: interface one
+        :param iface2: interface two
+        :return: verdict, None when the network policy applies
+        """
+        if iface1 not in net.linked or iface2 not in net.linked:
+            return None
+        linked = net.linked[iface1].get(iface2)
+        if linked is None:
+            return None
+        if net.policy == NetworkPolicy.DROP and linked:
+            return "accept"
+        elif net.policy == NetworkPolicy.ACCEPT and not linked:
+            return "drop"
+        return None
+
+    def update_elements(
+        self, net: "CoreNetwork", verdicts: dict[tuple[str, str], str | None]
+    ) -> None:
+        """
+        Build commands updating verdict map elements that differ from the
+        provided verdicts.
+
+        :param net: network to update verdict map for
+        :param verdicts: interface name pairs mapped to their verdict, None to
+            remove any element for the pair
+        :return: nothing
+        """
+        deletes = []
+        adds = []
+        for key, verdict in verdicts.items():
+            current = net.nftables_elements.get(key)
+            if current == verdict:
+                continue
+            name1, name2 = key
+            if current:
+                deletes.append(f'"{name1}" . "{name2}"')
+                del net.nftables_elements[key]
+            if verdict:
+                adds.append(f'"{name1}" . "{name2}" : {verdict}')
+                net.nftables_elements[key] = verdict
+        if deletes:
+            self.cmds.append(
+                f"delete element bridge {net.brname} {self.map} "
+                f"{{ {', '.join(deletes)} }}"
+            )
+        if adds:
             self.cmds.append(
-                f"add rule bridge {net.brname} {self.chain} "
-                f"ibriport != {net.brname} accept"
+                f"add element bridge {net.brname} {self.map} "
+                f"{{ {', '.join(adds)} }}"
             )
-            # rebuild the chain
-            for iface1, v in net.linked.items():
-                for iface2, linked in v.items():
-                    policy = None
-                    if net.policy == NetworkPolicy.DROP and linked:
-                        policy = "accept"
-                    elif net.policy == NetworkPolicy.ACCEPT and not linked:
-                        policy = "drop"
-                    if policy:
-                        self.cmds.append(
-                            f"add rule bridge {net.brname} {self.chain} "
-                            f"iif {iface1.localname} oif {iface2.localname} "
-                            f"{policy}"
-                        )
-                        self.cmds.append(
-                            f"add rule bridge {net.brname} {self.chain} "
-                            f"oif {iface1.localname} iif {iface2.localname} "
-                            f"{policy}"
-                        )
 
 
 # a global object because all networks share the same queue
@@ -218,6 +302,12 @@ class CoreNetwork(CoreNetworkBase):
         session_id = self.session.short_session_id()
         self.brname: str = f"b.{self.id}.{session_id}"
         self.has_nftables_chain: bool = False
+        # interface pairs changed since the last nftables update
+        self.nftables_changes: set[tuple[CoreInterface, CoreInterface]] = set()
+        # inspect all interface pairs on the next nftables update
+        self.nftables_resync: bool = False
+        # verdict map elements currently applied
+        self.nftables_elements: dict[tuple[str, str], str] = {}
 
     @classmethod
     def create_options(cls) -> NetworkOptions:
@@ -259,6 +349,7 @@ class CoreNetwork(CoreNetworkBase):
         if self.mtu > 0:
             self.net_client.set_mtu(self.brname, self.mtu)
         self.has_nftables_chain = False
+        self.nftables_changes.clear()
         self.up = True
         nft_queue.start()
 
@@ -316,6 +407,11 @@ class CoreNetwork(CoreNetworkBase):
         super().detach(iface)
         if self.up:
             iface.net_client.delete_iface(self.brname, iface.localname)
+        if self.has_nftables_chain:
+            # remove map elements for detached interface
+            with self.linked_lock:
+                self.nftables_resync = True
+            nft_queue.update(self)
 
     def is_linked(self, iface1: CoreInterface, iface2: CoreInterface) -> bool:
         """
@@ -354,6 +450,7 @@ class CoreNetwork(CoreNetworkBase):
             if not self.is_linked(iface1, iface2):
                 return
             self.linked[iface1][iface2] = False
+            self.nftables_changes.add((iface1, iface2))
         nft_queue.update(self)
 
     def link(self, iface1: CoreInterface, iface2: CoreInterface) -> None:
@@ -369,6 +466,7 @@ class CoreNetwork(CoreNetworkBase):
             if self.is_linked(iface1, iface2):
                 return
             self.linked[iface1][iface2] = True
+            self.nftables_changes.add((iface1, iface2))
         nft_queue.update(self)
 
 
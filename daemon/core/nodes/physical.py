@@ -257,6 +257,10 @@ class PhysicalNode(CoreNode):
             args = f'{BASH} -c "{args}"'
         return args
 
+    def start_iface(self, iface: CoreInterface, name: str) -> None:
+        iface.startup()
+        self.adopt_iface(iface, name)
+
     def adopt_iface(self, iface: CoreInterface, name: str) -> None:
         # validate iface belongs to node and get id
         iface_id = self.get_iface_id(iface)
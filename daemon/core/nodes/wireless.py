@@ -62,6 +62,8 @@ class WirelessLink:
     iface: CoreInterface
     linked: bool
     label: str = None
+    options1: LinkOptions = None
+    options2: LinkOptions = None
 
 
 class WirelessNode(CoreNetworkBase):
@@ -121,6 +123,8 @@ class WirelessNode(CoreNetworkBase):
         self.loss_initial: float = CONFIG_LOSS
         self.loss_range: float = CONFIG_LOSS_RANGE
         self.loss_factor: float = CONFIG_LOSS_FACTOR
+        # empty options shared by link messages
+        self.link_options: LinkOptions = LinkOptions()
 
     def startup(self) -> None:
         if self.up:
@@ -249,6 +253,7 @@ class WirelessNode(CoreNetworkBase):
         iface.has_netem = has_netem
         iface.update_options(options2)
         iface.name, iface.localname = name, localname
+        link.options1, link.options2 = options1, options2
         if options1 == options2:
             link.label = f"{options1.loss:.2f}%/{options1.delay}us"
         else:
@@ -281,6 +286,7 @@ class WirelessNode(CoreNetworkBase):
             node1_id=node1_id,
             node2_id=node2_id,
             network_id=self.id,
+            options=self.link_options,
             color=color,
             label=label,
         )
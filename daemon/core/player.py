@@ -1,11 +1,17 @@
 import ast
+import bisect
 import csv
 import enum
+import io
+import json
 import logging
-import sched
+import struct
+import time
+from array import array
 from pathlib import Path
-from threading import Thread
-from typing import IO, Callable, Optional
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import IO, Any, Callable, Optional
 
 import grpc
 
@@ -14,6 +20,12 @@ from core.api.grpc.wrappers import LinkOptions
 
 logger = logging.getLogger(__name__)
 
+TIMELINE_SUFFIX: str = ".timeline"
+TIMELINE_MAGIC: bytes = b"CORETL01"
+# magic, source size, source mtime, events, values, strings length
+TIMELINE_HEADER: struct.Struct = struct.Struct("<8sqqIII")
+MAX_QUEUED_WRITES: int = 1000
+
 
 @enum.unique
 class PlayerEvents(enum.Enum):
@@ -44,6 +56,226 @@ class PlayerEvents(enum.Enum):
         return event
 
 
+def parse_bool(value: str) -> bool:
+    return value.strip() in ("True", "1", "true")
+
+
+def parse_str(value: str) -> str:
+    return ast.literal_eval(value)
+
+
+# argument types for each event, used to store arguments as typed columns
+EVENT_ARGS: dict[PlayerEvents, tuple[Callable[[str], Any], ...]] = {
+    PlayerEvents.XY: (int, float, float),
+    PlayerEvents.GEO: (int, float, float, float),
+    PlayerEvents.CMD: (int, parse_bool, parse_bool, parse_str),
+    PlayerEvents.WLINK: (int, int, int, parse_bool),
+    PlayerEvents.WILINK: (int, int, int, parse_bool),
+    PlayerEvents.WICONFIG: (int, int, int, float, float, float, float),
+}
+# events reflecting state, where the latest value is applied when seeking
+STATE_EVENTS: set[PlayerEvents] = {
+    PlayerEvents.XY,
+    PlayerEvents.GEO,
+    PlayerEvents.WLINK,
+    PlayerEvents.WILINK,
+    PlayerEvents.WICONFIG,
+}
+
+
+class PlayerTimeline:
+    """
+    Compiled form of a core player file, storing events sorted by time in typed
+    columns. Arguments are stored as doubles, with strings stored separately and
+    referenced by index.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create an empty PlayerTimeline instance.
+        """
+        self.times: array = array("d")
+        self.events: array = array("B")
+        self.arg_starts: array = array("I")
+        self.values: array = array("d")
+        self.strings: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def compile(cls, file_path: Path) -> "PlayerTimeline":
+        """
+        Compile a core player csv file into a timeline.
+
+        :param file_path: core player file to compile
+        :return: compiled timeline
+        """
+        rows = []
+        with file_path.open("r", newline="") as f:
+            for row in csv.reader(f):
+                if not row:
+                    continue
+                event = PlayerEvents.get(row[1])
+                if not event:
+                    logger.error("unknown event type: %s", ",".join(row))
+                    continue
+                try:
+                    args = cls.parse_args(event, row[2:])
+                except (ValueError, SyntaxError):
+                    logger.error("invalid event args: %s", ",".join(row))
+                    continue
+                rows.append((float(row[0]), event, args))
+        # stable sort keeps file order for events at the same time
+        rows.sort(key=lambda x: x[0])
+        timeline = cls()
+        for event_time, event, args in rows:
+            timeline.add(event_time, event, args)
+        return timeline
+
+    @staticmethod
+    def parse_args(event: PlayerEvents, values: list[str]) -> tuple:
+        """
+        Parse the arguments of an event using its argument types.
+
+        :param event: event arguments are for
+        :param values: argument values to parse
+        :return: parsed arguments
+        """
+        arg_types = EVENT_ARGS[event]
+        if len(values) != len(arg_types):
+            raise ValueError(f"invalid number of args for event {event.name}")
+        return tuple(x(y) for x, y in zip(arg_types, values))
+
+    def add(self, event_time: float, event: PlayerEvents, args: tuple) -> None:
+        """
+        Add an event to the end of the timeline.
+
+        :param event_time: time of event
+        :param event: event type
+        :param args: event arguments
+        :return: nothing
+        """
+        self.times.append(event_time)
+        self.events.append(event.value)
+        self.arg_starts.append(len(self.values))
+        for arg_type, arg in zip(EVENT_ARGS[event], args):
+            if arg_type is parse_str:
+                self.values.append(len(self.strings))
+                self.strings.append(arg)
+            else:
+                self.values.append(arg)
+
+    def get(self, index: int) -> tuple[float, PlayerEvents, tuple]:
+        """
+        Retrieve an event from the timeline.
+
+        :param index: index of event
+        :return: event time, type and arguments
+        """
+        event = PlayerEvents(self.events[index])
+        start = self.arg_starts[index]
+        args = []
+        for offset, arg_type in enumerate(EVENT_ARGS[event]):
+            value = self.values[start + offset]
+            if arg_type is parse_str:
+                args.append(self.strings[int(value)])
+            elif arg_type is parse_bool:
+                args.append(bool(value))
+            elif arg_type is int:
+                args.append(int(value))
+            else:
+                args.append(value)
+        return self.times[index], event, tuple(args)
+
+    def find(self, event_time: float) -> int:
+        """
+        Find the index of the first event at or after the provided time.
+
+        :param event_time: time to find
+        :return: index of event, length of timeline when there are none
+        """
+        return bisect.bisect_left(self.times, event_time)
+
+    def save(self, path: Path, source: Path) -> None:
+        """
+        Write the timeline to a binary file.
+
+        :param path: path to write timeline to
+        :param source: core player file timeline was compiled from
+        :return: nothing
+        """
+        stat = source.stat()
+        strings = json.dumps(self.strings).encode()
+        header = TIMELINE_HEADER.pack(
+            TIMELINE_MAGIC,
+            stat.st_size,
+            stat.st_mtime_ns,
+            len(self.times),
+            len(self.values),
+            len(strings),
+        )
+        with path.open("wb") as f:
+            f.write(header)
+            self.times.tofile(f)
+            self.events.tofile(f)
+            self.arg_starts.tofile(f)
+            self.values.tofile(f)
+            f.write(strings)
+
+    @classmethod
+    def load(cls, path: Path, source: Path) -> Optional["PlayerTimeline"]:
+        """
+        Read a timeline from a binary file, when it is up to date with the core
+        player file it was compiled from.
+
+        :param path: path to read timeline from
+        :param source: core player file timeline was compiled from
+        :return: loaded timeline, None when missing or out of date
+        """
+        if not path.is_file():
+            return None
+        stat = source.stat()
+        timeline = cls()
+        with path.open("rb") as f:
+            data = f.read(TIMELINE_HEADER.size)
+            if len(data) != TIMELINE_HEADER.size:
+                return None
+            magic, size, mtime, count, values, strings = TIMELINE_HEADER.unpack(data)
+            if (magic, size, mtime) != (TIMELINE_MAGIC, stat.st_size, stat.st_mtime_ns):
+                return None
+            try:
+                timeline.times.fromfile(f, count)
+                timeline.events.fromfile(f, count)
+                timeline.arg_starts.fromfile(f, count)
+                timeline.values.fromfile(f, values)
+            except EOFError:
+                return None
+            timeline.strings = json.loads(f.read(strings))
+        return timeline
+
+    @classmethod
+    def from_file(cls, file_path: Path) -> "PlayerTimeline":
+        """
+        Retrieve the timeline for a core player file, using a previously compiled
+        timeline stored alongside it when up to date.
+
+        :param file_path: core player file
+        :return: timeline for file
+        """
+        path = file_path.with_name(file_path.name + TIMELINE_SUFFIX)
+        timeline = cls.load(path, file_path)
+        if timeline is not None:
+            logger.info("loaded compiled timeline: %s", path)
+            return timeline
+        timeline = cls.compile(file_path)
+        try:
+            timeline.save(path, file_path)
+        except OSError as e:
+            logger.warning("unable to save compiled timeline(%s): %s", path, e)
+        return timeline
+
+
 class CorePlayerWriter:
     """
     Provides conveniences for programatically creating a core file for playback.
@@ -79,6 +311,15 @@ class CorePlayerWriter:
         if self._file:
             self._file.close()
 
+    def flush(self) -> None:
+        """
+        Flush buffered writes.
+
+        :return: nothing
+        """
+        if self._file:
+            self._file.flush()
+
     def update(self, delay: float) -> None:
         """
         Update and move the current play time forward by delay amount.
@@ -88,6 +329,24 @@ class CorePlayerWriter:
         """
         self._time += delay
 
+    def set_time(self, value: float) -> None:
+        """
+        Set the current play time.
+
+        :param value: play time to set
+        :return: nothing
+        """
+        self._time = value
+
+    def write_row(self, row: list[Any]) -> None:
+        """
+        Write an event row.
+
+        :param row: row values to write
+        :return: nothing
+        """
+        self._csv_file.writerow(row)
+
     def write_xy(self, node_id: int, x: float, y: float) -> None:
         """
         Write a node xy movement event.
@@ -97,7 +356,7 @@ class CorePlayerWriter:
         :param y: y position
         :return: nothing
         """
-        self._csv_file.writerow([self._time, PlayerEvents.XY.name, node_id, x, y])
+        self.write_row([self._time, PlayerEvents.XY.name, node_id, x, y])
 
     def write_geo(self, node_id: int, lon: float, lat: float, alt: float) -> None:
         """
@@ -109,9 +368,7 @@ class CorePlayerWriter:
         :param alt: altitude position
         :return: nothing
         """
-        self._csv_file.writerow(
-            [self._time, PlayerEvents.GEO.name, node_id, lon, lat, alt]
-        )
+        self.write_row([self._time, PlayerEvents.GEO.name, node_id, lon, lat, alt])
 
     def write_cmd(self, node_id: int, wait: bool, shell: bool, cmd: str) -> None:
         """
@@ -123,7 +380,7 @@ class CorePlayerWriter:
         :param cmd: command to run
         :return: nothing
         """
-        self._csv_file.writerow(
+        self.write_row(
             [self._time, PlayerEvents.CMD.name, node_id, wait, shell, f"'{cmd}'"]
         )
 
@@ -139,7 +396,7 @@ class CorePlayerWriter:
         :param linked: True if nodes are linked, False otherwise
         :return: nothing
         """
-        self._csv_file.writerow(
+        self.write_row(
             [
                 self._time,
                 PlayerEvents.WLINK.name,
@@ -162,7 +419,7 @@ class CorePlayerWriter:
         :param linked: True if nodes are linked, False otherwise
         :return: nothing
         """
-        self._csv_file.writerow(
+        self.write_row(
             [
                 self._time,
                 PlayerEvents.WILINK.name,
@@ -179,7 +436,7 @@ class CorePlayerWriter:
         node1_id: int,
         node2_id: int,
         loss1: float,
-        delay1: int,
+        delay1: float,
         loss2: float = None,
         delay2: float = None,
     ) -> None:
@@ -197,7 +454,7 @@ class CorePlayerWriter:
         """
         loss2 = loss2 if loss2 is not None else loss1
         delay2 = delay2 if delay2 is not None else delay1
-        self._csv_file.writerow(
+        self.write_row(
             [
                 self._time,
                 PlayerEvents.WICONFIG.name,
@@ -212,24 +469,124 @@ class CorePlayerWriter:
         )
 
 
+class RotatingPlayerWriter(CorePlayerWriter):
+    """
+    Writes a core file, rotating it to numbered backups once it reaches a
+    maximum size, similar to logging.handlers.RotatingFileHandler.
+    """
+
+    def __init__(self, file_path: str, max_bytes: int, backups: int) -> None:
+        """
+        Create a RotatingPlayerWriter instance.
+
+        :param file_path: path to create core file
+        :param max_bytes: size to rotate file at, 0 to never rotate
+        :param backups: number of rotated files to keep
+        """
+        super().__init__(file_path)
+        self.max_bytes: int = max_bytes
+        self.backups: int = backups
+        self.size: int = 0
+        self.rotations: int = 0
+
+    def open(self) -> None:
+        super().open()
+        self.size = 0
+
+    def write_row(self, row: list[Any]) -> None:
+        self.size += self._csv_file.writerow(row)
+        if self.max_bytes and self.size >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self) -> None:
+        """
+        Close the current file, shifting it and existing backups up by one, then
+        open a new file.
+
+        :return: nothing
+        """
+        self.close()
+        path = Path(self._file_path)
+        path.with_name(f"{path.name}.{self.backups}").unlink(missing_ok=True)
+        for index in range(self.backups - 1, 0, -1):
+            backup = path.with_name(f"{path.name}.{index}")
+            if backup.exists():
+                backup.replace(path.with_name(f"{path.name}.{index + 1}"))
+        if self.backups > 0:
+            path.replace(path.with_name(f"{path.name}.1"))
+        self.open()
+        self.rotations += 1
+
+
+class QueuePlayerWriter(CorePlayerWriter):
+    """
+    Writes core file rows into memory, placing written data into a queue on
+    every flush, for streaming. Data is dropped when the queue is full, so a
+    slow consumer does not grow memory without bound.
+    """
+
+    def __init__(self, maxsize: int = MAX_QUEUED_WRITES) -> None:
+        """
+        Create a QueuePlayerWriter instance.
+
+        :param maxsize: maximum number of flushed writes to queue
+        """
+        super().__init__("")
+        self.queue: Queue = Queue(maxsize)
+        self.dropped: int = 0
+
+    def open(self) -> None:
+        self._file = io.StringIO()
+        self._csv_file = csv.writer(self._file, quoting=csv.QUOTE_MINIMAL)
+
+    def flush(self) -> None:
+        data = self._file.getvalue()
+        if data:
+            try:
+                self.queue.put_nowait(data)
+            except Full:
+                self.dropped += 1
+            self._file.seek(0)
+            self._file.truncate()
+
+    def close(self) -> None:
+        self.flush()
+        # make room for the end of stream marker when the consumer fell behind
+        try:
+            self.queue.put_nowait(None)
+        except Full:
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except Empty:
+                pass
+            self.queue.put_nowait(None)
+        if self.dropped:
+            logger.warning("dropped %s queued writes", self.dropped)
+
+
 class CorePlayer:
     """
     Provides core player functionality for reading a file with timed events
     and playing them out.
     """
 
-    def __init__(self, file_path: Path):
+    def __init__(self, file_path: Path, speed: float = 1.0, seek: float = 0.0):
         """
         Creates a CorePlayer instance.
 
         :param file_path: file to play path
+        :param speed: playback speed multiplier
+        :param seek: time within file to start playing from
         """
         self.file_path: Path = file_path
+        self.speed: float = speed
+        self.seek: float = seek
         self.core: CoreGrpcClient = CoreGrpcClient()
         self.session_id: int | None = None
         self.node_streamer: MoveNodesStreamer | None = None
         self.node_streamer_thread: Thread | None = None
-        self.scheduler: sched.scheduler = sched.scheduler()
+        self.stopped: Event = Event()
         self.handlers: dict[PlayerEvents, Callable] = {
             PlayerEvents.XY: self.handle_xy,
             PlayerEvents.GEO: self.handle_geo,
@@ -270,42 +627,89 @@ class CorePlayer:
 
     def start(self) -> None:
         """
-        Starts playing file, reading the csv data line by line, then handling
-        each line event type. Delay is tracked and calculated, while processing,
-        to ensure we wait for the event time to be active.
+        Starts playing file, using its compiled timeline. Events are scheduled
+        against absolute times from when playback started, adjusted by the
+        playback speed, so processing time does not accumulate as drift. Events
+        sharing the same time are dispatched together.
 
         :return: nothing
         """
-        current_time = 0.0
-        with self.file_path.open("r", newline="") as f:
-            for row in csv.reader(f):
-                # determine delay
-                input_time = float(row[0])
-                delay = input_time - current_time
-                current_time = input_time
-                # determine event
-                event_value = row[1]
-                event = PlayerEvents.get(event_value)
-                if not event:
-                    logger.error("unknown event type: %s", ",".join(row))
-                    continue
-                # get args and event functions
-                args = tuple(ast.literal_eval(x) for x in row[2:])
-                event_func = self.handlers.get(event)
-                if not event_func:
-                    logger.error("unknown event type handler: %s", ",".join(row))
-                    continue
-                logger.info(
-                    "processing line time(%s) event(%s) args(%s)",
-                    input_time,
-                    event.name,
-                    args,
-                )
-                # schedule and run event
-                self.scheduler.enter(delay, 1, event_func, argument=args)
-                self.scheduler.run()
+        timeline = PlayerTimeline.from_file(self.file_path)
+        index = timeline.find(self.seek)
+        logger.info(
+            "playing %s events from time(%s) speed(%s)",
+            len(timeline) - index,
+            self.seek,
+            self.speed,
+        )
+        self.apply_state(timeline, index)
+        start_time = time.monotonic()
+        while index < len(timeline) and not self.stopped.is_set():
+            event_time = timeline.times[index]
+            end = index
+            while end < len(timeline) and timeline.times[end] == event_time:
+                end += 1
+            target = start_time + (event_time - self.seek) / self.speed
+            delay = target - time.monotonic()
+            if delay > 0 and self.stopped.wait(delay):
+                break
+            self.handle_events([timeline.get(x) for x in range(index, end)])
+            index = end
         self.stop()
 
+    def apply_state(self, timeline: PlayerTimeline, index: int) -> None:
+        """
+        Apply the latest state events occurring before the provided index, such
+        as node positions, so seeking starts from the state at that time.
+
+        :param timeline: timeline being played
+        :param index: index playback starts at
+        :return: nothing
+        """
+        latest = {}
+        for event_index in range(index):
+            event_time, event, args = timeline.get(event_index)
+            if event not in STATE_EVENTS:
+                continue
+            if event in (PlayerEvents.XY, PlayerEvents.GEO):
+                key = ("node", args[0])
+            else:
+                key = (event, *args[:3])
+            latest.pop(key, None)
+            latest[key] = (event_time, event, args)
+        if latest:
+            logger.info("applying %s state events before seek", len(latest))
+            self.handle_events(list(latest.values()))
+
+    def handle_events(self, events: list[tuple[float, PlayerEvents, tuple]]) -> None:
+        """
+        Handle events occurring at the same time, sending all movements as a
+        single burst before handling any other events.
+
+        :param events: events to handle
+        :return: nothing
+        """
+        moves = []
+        others = []
+        for event_time, event, args in events:
+            logger.debug(
+                "processing time(%s) event(%s) args(%s)", event_time, event.name, args
+            )
+            if event == PlayerEvents.XY:
+                moves.append(self.node_streamer.create_position(*args))
+            elif event == PlayerEvents.GEO:
+                moves.append(self.node_streamer.create_geo(*args))
+            else:
+                others.append((event, args))
+        if moves:
+            self.node_streamer.send_all(moves)
+        for event, args in others:
+            event_func = self.handlers.get(event)
+            if not event_func:
+                logger.error("unknown event type handler: %s", event.name)
+                continue
+            event_func(*args)
+
     def stop(self) -> None:
         """
         Stop and cleanup playback.
@@ -313,9 +717,11 @@ class CorePlayer:
         :return: nothing
         """
         logger.info("stopping playback, cleaning up")
-        self.node_streamer.stop()
-        self.node_streamer_thread.join()
-        self.node_streamer_thread = None
+        self.stopped.set()
+        if self.node_streamer_thread:
+            self.node_streamer.stop()
+            self.node_streamer_thread.join()
+            self.node_streamer_thread = None
 
     def handle_xy(self, node_id: int, x: float, y: float) -> None:
         """
@@ -416,9 +822,9 @@ class CorePlayer:
         node1_id: int,
         node2_id: int,
         loss1: float,
-        delay1: int,
+        delay1: float,
         loss2: float,
-        delay2: int,
+        delay2: float,
     ) -> None:
         """
         Handle wireless config event.
@@ -443,8 +849,8 @@ class CorePlayer:
             loss2,
             delay2,
         )
-        options1 = LinkOptions(loss=loss1, delay=delay1)
-        options2 = LinkOptions(loss=loss2, delay=delay2)
+        options1 = LinkOptions(loss=loss1, delay=round(delay1))
+        options2 = LinkOptions(loss=loss2, delay=round(delay2))
         self.core.wireless_config(
             self.session_id, wireless_id, node1_id, node2_id, options1, options2
         )
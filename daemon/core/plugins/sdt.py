@@ -4,6 +4,8 @@ sdt.py: Scripted Display Tool (SDT3D) helper
 
 import logging
 import socket
+import threading
+from collections.abc import Callable
 from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
@@ -13,6 +15,7 @@ from core.emane.nodes import EmaneNet
 from core.emulator.data import LinkData, NodeData
 from core.emulator.enumerations import EventTypes, MessageFlags
 from core.errors import CoreError
+from core.location.geo import GeoLocation
 from core.nodes.base import CoreNode, NodeBase
 from core.nodes.network import HubNode, SwitchNode, TunnelNode, WlanNode
 from core.nodes.physical import Rj45Node
@@ -30,6 +33,9 @@ LINK_LAYER: str = "CORE::Links"
 WIRED_LINK_LAYER: str = f"{LINK_LAYER}::wired"
 CORE_LAYERS: list[str] = [CORE_LAYER, LINK_LAYER, NODE_LAYER, WIRED_LINK_LAYER]
 DEFAULT_LINK_COLOR: str = "red"
+DEFAULT_INTERVAL: int = 100
+DEFAULT_MTU: int = 1400
+MAX_PENDING_CMDS: int = 10000
 NODE_TYPES: dict[type[NodeBase], str] = {
     HubNode: "hub",
     SwitchNode: "lanswitch",
@@ -52,6 +58,212 @@ def get_link_id(node1_id: int, node2_id: int, network_id: int) -> str:
     return link_id
 
 
+def pack_cmds(cmds: list[str], mtu: int) -> list[bytes]:
+    """
+    Pack commands into as few datagrams as possible, without exceeding the mtu.
+    Commands larger than the mtu are sent in a datagram of their own.
+
+    :param cmds: commands to pack
+    :param mtu: maximum size of a datagram
+    :return: datagrams to send
+    """
+    datagrams = []
+    current = bytearray()
+    for cmd in cmds:
+        data = f"{cmd}\n".encode()
+        if current and len(current) + len(data) > mtu:
+            datagrams.append(bytes(current))
+            current = bytearray()
+        current.extend(data)
+    if current:
+        datagrams.append(bytes(current))
+    return datagrams
+
+
+class SdtWriter:
+    """
+    Writes SDT commands to a socket from a dedicated thread, so a slow SDT
+    never blocks callers. Node position updates are coalesced per node over an
+    interval and commands are packed into datagrams up to the configured mtu.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        location: GeoLocation,
+        interval: float,
+        mtu: int,
+        error_handler: Callable[[], None],
+    ) -> None:
+        """
+        Create a SdtWriter instance.
+
+        :param sock: connected socket to write to
+        :param location: location used to convert node positions to geo
+        :param interval: interval to coalesce updates over, in seconds
+        :param mtu: maximum size of datagrams written
+        :param error_handler: called when writing fails
+        """
+        self.sock: socket.socket = sock
+        self.location: GeoLocation = location
+        self.interval: float = interval
+        self.mtu: int = mtu
+        self.error_handler: Callable[[], None] = error_handler
+        self.cmds: list[str] = []
+        self.geo_positions: dict[int, tuple[float, float, float]] = {}
+        self.positions: dict[int, tuple[float, float, float | None]] = {}
+        self.running: bool = False
+        self.sent_cmds: int = 0
+        self.sent_datagrams: int = 0
+        self.coalesced: int = 0
+        self.dropped: int = 0
+        self.condition: threading.Condition = threading.Condition()
+        self.stop_event: threading.Event = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Start the writer thread.
+
+        :return: nothing
+        """
+        self.running = True
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the writer thread, after writing any pending commands.
+
+        :return: nothing
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+    def has_pending(self) -> bool:
+        return bool(self.cmds or self.geo_positions or self.positions)
+
+    def add_cmd(self, cmd: str) -> bool:
+        """
+        Queue a command to write, preserving order with other commands.
+
+        :param cmd: command to write
+        :return: True if queued, False if dropped
+        """
+        with self.condition:
+            if len(self.cmds) >= MAX_PENDING_CMDS:
+                self.dropped += 1
+                return False
+            self.cmds.append(cmd)
+            self.condition.notify()
+        return True
+
+    def set_geo(self, node_id: int, lon: float, lat: float, alt: float) -> None:
+        """
+        Queue a geo position update for a node, replacing any pending update.
+
+        :param node_id: id of node to update
+        :param lon: node longitude
+        :param lat: node latitude
+        :param alt: node altitude
+        :return: nothing
+        """
+        with self.condition:
+            current = self.positions.pop(node_id, None)
+            if self.geo_positions.get(node_id, current) is not None:
+                self.coalesced += 1
+            self.geo_positions[node_id] = (lon, lat, alt)
+            self.condition.notify()
+
+    def set_position(self, node_id: int, x: float, y: float, z: float | None) -> None:
+        """
+        Queue a position update for a node, replacing any pending update. The
+        position will be converted to geo when written.
+
+        :param node_id: id of node to update
+        :param x: node x position
+        :param y: node y position
+        :param z: node z position
+        :return: nothing
+        """
+        with self.condition:
+            current = self.geo_positions.pop(node_id, None)
+            if self.positions.get(node_id, current) is not None:
+                self.coalesced += 1
+            self.positions[node_id] = (x, y, z)
+            self.condition.notify()
+
+    def delete_node(self, node_id: int) -> None:
+        """
+        Queue deletion of a node, discarding any pending position updates.
+
+        :param node_id: id of node to delete
+        :return: nothing
+        """
+        with self.condition:
+            self.geo_positions.pop(node_id, None)
+            self.positions.pop(node_id, None)
+        self.add_cmd(f"delete node,{node_id}")
+
+    def run(self) -> None:
+        """
+        Writer thread loop, waiting for pending commands and writing them after
+        the interval passes, to allow coalescing.
+
+        :return: nothing
+        """
+        while True:
+            with self.condition:
+                while self.running and not self.has_pending():
+                    self.condition.wait()
+                running = self.running
+            if running:
+                self.stop_event.wait(self.interval)
+            if not self.flush() or not running:
+                break
+
+    def flush(self) -> bool:
+        """
+        Write all pending commands and position updates.
+
+        :return: True if successful, False otherwise
+        """
+        with self.condition:
+            cmds = self.cmds
+            geo_positions = self.geo_positions
+            positions = self.positions
+            self.cmds = []
+            self.geo_positions = {}
+            self.positions = {}
+        node_ids = list(positions)
+        geos = self.location.getgeo_many([positions[x] for x in node_ids])
+        for node_id, (lat, lon, alt) in zip(node_ids, geos):
+            geo_positions[node_id] = (lon, lat, alt)
+        for node_id, (lon, lat, alt) in geo_positions.items():
+            cmds.append(f"node {node_id} pos {lon:.6f},{lat:.6f},{alt:.6f}")
+        if not cmds:
+            return True
+        datagrams = pack_cmds(cmds, self.mtu)
+        try:
+            for datagram in datagrams:
+                logger.debug("sdt cmds: %s", datagram)
+                self.sock.sendall(datagram)
+        except OSError:
+            logger.exception("SDT connection error")
+            self.running = False
+            self.error_handler()
+            return False
+        self.sent_cmds += len(cmds)
+        self.sent_datagrams += len(datagrams)
+        return True
+
+
 class Sdt:
     """
     Helper class for exporting session objects to NRL"s SDT3D.
@@ -91,6 +303,7 @@ class Sdt:
         self.address: tuple[str | None, int | None] | None = None
         self.protocol: str | None = None
         self.network_layers: set[str] = set()
+        self.writer: SdtWriter | None = None
         self.session.broadcast_manager.add_handler(NodeData, self.handle_node_update)
         self.session.broadcast_manager.add_handler(LinkData, self.handle_link_update)
 
@@ -141,6 +354,16 @@ class Sdt:
             except OSError:
                 logger.exception("SDT socket connect error")
                 return False
+            interval = self.session.options.get_int("sdt_interval", DEFAULT_INTERVAL)
+            mtu = self.session.options.get_int("sdt_mtu", DEFAULT_MTU)
+            self.writer = SdtWriter(
+                self.sock,
+                self.session.location,
+                interval / 1000,
+                mtu,
+                self.handle_error,
+            )
+            self.writer.start()
 
         if not self.initialize():
             return False
@@ -169,10 +392,13 @@ class Sdt:
 
     def disconnect(self) -> None:
         """
-        Disconnect from SDT.
+        Disconnect from SDT, after writing pending commands.
 
         :return: nothing
         """
+        if self.writer:
+            self.writer.stop()
+            self.writer = None
         if self.sock:
             try:
                 self.sock.close()
@@ -198,25 +424,41 @@ class Sdt:
 
     def cmd(self, cmdstr: str) -> bool:
         """
-        Send an SDT command over a UDP socket. socket.sendall() is used
-        as opposed to socket.sendto() because an exception is raised when
-        there is no socket listener.
+        Queue an SDT command to be written to SDT by the writer thread.
 
         :param cmdstr: command to send
-        :return: True if command was successful, False otherwise
+        :return: True if command was queued, False otherwise
         """
-        if self.sock is None:
-            return False
-        try:
-            cmd = f"{cmdstr}\n".encode()
-            logger.debug("sdt cmd: %s", cmd)
-            self.sock.sendall(cmd)
-            return True
-        except OSError:
-            logger.exception("SDT connection error")
-            self.sock = None
-            self.connected = False
+        if self.sock is None or self.writer is None:
             return False
+        return self.writer.add_cmd(cmdstr)
+
+    def get_writer(self) -> SdtWriter | None:
+        """
+        Connect to SDT when enabled and retrieve the current writer.
+
+        :return: current writer, None when not connected
+        """
+        if not self.connect():
+            return None
+        return self.writer
+
+    def handle_error(self) -> None:
+        """
+        Invoked by the writer thread when writing to SDT fails, allowing a
+        future connection attempt.
+
+        :return: nothing
+        """
+        sock = self.sock
+        self.sock = None
+        self.writer = None
+        self.connected = False
+        if sock:
+            try:
+                sock.close()
+            except OSError:
+                logger.error("error closing socket")
 
     def sendobjs(self) -> None:
         """
@@ -297,17 +539,16 @@ class Sdt:
         :return: nothing
         """
         logger.debug("sdt update node: %s - %s", node.id, node.name)
-        if not self.connect():
+        writer = self.get_writer()
+        if not writer:
             return
-
         if all([lat is not None, lon is not None, alt is not None]):
-            pos = f"pos {lon:.6f},{lat:.6f},{alt:.6f}"
-            self.cmd(f"node {node.id} {pos}")
+            writer.set_geo(node.id, lon, lat, alt)
         else:
-            pos = self.get_node_position(node)
-            if not pos:
+            x, y, z = node.position.get()
+            if x is None or y is None:
                 return
-            self.cmd(f"node {node.id} {pos}")
+            writer.set_position(node.id, x, y, z)
 
     def delete_node(self, node_id: int) -> None:
         """
@@ -317,9 +558,9 @@ class Sdt:
         :return: nothing
         """
         logger.debug("sdt delete node: %s", node_id)
-        if not self.connect():
-            return
-        self.cmd(f"delete node,{node_id}")
+        writer = self.get_writer()
+        if writer:
+            writer.delete_node(node_id)
 
     def handle_node_update(self, node_data: NodeData) -> None:
         """
@@ -328,22 +569,20 @@ class Sdt:
         :param node_data: node data being updated
         :return: nothing
         """
-        if not self.connect():
+        writer = self.get_writer()
+        if not writer:
             return
         node = node_data.node
         logger.debug("sdt handle node update: %s - %s", node.id, node.name)
         if node_data.message_type == MessageFlags.DELETE:
-            self.cmd(f"delete node,{node.id}")
+            writer.delete_node(node.id)
         else:
             x, y, _ = node.position.get()
             lon, lat, alt = node.position.get_geo()
             if all([lat is not None, lon is not None, alt is not None]):
-                pos = f"pos {lon:.6f},{lat:.6f},{alt:.6f}"
-                self.cmd(f"node {node.id} {pos}")
+                writer.set_geo(node.id, lon, lat, alt)
             elif node_data.message_type == MessageFlags.NONE:
-                lat, lon, alt = self.session.location.getgeo(x, y, 0)
-                pos = f"pos {lon:.6f},{lat:.6f},{alt:.6f}"
-                self.cmd(f"node {node.id} {pos}")
+                writer.set_position(node.id, x, y, 0)
 
     def wireless_net_check(self, node_id: int) -> bool:
         """
@@ -12,7 +12,7 @@ import time
 from configparser import ConfigParser
 from pathlib import Path
 
-from core import constants
+from core import constants, metrics
 from core.api.grpc.server import CoreGrpcServer
 from core.constants import COREDPY_VERSION
 from core.emulator.coreemu import CoreEmu
@@ -71,6 +71,14 @@ def cored(cfg):
     """
     # initialize grpc api
     coreemu = CoreEmu(cfg)
+    metrics_port = cfg.get("metrics_port")
+    if metrics_port:
+        if not metrics.METRICS.enabled:
+            logger.warning(
+                "metrics server enabled without metrics = 1, "
+                "metrics will not be recorded"
+            )
+        metrics.start_server(cfg["grpcaddress"], int(metrics_port))
     grpc_server = CoreGrpcServer(coreemu)
     address_config = cfg["grpcaddress"]
     port_config = cfg["grpcport"]
@@ -142,9 +150,16 @@ def main():
     parser.add_argument(
         "--ovs", action="store_true", help="enable experimental ovs mode"
     )
+    parser.add_argument(
+        "--rebuild-cache",
+        dest="rebuild_cache",
+        action="store_true",
+        help="ignore and rebuild cached startup data",
+    )
     args = parser.parse_args()
-    # convert ovs to internal format
+    # convert ovs and rebuild cache to internal format
     args.ovs = "1" if args.ovs else "0"
+    args.rebuild_cache = "1" if args.rebuild_cache else "0"
     # validate files exist
     if not args.log_config.is_file():
         raise FileNotFoundError(f"{args.log_config} does not exist")
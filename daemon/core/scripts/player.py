@@ -15,6 +15,13 @@ def path_type(value: str) -> Path:
     return file_path
 
 
+def positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"value must be greater than 0: {value}")
+    return number
+
+
 def parse_args() -> argparse.Namespace:
     """
     Setup and parse command line arguments.
@@ -34,13 +41,19 @@ def parse_args() -> argparse.Namespace:
         type=int,
         help="session to play to, first found session otherwise",
     )
+    parser.add_argument(
+        "--speed", type=positive_float, default=1.0, help="playback speed multiplier"
+    )
+    parser.add_argument(
+        "--seek", type=float, default=0.0, help="time in file to start playing from"
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
     args = parse_args()
-    player = CorePlayer(args.file)
+    player = CorePlayer(args.file, args.speed, args.seek)
     result = player.init(args.session)
     if not result:
         sys.exit(1)
@@ -1,7 +1,9 @@
 import abc
 import enum
+import hashlib
 import inspect
 import logging
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -11,6 +13,7 @@ from mako import exceptions
 from mako.lookup import TemplateLookup
 from mako.template import Template
 
+from core import metrics
 from core.config import Configuration
 from core.errors import CoreCommandError, CoreError
 from core.nodes.base import CoreNode
@@ -33,12 +36,136 @@ def get_template_path(file_path: Path) -> str:
     return template_path
 
 
+class TemplateCache:
+    """
+    Process wide cache of compiled service templates, shared by all service
+    instances, so that each template is only compiled once regardless of the
+    number of nodes running a service.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a TemplateCache instance.
+        """
+        self.module_dir: Path | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._lookups: dict[Path, TemplateLookup] = {}
+        self._texts: dict[tuple[str, str], Template] = {}
+
+    @staticmethod
+    def _service_key(service_class: type["CoreService"]) -> str:
+        return f"{service_class.__module__}.{service_class.__qualname__}"
+
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def set_module_dir(self, module_dir: Path | None) -> None:
+        """
+        Set directory used to store compiled template modules, allowing compiled
+        templates to be reused across restarts.
+
+        :param module_dir: directory to store compiled modules, None to disable
+        :return: nothing
+        """
+        with self._lock:
+            self.module_dir = module_dir
+            self._lookups.clear()
+            self._texts.clear()
+
+    def get_lookup(self, path: Path) -> TemplateLookup:
+        """
+        Retrieve a shared template lookup for a given template directory.
+
+        :param path: template directory to get lookup for
+        :return: template lookup for directory
+        """
+        with self._lock:
+            lookup = self._lookups.get(path)
+            if lookup is None:
+                module_dir = None
+                if self.module_dir:
+                    # modules are named by template uri, so separate directories
+                    name = hashlib.sha1(str(path).encode()).hexdigest()
+                    module_dir = str(self.module_dir / "files" / name)
+                lookup = TemplateLookup(directories=path, module_directory=module_dir)
+                self._lookups[path] = lookup
+            return lookup
+
+    def get_text(self, service_class: type["CoreService"], text: str) -> Template:
+        """
+        Retrieve a compiled template for text provided by a service class,
+        compiling and caching it when not already present.
+
+        :param service_class: service class text template belongs to
+        :param text: template text
+        :return: compiled template
+        """
+        key = (self._service_key(service_class), self._text_hash(text))
+        with self._lock:
+            template = self._texts.get(key)
+            if template is None:
+                if self.module_dir:
+                    # mako only persists modules for file based templates
+                    uri = f"{key[0]}/{key[1]}.mako"
+                    source_path = self.module_dir / "sources" / uri
+                    if not source_path.exists():
+                        source_path.parent.mkdir(parents=True, exist_ok=True)
+                        source_path.write_text(text)
+                    module_dir = str(self.module_dir / "texts")
+                    template = Template(
+                        filename=str(source_path), uri=uri, module_directory=module_dir
+                    )
+                else:
+                    template = Template(text)
+                self._texts[key] = template
+            return template
+
+    def invalidate(self, service_class: type["CoreService"], text: str) -> None:
+        """
+        Remove a cached compiled text template.
+
+        :param service_class: service class text template belongs to
+        :param text: template text
+        :return: nothing
+        """
+        key = (self._service_key(service_class), self._text_hash(text))
+        with self._lock:
+            self._texts.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Clear all cached templates.
+
+        :return: nothing
+        """
+        with self._lock:
+            self._lookups.clear()
+            self._texts.clear()
+
+
+TEMPLATE_CACHE: TemplateCache = TemplateCache()
+
+
 class ServiceMode(enum.Enum):
     BLOCKING = 0
     NON_BLOCKING = 1
     TIMER = 2
 
 
+class TopologyDep(enum.Enum):
+    """
+    Runtime topology changes that service files may depend on.
+    """
+
+    # interfaces added to or removed from the service node
+    IFACES = 0
+    # interfaces added to or removed from networks the service node is on
+    NETWORKS = 1
+    # link options changed for interfaces of the service node
+    LINK_OPTIONS = 2
+
+
 class ServiceBootError(Exception):
     pass
 
@@ -90,6 +217,12 @@ class CoreService(abc.ABC):
     validation_timer: int = 5
     # directories to shadow and copy files from
     shadow_directories: list[ShadowDir] = []
+    # topology changes files depend on, allowing files to be updated at runtime
+    topology_deps: list[TopologyDep] = []
+    # files to update for topology changes, defaults to all files
+    topology_files: list[str] = []
+    # commands to run to apply updated files, without restarting the service
+    reload: list[str] = []
 
     def __init__(self, node: CoreNode) -> None:
         """
@@ -100,10 +233,12 @@ class CoreService(abc.ABC):
         self.node: CoreNode = node
         class_file = inspect.getfile(self.__class__)
         templates_path = Path(class_file).parent.joinpath(TEMPLATES_DIR)
-        self.templates: TemplateLookup = TemplateLookup(directories=templates_path)
+        self.templates: TemplateLookup = TEMPLATE_CACHE.get_lookup(templates_path)
         self.config: dict[str, Configuration] = {}
         self.custom_templates: dict[str, str] = {}
         self.custom_config: dict[str, str] = {}
+        self.render_time: float = 0.0
+        self.rendered: dict[str, str] = {}
         configs = self.default_configs[:]
         self._define_config(configs)
 
@@ -118,6 +253,7 @@ class CoreService(abc.ABC):
         """
         return inspect.cleandoc(text)
 
+    @metrics.timed("service_start", lambda self: self.name)
     def start(self) -> None:
         """
         Creates services files/directories, runs startup, and validates based on
@@ -211,7 +347,7 @@ class CoreService(abc.ABC):
                 self.node.create_dir(path)
             # create all files within node, from templates when configured
             data = self.data()
-            templates = TemplateLookup(directories=src_path)
+            templates = TEMPLATE_CACHE.get_lookup(src_path)
             for path, dst_path in file_paths:
                 if shadow_dir.templates:
                     template = templates.get_template(path.name)
@@ -254,6 +390,9 @@ class CoreService(abc.ABC):
         :param template: custom template to render
         :return: nothing
         """
+        current = self.custom_templates.get(name)
+        if current is not None and current != template:
+            TEMPLATE_CACHE.invalidate(self.__class__, self.clean_text(current))
         self.custom_templates[name] = template
 
     def get_text_template(self, name: str) -> str:
@@ -326,14 +465,73 @@ class CoreService(abc.ABC):
 
         :return: nothing
         """
+        start = time.monotonic()
         data = self.data()
+        render_time = time.monotonic() - start
         for file in sorted(self.files):
             logger.debug(
                 "node(%s) service(%s) template(%s)", self.node.name, self.name, file
             )
+            start = time.monotonic()
             rendered = self._get_rendered_template(file, data)
+            render_time += time.monotonic() - start
             file_path = Path(file)
             self.node.create_file(file_path, rendered)
+            self.rendered[file] = rendered
+        self.render_time = render_time
+        self.node.session.topology.set_render_time(self.node.id, render_time)
+        logger.debug(
+            "node(%s) service(%s) render time: %s",
+            self.node.name,
+            self.name,
+            render_time,
+        )
+
+    def update_files(self, changes: set[TopologyDep]) -> list[str]:
+        """
+        Re-render files depending on the provided topology changes, writing files
+        that differ from their previous render and running reload commands when
+        any were written.
+
+        :param changes: topology changes that occurred
+        :return: files that were updated
+        :raises CoreError: when a reload command fails
+        """
+        if changes.isdisjoint(self.topology_deps):
+            return []
+        data = self.data()
+        updated = []
+        for file in sorted(self.topology_files or self.files):
+            rendered = self._get_rendered_template(file, data)
+            if rendered == self.rendered.get(file):
+                continue
+            logger.debug(
+                "node(%s) service(%s) updating file(%s)",
+                self.node.name,
+                self.name,
+                file,
+            )
+            self.node.create_file(Path(file), rendered)
+            self.rendered[file] = rendered
+            updated.append(file)
+        if updated:
+            self.run_reload()
+        return updated
+
+    def run_reload(self) -> None:
+        """
+        Run reload commands for service on node.
+
+        :return: nothing
+        :raises CoreError: when a reload command fails
+        """
+        for cmd in self.reload:
+            try:
+                self.node.cmd(cmd, shell=True)
+            except CoreCommandError as e:
+                raise CoreError(
+                    f"node({self.node.name}) service({self.name}) failed reload: {e}"
+                )
 
     def run_startup(self, wait: bool) -> None:
         """
@@ -352,6 +550,7 @@ class CoreService(abc.ABC):
                     f"node({self.node.name}) service({self.name}) failed startup: {e}"
                 )
 
+    @metrics.timed("service_validate", lambda self: self.name)
     def wait_validation(self) -> None:
         """
         Waits for a period of time to consider service started successfully.
@@ -360,6 +559,7 @@ class CoreService(abc.ABC):
         """
         time.sleep(self.validation_timer)
 
+    @metrics.timed("service_validate", lambda self: self.name)
     def run_validation(self) -> None:
         """
         Runs validation commands for service on node.
@@ -410,7 +610,7 @@ class CoreService(abc.ABC):
         """
         text = self.clean_text(text)
         try:
-            template = Template(text)
+            template = TEMPLATE_CACHE.get_text(self.__class__, text)
             return self._render(template, data)
         except Exception:
             raise CoreError(
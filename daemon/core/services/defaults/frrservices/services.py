@@ -1,26 +1,23 @@
 import abc
 from typing import Any
 
-from core.emane.nodes import EmaneNet
-from core.nodes.base import CoreNodeBase, NodeBase
-from core.nodes.interface import DEFAULT_MTU, CoreInterface
-from core.nodes.network import PtpNet, WlanNode
-from core.nodes.physical import Rj45Node
-from core.nodes.wireless import WirelessNode
-from core.services.base import CoreService
+from core.nodes.base import CoreNodeBase
+from core.nodes.interface import CoreInterface
+from core.nodes.network import PtpNet
+from core.services.base import CoreService, TopologyDep
 
 GROUP: str = "FRR"
 FRR_STATE_DIR: str = "/var/run/frr"
 
 
-def is_wireless(node: NodeBase) -> bool:
+def is_wireless(iface: CoreInterface) -> bool:
     """
-    Check if the node is a wireless type node.
+    Helper to check if an interface is connected to a wireless type network.
 
-    :param node: node to check type for
+    :param iface: interface to check
     :return: True if wireless type, False otherwise
     """
-    return isinstance(node, (WlanNode, EmaneNet, WirelessNode))
+    return iface.node.session.topology.is_wireless(iface.net)
 
 
 def has_mtu_mismatch(iface: CoreInterface) -> bool:
@@ -29,14 +26,7 @@ def has_mtu_mismatch(iface: CoreInterface) -> bool:
     mtu-ignore command. This is needed when e.g. a node is linked via a
     GreTap device.
     """
-    if iface.mtu != DEFAULT_MTU:
-        return True
-    if not iface.net:
-        return False
-    for iface in iface.net.get_ifaces():
-        if iface.mtu != iface.mtu:
-            return True
-    return False
+    return iface.node.session.topology.has_mtu_mismatch(iface)
 
 
 def get_min_mtu(iface: CoreInterface) -> int:
@@ -44,24 +34,14 @@ def get_min_mtu(iface: CoreInterface) -> int:
     Helper to discover the minimum MTU of interfaces linked with the
     given interface.
     """
-    mtu = iface.mtu
-    if not iface.net:
-        return mtu
-    for iface in iface.net.get_ifaces():
-        if iface.mtu < mtu:
-            mtu = iface.mtu
-    return mtu
+    return iface.node.session.topology.get_min_mtu(iface)
 
 
 def get_router_id(node: CoreNodeBase) -> str:
     """
     Helper to return the first IPv4 address of a node as its router ID.
     """
-    for iface in node.get_ifaces(control=False):
-        ip4 = iface.get_ip4()
-        if ip4:
-            return str(ip4.ip)
-    return "0.0.0.0"
+    return node.session.topology.get_router_id(node)
 
 
 def rj45_check(iface: CoreInterface) -> bool:
@@ -69,13 +49,7 @@ def rj45_check(iface: CoreInterface) -> bool:
     Helper to detect whether interface is connected an external RJ45
     link.
     """
-    if iface.net:
-        for peer_iface in iface.net.get_ifaces():
-            if peer_iface == iface:
-                continue
-            if isinstance(peer_iface.node, Rj45Node):
-                return True
-    return False
+    return iface.node.session.topology.has_rj45(iface)
 
 
 class FRRZebra(CoreService):
@@ -92,6 +66,9 @@ class FRRZebra(CoreService):
     startup: list[str] = ["bash frrboot.sh zebra"]
     validate: list[str] = ["pidof zebra"]
     shutdown: list[str] = ["pkill -f zebra"]
+    topology_deps: list[TopologyDep] = [TopologyDep.IFACES, TopologyDep.NETWORKS]
+    topology_files: list[str] = ["/usr/local/etc/frr/frr.conf"]
+    reload: list[str] = ["bash frrboot.sh reload"]
 
     def data(self) -> dict[str, Any]:
         frr_conf = self.files[0]
@@ -353,7 +330,7 @@ class FRRBabel(FrrService, CoreService):
         return self.render_text(text, data)
 
     def frr_iface_config(self, iface: CoreInterface) -> str:
-        if is_wireless(iface.net):
+        if is_wireless(iface):
             text = """
             babel wireless
             no babel split-horizon
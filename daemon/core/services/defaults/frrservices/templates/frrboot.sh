@@ -94,6 +94,21 @@ bootfrr()
     $FRR_BIN_DIR/vtysh -b
 }
 
+reloadfrr()
+{
+    FRR_BIN_DIR=$(searchforprog 'vtysh' $FRR_BIN_SEARCH)
+    if [ "z$FRR_BIN_DIR" = "z" ]; then
+        echo "ERROR: FRR's 'vtysh' program not found in search path:"
+        echo "  $FRR_BIN_SEARCH"
+        return 1
+    fi
+    $FRR_BIN_DIR/vtysh -b
+}
+
+if [ "$1" = "reload" ]; then
+    reloadfrr
+    exit $?
+fi
 if [ "$1" != "zebra" ]; then
     echo "WARNING: '$1': all FRR daemons are launched by the 'zebra' service!"
     exit 1
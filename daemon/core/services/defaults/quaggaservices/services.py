@@ -2,27 +2,24 @@ import abc
 import logging
 from typing import Any
 
-from core.emane.nodes import EmaneNet
-from core.nodes.base import CoreNodeBase, NodeBase
-from core.nodes.interface import DEFAULT_MTU, CoreInterface
-from core.nodes.network import PtpNet, WlanNode
-from core.nodes.physical import Rj45Node
-from core.nodes.wireless import WirelessNode
-from core.services.base import CoreService
+from core.nodes.base import CoreNodeBase
+from core.nodes.interface import CoreInterface
+from core.nodes.network import PtpNet
+from core.services.base import CoreService, TopologyDep
 
 logger = logging.getLogger(__name__)
 GROUP: str = "Quagga"
 QUAGGA_STATE_DIR: str = "/var/run/quagga"
 
 
-def is_wireless(node: NodeBase) -> bool:
+def is_wireless(iface: CoreInterface) -> bool:
     """
-    Check if the node is a wireless type node.
+    Helper to check if an interface is connected to a wireless type network.
 
-    :param node: node to check type for
+    :param iface: interface to check
     :return: True if wireless type, False otherwise
     """
-    return isinstance(node, (WlanNode, EmaneNet, WirelessNode))
+    return iface.node.session.topology.is_wireless(iface.net)
 
 
 def has_mtu_mismatch(iface: CoreInterface) -> bool:
@@ -31,39 +28,22 @@ def has_mtu_mismatch(iface: CoreInterface) -> bool:
     mtu-ignore command. This is needed when e.g. a node is linked via a
     GreTap device.
     """
-    if iface.mtu != DEFAULT_MTU:
-        return True
-    if not iface.net:
-        return False
-    for iface in iface.net.get_ifaces():
-        if iface.mtu != iface.mtu:
-            return True
-    return False
+    return iface.node.session.topology.has_mtu_mismatch(iface)
 
 
-def get_min_mtu(iface: CoreInterface):
+def get_min_mtu(iface: CoreInterface) -> int:
     """
     Helper to discover the minimum MTU of interfaces linked with the
     given interface.
     """
-    mtu = iface.mtu
-    if not iface.net:
-        return mtu
-    for iface in iface.net.get_ifaces():
-        if iface.mtu < mtu:
-            mtu = iface.mtu
-    return mtu
+    return iface.node.session.topology.get_min_mtu(iface)
 
 
 def get_router_id(node: CoreNodeBase) -> str:
     """
     Helper to return the first IPv4 address of a node as its router ID.
     """
-    for iface in node.get_ifaces(control=False):
-        ip4 = iface.get_ip4()
-        if ip4:
-            return str(ip4.ip)
-    return "0.0.0.0"
+    return node.session.topology.get_router_id(node)
 
 
 def rj45_check(iface: CoreInterface) -> bool:
@@ -71,13 +51,7 @@ def rj45_check(iface: CoreInterface) -> bool:
     Helper to detect whether interface is connected an external RJ45
     link.
     """
-    if iface.net:
-        for peer_iface in iface.net.get_ifaces():
-            if peer_iface == iface:
-                continue
-            if isinstance(peer_iface.node, Rj45Node):
-                return True
-    return False
+    return iface.node.session.topology.has_rj45(iface)
 
 
 class Zebra(CoreService):
@@ -93,6 +67,9 @@ class Zebra(CoreService):
     startup: list[str] = ["bash quaggaboot.sh zebra"]
     validate: list[str] = ["pidof zebra"]
     shutdown: list[str] = ["pkill -f zebra"]
+    topology_deps: list[TopologyDep] = [TopologyDep.IFACES, TopologyDep.NETWORKS]
+    topology_files: list[str] = ["/usr/local/etc/quagga/Quagga.conf"]
+    reload: list[str] = ["bash quaggaboot.sh reload"]
 
     def data(self) -> dict[str, Any]:
         quagga_bin_search = self.node.session.options.get(
@@ -262,7 +239,7 @@ class Ospfv3mdr(Ospfv3):
 
     def quagga_iface_config(self, iface: CoreInterface) -> str:
         config = super().quagga_iface_config(iface)
-        if is_wireless(iface.net):
+        if is_wireless(iface):
             config = self.clean_text(
                 f"""
                 {config}
@@ -387,7 +364,7 @@ class Babel(QuaggaService, CoreService):
         return self.render_text(text, data)
 
     def quagga_iface_config(self, iface: CoreInterface) -> str:
-        if is_wireless(iface.net):
+        if is_wireless(iface):
             text = """
             babel wireless
             no babel split-horizon
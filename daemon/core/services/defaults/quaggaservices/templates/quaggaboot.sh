@@ -84,6 +84,21 @@ bootquagga()
     $QUAGGA_BIN_DIR/vtysh -b
 }
 
+reloadquagga()
+{
+    QUAGGA_BIN_DIR=$(searchforprog 'vtysh' $QUAGGA_BIN_SEARCH)
+    if [ "z$QUAGGA_BIN_DIR" = "z" ]; then
+        echo "ERROR: Quagga's 'vtysh' program not found in search path:"
+        echo "  $QUAGGA_BIN_SEARCH"
+        return 1
+    fi
+    $QUAGGA_BIN_DIR/vtysh -b
+}
+
+if [ "$1" = "reload" ]; then
+    reloadquagga
+    exit $?
+fi
 if [ "$1" != "zebra" ]; then
     echo "WARNING: '$1': all Quagga daemons are launched by the 'zebra' service!"
     exit 1
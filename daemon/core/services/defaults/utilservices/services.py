@@ -3,7 +3,7 @@ from typing import Any
 import netaddr
 
 from core import utils
-from core.services.base import CoreService
+from core.services.base import CoreService, TopologyDep
 
 GROUP_NAME = "Utility"
 
@@ -69,6 +69,8 @@ class IpForwardService(CoreService):
     files: list[str] = ["ipforward.sh"]
     executables: list[str] = ["sysctl"]
     startup: list[str] = ["bash ipforward.sh"]
+    topology_deps: list[TopologyDep] = [TopologyDep.IFACES]
+    reload: list[str] = ["bash ipforward.sh"]
 
     def data(self) -> dict[str, Any]:
         devnames = []
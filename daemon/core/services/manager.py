@@ -1,6 +1,7 @@
 import logging
 import pathlib
 import pkgutil
+from collections.abc import Callable
 from pathlib import Path
 
 from core import utils
@@ -21,6 +22,7 @@ class ServiceManager:
         Create a ServiceManager instance.
         """
         self.services: dict[str, type[CoreService]] = {}
+        self.which: Callable[[str, bool], str | None] = utils.which
         self.defaults: dict[str, list[str]] = {
             "mdr": ["zebra", "OSPFv3MDR", "IPForward"],
             "PC": ["DefaultRoute"],
@@ -68,24 +70,40 @@ class ServiceManager:
         # validate dependent executables are present
         for executable in service.executables:
             try:
-                utils.which(executable, required=True)
+                self.which(executable, True)
             except CoreError as e:
                 raise CoreError(f"service({service.name}): {e}")
 
         # make service available
         self.services[service.name] = service
 
-    def load_locals(self) -> list[str]:
+    @classmethod
+    def find_locals(cls) -> list[str]:
         """
-        Search and add service from local core module.
+        Find names of the modules providing local core services.
 
-        :return: list of errors when loading services
+        :return: list of module names
         """
-        errors = []
+        modules = []
         for module_info in pkgutil.walk_packages(
             defaults.__path__, f"{defaults.__name__}."
         ):
-            services = utils.load_module(module_info.name, CoreService)
+            modules.append(module_info.name)
+        return modules
+
+    def load_locals(self, modules: list[str] = None) -> list[str]:
+        """
+        Search and add service from local core module.
+
+        :param modules: names of modules to load services from, defaults to
+            searching for local modules
+        :return: list of errors when loading services
+        """
+        if modules is None:
+            modules = self.find_locals()
+        errors = []
+        for module in modules:
+            services = utils.load_module(module, CoreService)
             for service in services:
                 try:
                     self.add(service)
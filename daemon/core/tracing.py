@@ -0,0 +1,266 @@
+"""
+Opt-in tracing of external commands run for sessions, recording each command
+with the subsystem it was run for and how long it took. Traces can be written
+as chrome trace event json, viewable with perfetto or chrome://tracing.
+
+Tracing is enabled per session, when no session is being traced, traced
+functions only perform an empty registry check.
+"""
+
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from core import metrics
+
+if TYPE_CHECKING:
+    from core.emulator.session import Session
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+TRACE_FILE: str = "commands.trace.json"
+# functions that only pass commands along, skipped when determining a source
+PASSTHROUGH_FUNCS: frozenset[str] = frozenset(
+    {"cmd", "host_cmd", "net_cmd", "remote_cmd", "cmd_perf", "wrapper"}
+)
+PASSTHROUGH_MODULES: frozenset[str] = frozenset(
+    {"core.utils", "core.metrics", "core.tracing"}
+)
+_TRACERS: dict[int, "CommandTracer"] = {}
+_TRACERS_LOCK: threading.Lock = threading.Lock()
+
+
+@dataclass
+class TraceEvent:
+    """
+    Command run for a session.
+    """
+
+    command: str
+    source: str
+    node: str | None
+    server: str | None
+    thread: int
+    start: float
+    duration: float
+
+    @property
+    def subsystem(self) -> str:
+        return self.source.split(".", 1)[0]
+
+
+class CommandTracer:
+    """
+    Records commands run for a session.
+    """
+
+    def __init__(self, session_id: int) -> None:
+        """
+        Create a CommandTracer instance.
+
+        :param session_id: id of session being traced
+        """
+        self.session_id: int = session_id
+        self.start: float = time.perf_counter()
+        self.lock: threading.Lock = threading.Lock()
+        self.events: list[TraceEvent] = []
+
+    def record(self, event: TraceEvent) -> None:
+        """
+        Record a command run for the session.
+
+        :param event: command event to record
+        :return: nothing
+        """
+        with self.lock:
+            self.events.append(event)
+
+    def summary(self, limit: int = 10) -> list[tuple[str, int, float]]:
+        """
+        Summarize the sources running the most commands.
+
+        :param limit: max number of sources to return
+        :return: source, command count and total duration, by most commands
+        """
+        counts = Counter()
+        durations = Counter()
+        with self.lock:
+            for event in self.events:
+                counts[event.source] += 1
+                durations[event.source] += event.duration
+        return [(x, y, durations[x]) for x, y in counts.most_common(limit)]
+
+    def to_chrome(self) -> dict[str, Any]:
+        """
+        Convert recorded commands to chrome trace event format.
+
+        :return: chrome trace event data
+        """
+        pid = self.session_id
+        trace_events = [
+            dict(
+                name="process_name",
+                ph="M",
+                pid=pid,
+                args=dict(name=f"session {self.session_id}"),
+            )
+        ]
+        with self.lock:
+            events = list(self.events)
+        for event in events:
+            args = dict(command=event.command, source=event.source)
+            if event.node:
+                args["node"] = event.node
+            if event.server:
+                args["server"] = event.server
+            trace_events.append(
+                dict(
+                    name=metrics.command_name(event.command),
+                    cat=event.subsystem,
+                    ph="X",
+                    ts=(event.start - self.start) * 1e6,
+                    dur=event.duration * 1e6,
+                    pid=pid,
+                    tid=event.thread,
+                    args=args,
+                )
+            )
+        return dict(traceEvents=trace_events, displayTimeUnit="ms")
+
+    def write(self, path: Path) -> None:
+        """
+        Write recorded commands as chrome trace event json.
+
+        :param path: path to write trace to
+        :return: nothing
+        """
+        path.write_text(json.dumps(self.to_chrome()))
+
+
+def start(session: "Session") -> CommandTracer:
+    """
+    Start tracing commands run for a session, when not already being traced.
+
+    :param session: session to trace
+    :return: tracer for session
+    """
+    with _TRACERS_LOCK:
+        tracer = _TRACERS.get(id(session))
+        if tracer is None:
+            tracer = CommandTracer(session.id)
+            _TRACERS[id(session)] = tracer
+    return tracer
+
+
+def stop(session: "Session") -> CommandTracer | None:
+    """
+    Stop tracing commands run for a session.
+
+    :param session: session to stop tracing
+    :return: tracer for session, None if not being traced
+    """
+    with _TRACERS_LOCK:
+        return _TRACERS.pop(id(session), None)
+
+
+def get_source(frame: FrameType | None) -> tuple[str, str | None, int | None]:
+    """
+    Determine the source of a command from the stack running it, along with the
+    node and session it was run for.
+
+    :param frame: frame that ran the command
+    :return: source, node name and session key
+    """
+    from core.nodes.base import NodeBase
+
+    source = None
+    node = None
+    session = None
+    while frame is not None and (source is None or session is None):
+        module = frame.f_globals.get("__name__", "")
+        name = frame.f_code.co_name
+        obj = frame.f_locals.get("self")
+        if obj is not None:
+            if node is None and isinstance(obj, NodeBase):
+                node = obj
+            if session is None:
+                if id(obj) in _TRACERS:
+                    session = id(obj)
+                elif id(getattr(obj, "session", None)) in _TRACERS:
+                    session = id(obj.session)
+        passthrough = module in PASSTHROUGH_MODULES or name in PASSTHROUGH_FUNCS
+        if source is None and not passthrough:
+            if type(obj).__name__ == "NftablesQueue":
+                source = f"nft_queue.{name}"
+            elif module == "core.nodes.netclient":
+                source = f"netclient.{name}"
+            elif module.startswith("core.services"):
+                source = f"service.{getattr(obj, 'name', name)}"
+            elif module.startswith("core.emane"):
+                source = f"emane.{name}"
+            elif module.startswith("core.location"):
+                source = f"mobility.{name}"
+            else:
+                module = module.removeprefix("core.")
+                source = f"{module}.{name}"
+        frame = frame.f_back
+    if session is None and node is not None:
+        session = id(node.session)
+    node_name = node.name if node is not None else None
+    return source or "unknown", node_name, session
+
+
+def _record(command: str, server: str | None, start: float, duration: float) -> None:
+    source, node, session = get_source(sys._getframe(2))
+    with _TRACERS_LOCK:
+        tracer = _TRACERS.get(session)
+        if tracer is None and len(_TRACERS) == 1:
+            tracer = next(iter(_TRACERS.values()))
+    if tracer is None:
+        return
+    thread = threading.get_ident()
+    event = TraceEvent(command, source, node, server, thread, start, duration)
+    tracer.record(event)
+
+
+def traced(remote: bool = False) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator tracing commands run by a function, when any session is being
+    traced.
+
+    :param remote: True for a method of a distributed server, otherwise the
+        command is expected as the first argument
+    :return: decorator
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            if not _TRACERS:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                if remote:
+                    command = args[1] if len(args) > 1 else kwargs["cmd"]
+                    server = args[0].name
+                else:
+                    command = args[0] if args else kwargs["args"]
+                    server = None
+                _record(command, server, start, duration)
+
+        return wrapper
+
+    return decorator
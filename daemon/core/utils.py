@@ -10,19 +10,22 @@ import inspect
 import logging.config
 import os
 import random
+import selectors
 import shlex
 import shutil
+import signal
 import sys
 import threading
 from collections import OrderedDict
 from collections.abc import Iterable
 from pathlib import Path
 from queue import Queue
-from subprocess import PIPE, STDOUT, Popen
+from subprocess import PIPE, STDOUT, Popen, TimeoutExpired
 from typing import TYPE_CHECKING, Any, Callable, Generic, TypeVar
 
 import netaddr
 
+from core import metrics, tracing
 from core.errors import CoreCommandError, CoreError
 
 logger = logging.getLogger(__name__)
@@ -194,6 +197,8 @@ def mute_detach(args: str, **kwargs: dict[str, Any]) -> int:
     return Popen(args, **kwargs).pid
 
 
+@metrics.timed("cmd", metrics.command_name)
+@tracing.traced()
 def cmd(
     args: str,
     env: dict[str, str] = None,
@@ -235,6 +240,114 @@ def cmd(
         raise CoreCommandError(1, input_args, "", e.strerror)
 
 
+class CommandStream:
+    """
+    Command run on the host with output read as it is produced, allowing output
+    of long running commands to be streamed and commands to be stopped.
+    """
+
+    def __init__(
+        self,
+        args: str,
+        env: dict[str, str] = None,
+        cwd: Path = None,
+        shell: bool = False,
+    ) -> None:
+        """
+        Create a CommandStream instance, starting the command.
+
+        :param args: command arguments
+        :param env: environment to run command with
+        :param cwd: directory to run command in
+        :param shell: True to use shell, False otherwise
+        :raises CoreCommandError: when the file to execute is not found
+        """
+        logger.debug("command stream cwd(%s): %s", cwd, args)
+        input_args = args
+        if shell is False:
+            args = shlex.split(args)
+        try:
+            self.process: Popen = Popen(
+                args,
+                stdin=PIPE,
+                stdout=PIPE,
+                stderr=PIPE,
+                env=env,
+                cwd=cwd,
+                shell=shell,
+                start_new_session=True,
+            )
+        except OSError as e:
+            logger.error("cmd error: %s", e.strerror)
+            raise CoreCommandError(1, input_args, "", e.strerror)
+        self.process.stdin.close()
+        self.selector: selectors.DefaultSelector = selectors.DefaultSelector()
+        self.selector.register(self.process.stdout, selectors.EVENT_READ, "stdout")
+        self.selector.register(self.process.stderr, selectors.EVENT_READ, "stderr")
+
+    @property
+    def done(self) -> bool:
+        """
+        Check if all output has been read.
+
+        :return: True if all output has been read, False otherwise
+        """
+        return not self.selector.get_map()
+
+    def read(self, timeout: float) -> tuple[bytes, bytes]:
+        """
+        Read currently available output, waiting up to the timeout for output.
+
+        :param timeout: maximum time to wait for output in seconds
+        :return: stdout and stderr read
+        """
+        if self.done:
+            try:
+                self.process.wait(timeout)
+            except TimeoutExpired:
+                pass
+            return b"", b""
+        output = {"stdout": b"", "stderr": b""}
+        for key, _ in self.selector.select(timeout):
+            data = os.read(key.fileobj.fileno(), 65536)
+            if data:
+                output[key.data] += data
+            else:
+                self.selector.unregister(key.fileobj)
+                key.fileobj.close()
+        return output["stdout"], output["stderr"]
+
+    def poll(self) -> int | None:
+        """
+        Check if the command has exited.
+
+        :return: exit status, None when still running
+        """
+        return self.process.poll()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        Stop the command when still running, terminating and then killing its
+        process group, and close output.
+
+        :param timeout: time to wait for command to terminate before killing it
+        :return: nothing
+        """
+        if self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+                self.process.wait(timeout)
+            except TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+            except ProcessLookupError:
+                pass
+        for key in list(self.selector.get_map().values()):
+            self.selector.unregister(key.fileobj)
+            key.fileobj.close()
+        self.selector.close()
+
+
 def run_cmds(args: list[str], wait: bool = True, shell: bool = False) -> list[str]:
     """
     Execute a series of commands on the host and returns a list of the combined stderr
@@ -575,3 +688,16 @@ class SetQueue(Queue):
     def _get(self):
         key, _ = self.queue.popitem(last=False)
         return key
+
+    def put_all(self, items: list[Any]) -> None:
+        """
+        Put several items at once, so consumers receive them together.
+
+        :param items: items to put
+        :return: nothing
+        """
+        with self.not_empty:
+            for item in items:
+                self._put(item)
+            self.unfinished_tasks += len(items)
+            self.not_empty.notify_all()
@@ -9,6 +9,7 @@ from core.config import Configuration
 from core.emane.nodes import EmaneNet, EmaneOptions
 from core.emulator.data import InterfaceData, LinkOptions
 from core.emulator.enumerations import EventTypes, NodeTypes
+from core.emulator.hooks import HookOptions
 from core.errors import CoreXmlError
 from core.nodes.base import (
     CoreNetworkBase,
@@ -283,6 +284,13 @@ class CoreXmlWriter:
                 hook = etree.SubElement(hooks, "hook")
                 add_attribute(hook, "name", file_name)
                 add_attribute(hook, "state", state.value)
+                options = self.session.hook_manager.get_options(state, file_name)
+                if options.detached:
+                    add_attribute(hook, "detached", 1)
+                if options.group:
+                    add_attribute(hook, "group", options.group)
+                if options.timeout:
+                    add_attribute(hook, "timeout", options.timeout)
                 hook.text = data
         if hooks.getchildren():
             self.scenario.append(hooks)
@@ -551,18 +559,25 @@ class CoreXmlReader:
             state = get_int(hook, "state")
             state = EventTypes(state)
             data = hook.text
+            options = HookOptions(
+                detached=get_int(hook, "detached") == 1,
+                group=hook.get("group", ""),
+                timeout=get_float(hook, "timeout") or 0.0,
+            )
             logger.info("reading hook: state(%s) name(%s)", state, name)
-            self.session.add_hook(state, name, data)
+            self.session.add_hook(state, name, data, options)
 
     def read_servers(self) -> None:
         servers = self.scenario.find("servers")
         if servers is None:
             return
+        values = []
         for server in servers.iterchildren():
             name = server.get("name")
             address = server.get("address")
             logger.info("reading server: name(%s) address(%s)", name, address)
-            self.session.distributed.add_server(name, address)
+            values.append((name, address))
+        self.session.distributed.add_servers(values)
 
     def read_session_origin(self) -> None:
         session_origin = self.scenario.find("session_origin")
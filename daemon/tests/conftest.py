@@ -49,6 +49,8 @@ class MockServer:
 def patcher(request):
     patch_manager = PatchManager()
     patch_manager.patch_obj(DistributedServer, "remote_cmd", return_value="1")
+    patch_manager.patch_obj(DistributedServer, "remote_cmds", return_value=[])
+    patch_manager.patch_obj(DistributedServer, "remote_put_temp")
     if request.config.getoption("mock"):
         patch_manager.patch("core.utils.cmd")
         patch_manager.patch("core.utils.which")
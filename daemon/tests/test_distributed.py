@@ -1,7 +1,29 @@
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import mock
+import pytest
+
+from core.emulator.distributed import (
+    AGENT_SOURCE,
+    AgentChannel,
+    DistributedServer,
+    get_agent_output,
+)
 from core.emulator.session import Session
+from core.errors import CoreCommandError, CoreError
 from core.nodes.base import CoreNode
 from core.nodes.network import HubNode
 
+# captured before test fixtures patch remote commands
+REMOTE_CMD = DistributedServer.remote_cmd
+REMOTE_CMDS = DistributedServer.remote_cmds
+REMOTE_PUT_TEMP = DistributedServer.remote_put_temp
+
 
 class TestDistributed:
     def test_remote_node(self, session: Session):
@@ -37,3 +59,156 @@ class TestDistributed:
         assert node2.server.name == server_name
         assert node2.server.host == host
         assert len(session.distributed.tunnels) == 1
+
+    def test_execute_parallel(self, session: Session):
+        # given
+        session.distributed.servers.clear()
+        for i in range(3):
+            name = f"core{i}"
+            session.distributed.servers[name] = DistributedServer(name, "127.0.0.1")
+        barrier = threading.Barrier(3, timeout=5)
+
+        def func(server: DistributedServer) -> str:
+            barrier.wait()
+            return server.name
+
+        # when
+        results = session.distributed.execute(func)
+
+        # then
+        assert results == ["core0", "core1", "core2"]
+
+    def test_execute_error(self, session: Session):
+        # given
+        session.distributed.servers.clear()
+        for i in range(3):
+            name = f"core{i}"
+            session.distributed.servers[name] = DistributedServer(name, "127.0.0.1")
+        called = []
+
+        def func(server: DistributedServer) -> None:
+            called.append(server.name)
+            if server.name == "core1":
+                raise CoreCommandError(1, "cmd")
+
+        # when
+        with pytest.raises(CoreCommandError):
+            session.distributed.execute(func)
+
+        # then
+        assert sorted(called) == ["core0", "core1", "core2"]
+
+
+def start_local_agent() -> AgentChannel:
+    p = subprocess.Popen(
+        [sys.executable, "-u", "-c", AGENT_SOURCE],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+
+    def close() -> None:
+        p.stdin.close()
+        p.wait()
+
+    return AgentChannel("local", p.stdout, p.stdin, close)
+
+
+@pytest.fixture
+def server() -> DistributedServer:
+    server = DistributedServer("core2", "127.0.0.1")
+    server.start_agent = start_local_agent
+    with mock.patch.multiple(
+        DistributedServer,
+        remote_cmd=REMOTE_CMD,
+        remote_cmds=REMOTE_CMDS,
+        remote_put_temp=REMOTE_PUT_TEMP,
+    ):
+        yield server
+    server.close()
+
+
+class TestAgentChannel:
+    def test_remote_cmd(self, server: DistributedServer, tmp_path: Path):
+        # when
+        output = server.remote_cmd("echo $VALUE; pwd", {"VALUE": "1"}, tmp_path)
+
+        # then
+        assert output == f"1\n{tmp_path}"
+
+    def test_remote_cmd_error(self, server: DistributedServer):
+        # when
+        with pytest.raises(CoreCommandError) as e:
+            server.remote_cmd("echo error >&2; exit 3")
+
+        # then
+        assert e.value.returncode == 3
+        assert e.value.stderr == "error"
+
+    def test_remote_cmds(self, server: DistributedServer):
+        # given
+        cmds = [f"echo {i}" for i in range(50)]
+
+        # when
+        outputs = server.remote_cmds(cmds)
+
+        # then
+        assert outputs == [str(i) for i in range(50)]
+
+    def test_remote_cmd_concurrent(self, server: DistributedServer):
+        # given
+        thread = threading.Thread(target=server.remote_cmd, args=("sleep 2",))
+        thread.start()
+        time.sleep(0.2)
+
+        # when
+        start = time.monotonic()
+        output = server.remote_cmd("echo 1")
+        duration = time.monotonic() - start
+        thread.join()
+
+        # then
+        assert output == "1"
+        assert duration < 1.5
+
+    def test_remote_cmd_no_timeout(self, server: DistributedServer):
+        # when
+        with mock.patch("core.emulator.distributed.AGENT_CMD_TIMEOUT", 0.1):
+            output = server.remote_cmd("sleep 0.5; echo 1")
+
+        # then
+        assert output == "1"
+
+    def test_agent_output_timeout(self):
+        # when
+        with pytest.raises(CoreError):
+            get_agent_output(Future(), "echo 1", timeout=0.01)
+
+    def test_remote_put(self, server: DistributedServer, tmp_path: Path):
+        # given
+        src_path = tmp_path / "src.sh"
+        src_path.write_text("script")
+        src_path.chmod(0o755)
+        dst_path = tmp_path / "dst.sh"
+        temp_path = tmp_path / "temp.txt"
+
+        # when
+        server.remote_put(src_path, dst_path)
+        server.remote_put_temp(temp_path, "data")
+
+        # then
+        assert dst_path.read_text() == "script"
+        assert dst_path.stat().st_mode & 0o777 == 0o755
+        assert temp_path.read_text() == "data"
+
+    def test_agent_closed(self, server: DistributedServer):
+        # given
+        agent_channel = server.get_agent()
+
+        # when
+        server.close()
+        output = server.remote_cmd("echo 1")
+
+        # then
+        assert agent_channel.closed is True
+        assert server.agent is not agent_channel
+        assert output == "1"
@@ -0,0 +1,86 @@
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from core.emane.emanemanager import EmaneManager
+from core.errors import CoreError
+
+
+class FakeIface:
+    def __init__(self, node_id: int, iface_id: int) -> None:
+        self.id = iface_id
+        self.name = f"eth{iface_id}"
+        self.node = mock.MagicMock()
+        self.node.id = node_id
+        self.node.name = f"n{node_id}"
+        self.poshook = None
+        self.set_ips = mock.MagicMock()
+
+
+def create_manager(tmp_path: Path, ifaces: list[FakeIface]) -> EmaneManager:
+    session = mock.MagicMock()
+    session.directory = tmp_path
+    session.options.get_int.side_effect = lambda key, default=None: {
+        "nem_id_start": 1
+    }.get(key, default)
+    session.options.get_bool.return_value = False
+    manager = EmaneManager(session)
+    emane_net = mock.MagicMock()
+    manager.get_ifaces = mock.MagicMock(return_value=[(emane_net, x) for x in ifaces])
+    manager.get_iface_config = mock.MagicMock(return_value={"external": "0"})
+    manager.setup_control_channels = mock.MagicMock()
+    manager.start_daemon = mock.MagicMock()
+    return manager
+
+
+class TestEmaneStartup:
+    def test_startup_nodes(self, tmp_path: Path):
+        # given
+        ifaces = [FakeIface(node_id, 0) for node_id in range(1, 6)]
+        manager = create_manager(tmp_path, ifaces)
+        threads = set()
+
+        def build_platform_xml(*args) -> None:
+            threads.add(threading.get_ident())
+
+        # when
+        with mock.patch(
+            "core.xml.emanexml.build_platform_xml", side_effect=build_platform_xml
+        ) as build_xml:
+            manager.startup_nodes()
+
+        # then
+        assert [manager.get_nem_id(x) for x in ifaces] == [1, 2, 3, 4, 5]
+        assert manager.get_nem_port(ifaces[0]) == 47001
+        assert build_xml.call_count == len(ifaces)
+        assert threading.get_ident() not in threads
+        assert manager.start_daemon.call_count == len(ifaces)
+        for iface in ifaces:
+            iface.set_ips.assert_called_once()
+        assert set(manager.startup_times) == {
+            "allocate",
+            "control",
+            "xml",
+            "daemons",
+            "install",
+        }
+        lines = (tmp_path / "emane_nems").read_text().splitlines()
+        assert lines[0] == "n1 eth0 1"
+
+    def test_startup_nodes_error(self, tmp_path: Path):
+        # given
+        ifaces = [FakeIface(1, 0), FakeIface(2, 0)]
+        manager = create_manager(tmp_path, ifaces)
+        manager.start_daemon.side_effect = [None, OSError("failed")]
+
+        # when
+        with mock.patch("core.xml.emanexml.build_platform_xml"):
+            with pytest.raises(CoreError):
+                manager.startup_nodes()
+
+        # then
+        assert "daemons" in manager.startup_times
+        for iface in ifaces:
+            iface.set_ips.assert_not_called()
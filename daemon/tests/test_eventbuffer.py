@@ -0,0 +1,75 @@
+from core.api.grpc.wrappers import (
+    Link,
+    LinkEvent,
+    LinkType,
+    MessageType,
+    Node,
+    NodeEvent,
+    Position,
+)
+from core.gui.eventbuffer import EventBuffer
+
+
+def node_event(node_id: int, x: float, message_type=MessageType.NONE) -> NodeEvent:
+    node = Node(id=node_id, position=Position(x=x, y=0))
+    return NodeEvent(message_type=message_type, node=node)
+
+
+def wireless_event(node1_id: int, node2_id: int, message_type) -> LinkEvent:
+    link = Link(node1_id, node2_id, type=LinkType.WIRELESS, network_id=10)
+    return LinkEvent(message_type=message_type, link=link)
+
+
+class TestEventBuffer:
+    def test_coalesce_node_updates(self):
+        # given
+        buffer = EventBuffer()
+
+        # when
+        buffer.add(node_event(1, 10))
+        buffer.add(node_event(2, 10))
+        buffer.add(node_event(1, 20))
+        buffer.add(node_event(1, 30))
+        events = buffer.drain()
+
+        # then
+        assert [(x.node.id, x.node.position.x) for x in events] == [(1, 30), (2, 10)]
+        assert buffer.coalesced == 2
+        assert buffer.drain() == []
+
+    def test_flush_order(self):
+        # given
+        buffer = EventBuffer()
+
+        # when
+        buffer.add(wireless_event(1, 2, MessageType.ADD))
+        buffer.add(node_event(1, 10))
+        buffer.add(wireless_event(2, 1, MessageType.DELETE))
+        buffer.add(node_event(1, 20, MessageType.DELETE))
+        buffer.add(node_event(1, 30))
+        buffer.add(node_event(1, 40))
+        events = buffer.drain()
+
+        # then
+        assert [x.message_type for x in events] == [
+            MessageType.ADD,
+            MessageType.NONE,
+            MessageType.DELETE,
+            MessageType.DELETE,
+            MessageType.NONE,
+        ]
+        assert events[1].node.position.x == 10
+        assert events[4].node.position.x == 40
+
+    def test_max_pending(self):
+        # given
+        buffer = EventBuffer(max_pending=1)
+
+        # when
+        buffer.add(node_event(1, 10))
+        buffer.add(node_event(2, 10))
+        buffer.add(node_event(1, 20))
+
+        # then
+        assert [x.node.position.x for x in buffer.drain()] == [20]
+        assert buffer.dropped == 1
@@ -0,0 +1,70 @@
+import pytest
+
+from core.location.geo import GeoLocation
+
+REF_GEO = (47.57917, -122.13232, 2.0)
+POSITIONS = [(0.0, 0.0, 0.0), (150.0, 250.0, None), (1000.0, 750.0, 25.0)]
+
+
+class TestGeo:
+    def test_getgeo_many(self):
+        # given
+        location = GeoLocation()
+        location.setrefgeo(*REF_GEO)
+        location.refscale = 150.0
+        expected = [location.getgeo(x, y, z) for x, y, z in POSITIONS]
+
+        # when
+        results = location.getgeo_many(POSITIONS)
+
+        # then
+        assert len(results) == len(expected)
+        for result, value in zip(results, expected):
+            assert result == pytest.approx(value)
+
+    def test_getgeo_many_empty(self):
+        # given
+        location = GeoLocation()
+
+        # when
+        results = location.getgeo_many([])
+
+        # then
+        assert results == []
+
+    def test_getxyz_many(self):
+        # given
+        location = GeoLocation()
+        location.setrefgeo(*REF_GEO)
+        location.refscale = 150.0
+        geos = location.getgeo_many(POSITIONS)
+        expected = [location.getxyz(lat, lon, alt) for lat, lon, alt in geos]
+
+        # when
+        results = location.getxyz_many(geos)
+
+        # then
+        assert len(results) == len(expected)
+        for result, value in zip(results, expected):
+            assert result == pytest.approx(value)
+
+    def test_tangent_plane(self):
+        # given
+        location = GeoLocation()
+        location.setrefgeo(*REF_GEO)
+        location.refscale = 150.0
+        positions = [(x * 500.0, x * 300.0, 10.0) for x in range(10)]
+        expected_geos = location.getgeo_many(positions)
+        expected_xyzs = location.getxyz_many(expected_geos)
+
+        # when
+        location.set_tangent_plane(True)
+        geos = location.getgeo_many(positions)
+        xyzs = location.getxyz_many(expected_geos)
+
+        # then
+        for geo, value in zip(geos, expected_geos):
+            assert geo == pytest.approx(value, abs=1e-8)
+        for xyz, value in zip(xyzs, expected_xyzs):
+            assert xyz == pytest.approx(value, abs=0.01)
+        assert location.getgeo(*positions[-1]) == pytest.approx(geos[-1])
@@ -6,7 +6,7 @@ import grpc
 import pytest
 from mock import patch
 
-from core.api.grpc import wrappers
+from core.api.grpc import grpcutils, wrappers
 from core.api.grpc.client import CoreGrpcClient, InterfaceHelper, MoveNodesStreamer
 from core.api.grpc.server import CoreGrpcServer
 from core.api.grpc.wrappers import (
@@ -194,6 +194,83 @@ class TestGrpc:
         assert len(session.nodes) == 1
         assert len(session.links) == 0
 
+    def test_get_session_cached(self, grpc_server: CoreGrpcServer):
+        # given
+        client = CoreGrpcClient()
+        session = grpc_server.coreemu.create_session()
+        session.add_node(CoreNode)
+
+        # when
+        with client.context_connect():
+            session1 = client.get_session(session.id)
+            session2 = client.get_session(session.id)
+            session.add_node(CoreNode)
+            session3 = client.get_session(session.id)
+
+        # then
+        assert session1.revision == session2.revision
+        assert session3.revision > session2.revision
+        assert len(session3.nodes) == 2
+
+    def test_start_session_revision(self, grpc_server: CoreGrpcServer):
+        # given
+        client = CoreGrpcClient()
+        with client.context_connect():
+            session = client.create_session()
+        session.add_node(1, position=Position(x=50, y=100))
+        real_session = grpc_server.coreemu.sessions[session.id]
+        revisions = []
+        configure_node = grpcutils.configure_node
+
+        def configure(*args) -> None:
+            revisions.append(real_session.revisions.revision)
+            configure_node(*args)
+
+        # when
+        with patch.object(grpcutils, "configure_node", configure):
+            with client.context_connect():
+                client.start_session(session, definition=True)
+
+        # then
+        assert real_session.revisions.revision > revisions[-1]
+
+    def test_get_session_changes(
+        self, grpc_server: CoreGrpcServer, ip_prefixes: IpPrefixes
+    ):
+        # given
+        client = CoreGrpcClient()
+        session = grpc_server.coreemu.create_session()
+        switch = session.add_node(SwitchNode)
+        node1 = session.add_node(CoreNode)
+        node2 = session.add_node(CoreNode)
+        with client.context_connect():
+            current = client.get_session(session.id)
+        node3 = session.add_node(CoreNode)
+        session.delete_node(node1.id)
+        iface_data = ip_prefixes.create_iface(node2)
+        session.add_link(node2.id, switch.id, iface_data)
+
+        # when
+        with client.context_connect():
+            changes = client.get_session_changes(session.id, current.revision)
+            unchanged = client.get_session_changes(session.id, changes.revision)
+            full = client.get_session_changes(session.id, changes.revision + 1)
+        updated = current.apply_changes(changes)
+
+        # then
+        assert changes.full is False
+        assert changes.revision > current.revision
+        assert [x.id for x in changes.nodes] == [node3.id]
+        assert changes.deleted_node_ids == [node1.id]
+        assert changes.links_changed is True
+        assert set(updated.nodes) == {switch.id, node2.id, node3.id}
+        assert len(updated.links) == 1
+        assert unchanged.full is False
+        assert not unchanged.nodes
+        assert unchanged.links_changed is False
+        assert full.full is True
+        assert len(full.session.nodes) == 3
+
     def test_get_sessions(self, grpc_server: CoreGrpcServer):
         # given
         client = CoreGrpcClient()
@@ -340,6 +417,46 @@ class TestGrpc:
         # then
         assert (expected_status, expected_output) == output
 
+    def test_node_command_stream(self, grpc_server: CoreGrpcServer):
+        # given
+        client = CoreGrpcClient()
+        session = grpc_server.coreemu.create_session()
+        node = session.add_node(CoreNode)
+        queue = Queue()
+        command = "echo one; sleep 0.1; echo two >&2; exit 2"
+
+        # then
+        with patch.object(CoreNode, "create_cmd", side_effect=lambda x, y: x):
+            with client.context_connect():
+                client.node_command_stream(
+                    session.id, node.id, command, queue.put, shell=True
+                )
+                outputs = []
+                while not outputs or not outputs[-1].done:
+                    outputs.append(queue.get(timeout=5))
+
+        # then
+        assert b"".join(x.stdout for x in outputs) == b"one\n"
+        assert b"".join(x.stderr for x in outputs) == b"two\n"
+        assert outputs[-1].return_code == 2
+
+    def test_nodes_command(self, grpc_server: CoreGrpcServer):
+        # given
+        client = CoreGrpcClient()
+        session = grpc_server.coreemu.create_session()
+        node_ids = [session.add_node(CoreNode).id for _ in range(3)]
+        queue = Queue()
+
+        # then
+        with patch.object(CoreNode, "cmd", return_value="output"):
+            with client.context_connect():
+                client.nodes_command(session.id, node_ids, "hostname", queue.put)
+                results = [queue.get(timeout=5) for _ in node_ids]
+
+        # then
+        assert sorted(x.node_id for x in results) == node_ids
+        assert all(x.output == "output" and x.return_code == 0 for x in results)
+
     def test_get_node_terminal(self, grpc_server: CoreGrpcServer):
         # given
         client = CoreGrpcClient()
@@ -721,6 +838,24 @@ class TestGrpc:
             # then
             queue.get(timeout=5)
 
+    def test_record_session(self, grpc_server: CoreGrpcServer):
+        # given
+        client = CoreGrpcClient()
+        session = grpc_server.coreemu.create_session()
+        node = session.add_node(CoreNode)
+        queue = Queue()
+
+        # when
+        with client.context_connect():
+            client.record_session(session.id, queue.put, interval=0.05)
+            time.sleep(0.1)
+            node.setposition(10, 20)
+            session.broadcast_node(node)
+
+            # then
+            data = queue.get(timeout=5)
+            assert f"XY,{node.id},10,20" in data
+
     def test_alert_events(self, grpc_server: CoreGrpcServer):
         # given
         client = CoreGrpcClient()
@@ -0,0 +1,81 @@
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from core.emulator import hooks
+from core.emulator.enumerations import AlertLevels, EventTypes
+from core.emulator.hooks import HookManager, HookOptions
+from core.errors import CoreError
+
+RUN_SCRIPT = hooks._run_script
+STATE = EventTypes.INSTANTIATION_STATE
+
+
+@pytest.fixture
+def run_script():
+    with mock.patch.object(hooks, "_run_script", RUN_SCRIPT):
+        yield
+
+
+def add_hook(
+    manager: HookManager, path: Path, name: str, data: str, options: HookOptions
+) -> None:
+    manager.add_script_hook(STATE, name, data, path, {}, options=options)
+
+
+class TestHooks:
+    def test_group_parallel(self, tmp_path: Path, run_script):
+        # given
+        manager = HookManager()
+        options = HookOptions(group="setup")
+        add_hook(manager, tmp_path, "a.sh", "sleep 0.3", options)
+        add_hook(manager, tmp_path, "b.sh", "sleep 0.3", options)
+
+        # when
+        start = time.monotonic()
+        manager.run_hooks(STATE, tmp_path, {})
+        duration = time.monotonic() - start
+
+        # then
+        assert duration < 0.55
+        assert manager.durations[(STATE, "a.sh")] >= 0.3
+        assert manager.durations[(STATE, "b.sh")] >= 0.3
+
+    def test_detached(self, tmp_path: Path, run_script):
+        # given
+        event = threading.Event()
+        alerts = []
+
+        def alert(level: AlertLevels, source: str, text: str) -> None:
+            alerts.append((level, source))
+            event.set()
+
+        manager = HookManager(alert)
+        add_hook(manager, tmp_path, "a.sh", "sleep 0.2; exit 3", HookOptions(True))
+
+        # when
+        start = time.monotonic()
+        manager.run_hooks(STATE, tmp_path, {})
+        duration = time.monotonic() - start
+
+        # then
+        assert duration < 0.2
+        assert event.wait(5)
+        assert alerts == [(AlertLevels.ERROR, "hook:a.sh")]
+
+    def test_timeout(self, tmp_path: Path, run_script):
+        # given
+        manager = HookManager()
+        add_hook(manager, tmp_path, "a.sh", "sleep 5", HookOptions(timeout=0.2))
+
+        # when
+        start = time.monotonic()
+        with pytest.raises(CoreError):
+            manager.run_hooks(STATE, tmp_path, {})
+
+        # then
+        assert time.monotonic() - start < 2
+        assert (STATE, "a.sh") in manager.durations
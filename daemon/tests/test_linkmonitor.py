@@ -0,0 +1,70 @@
+import concurrent.futures
+import threading
+from unittest import mock
+
+from core.emane.linkmonitor import EmaneLinkMonitor
+
+
+class FakeClient:
+    def __init__(self, links: list[tuple[int, int, float]], event=None) -> None:
+        self.links = links
+        self.event = event
+        self.queries = 0
+
+    def get_links(self, loss_threshold: int) -> list[tuple[int, int, float]]:
+        self.queries += 1
+        if self.event:
+            self.event.wait()
+        return self.links
+
+    def stop(self) -> None:
+        pass
+
+
+def create_monitor(clients: list[FakeClient]) -> EmaneLinkMonitor:
+    monitor = EmaneLinkMonitor(mock.MagicMock())
+    monitor.loss_threshold = 30
+    monitor.link_interval = 1
+    monitor.link_timeout = 4
+    monitor.executor = concurrent.futures.ThreadPoolExecutor()
+    monitor.clients = clients
+    return monitor
+
+
+class TestLinkMonitor:
+    def test_check_links(self):
+        # given
+        clients = [FakeClient([(1, 2, 10.0)]), FakeClient([(2, 1, 12.0)])]
+        monitor = create_monitor(clients)
+
+        # when
+        monitor.check_links()
+
+        # then
+        assert set(monitor.links) == {(1, 2), (2, 1)}
+        assert (1, 2) in monitor.complete_links
+        monitor.emane_manager.get_nem_link.assert_called_once()
+        assert monitor.stats.polls == 1
+        monitor.stop()
+
+    def test_check_links_skips_busy_clients(self):
+        # given
+        event = threading.Event()
+        slow_client = FakeClient([(3, 4, 10.0)], event)
+        clients = [FakeClient([(1, 2, 10.0)]), slow_client]
+        monitor = create_monitor(clients)
+        monitor.link_interval = 0.1
+
+        # when
+        for _ in range(4):
+            monitor.check_links()
+        event.set()
+
+        # then
+        assert set(monitor.links) == {(1, 2)}
+        assert monitor.stats.polls == 4
+        assert monitor.stats.overruns == 1
+        assert monitor.stats.skipped == 3
+        assert slow_client.queries == 1
+        assert clients[0].queries == 4
+        monitor.stop()
@@ -0,0 +1,100 @@
+import struct
+from unittest import mock
+
+from core.emane.nodes import TunTap
+from core.nodes.linkwatcher import (
+    IFINFO_HEADER,
+    IFLA_IFNAME,
+    NLMSG_DONE,
+    NLMSG_HEADER,
+    RTA_HEADER,
+    RTM_NEWLINK,
+    LinkWatcher,
+    align,
+    parse_messages,
+)
+
+
+def create_link_message(name: str, seq: int = 0) -> bytes:
+    value = name.encode() + b"\0"
+    attr_length = RTA_HEADER.size + len(value)
+    attr = RTA_HEADER.pack(attr_length, IFLA_IFNAME) + value
+    attr += b"\0" * (align(attr_length) - attr_length)
+    length = NLMSG_HEADER.size + IFINFO_HEADER.size + len(attr)
+    header = NLMSG_HEADER.pack(length, RTM_NEWLINK, 0, seq, 0)
+    return header + IFINFO_HEADER.pack(0, 0, 1, 0, 0) + attr
+
+
+class TestLinkWatcher:
+    def test_parse_messages(self):
+        # given
+        done = NLMSG_HEADER.pack(NLMSG_HEADER.size + 4, NLMSG_DONE, 0, 5, 0)
+        data = create_link_message("eth0") + create_link_message("tap1.0.1")
+        data += done + struct.pack("=i", 0)
+
+        # when
+        names, completed = parse_messages(data)
+
+        # then
+        assert names == ["eth0", "tap1.0.1"]
+        assert completed == [5]
+
+    def test_wait_existing(self):
+        # given
+        watcher = LinkWatcher()
+
+        # when
+        result = watcher.wait(None, "lo", 5)
+
+        # then
+        assert result is True
+        assert not watcher.watches
+        watcher.stop()
+
+    def test_wait_timeout(self):
+        # given
+        watcher = LinkWatcher()
+
+        # when
+        result = watcher.wait(None, "missing0", 0.1)
+
+        # then
+        assert result is False
+        assert not watcher.watches
+        watcher.stop()
+
+    def test_handle_data_error(self):
+        # given
+        watcher = LinkWatcher()
+        handle_data = watcher.handle_data
+        errors = []
+
+        def fail_once(*args) -> None:
+            if not errors:
+                errors.append(args)
+                raise struct.error("invalid message")
+            handle_data(*args)
+
+        watcher.handle_data = fail_once
+        watcher.wait(None, "lo", 0.5)
+
+        # when
+        result = watcher.wait(None, "lo", 5)
+
+        # then
+        assert errors
+        assert result is True
+        assert watcher.thread.is_alive()
+        watcher.stop()
+
+    def test_tuntap_wait_fallback(self):
+        # given
+        node = mock.MagicMock(server=None)
+        node.session.emane.link_watcher.wait.return_value = False
+        iface = TunTap(0, "eth0", "tap1.0.1", False, node=node)
+
+        # when
+        iface.waitfordevicenode()
+
+        # then
+        node.node_net_client.device_show.assert_called_once_with("eth0")
@@ -0,0 +1,76 @@
+import pytest
+
+from core import metrics
+from core.api.grpc.client import CoreGrpcClient
+from core.api.grpc.server import CoreGrpcServer
+from core.metrics import METRICS
+
+
+@pytest.fixture
+def enabled():
+    METRICS.reset()
+    METRICS.enabled = True
+    yield METRICS
+    METRICS.enabled = False
+    METRICS.reset()
+
+
+@metrics.timed("test", metrics.command_name)
+def run(args: str) -> str:
+    return args
+
+
+class TestMetrics:
+    def test_timed_disabled(self):
+        # given
+        METRICS.reset()
+
+        # when
+        run("/usr/bin/ip link show")
+
+        # then
+        assert METRICS.get() == {}
+
+    def test_timed(self, enabled):
+        # when
+        run("/usr/bin/ip link show")
+        run("ip addr show")
+        run("ethtool -K eth0 rx off")
+
+        # then
+        histograms = METRICS.get(reset=True)
+        assert histograms[("test", "ip")].count == 2
+        assert histograms[("test", "ethtool")].count == 1
+        assert METRICS.get() == {}
+
+    def test_prometheus(self, enabled):
+        # given
+        METRICS.observe("cmd", "ip", 0.002)
+        METRICS.observe("cmd", "ip", 20.0)
+
+        # when
+        text = METRICS.to_prometheus()
+
+        # then
+        assert "# TYPE core_cmd_seconds histogram" in text
+        assert 'core_cmd_seconds_bucket{op="ip",le="0.001"} 0' in text
+        assert 'core_cmd_seconds_bucket{op="ip",le="0.0025"} 1' in text
+        assert 'core_cmd_seconds_bucket{op="ip",le="10.0"} 1' in text
+        assert 'core_cmd_seconds_bucket{op="ip",le="+Inf"} 2' in text
+        assert 'core_cmd_seconds_count{op="ip"} 2' in text
+
+    def test_get_metrics(self, grpc_server: CoreGrpcServer, enabled):
+        # given
+        client = CoreGrpcClient()
+        with client.context_connect():
+            client.get_sessions()
+
+            # when
+            result = client.get_metrics(reset=True)
+
+        # then
+        metric = next(x for x in result if x.name == "grpc")
+        assert metric.label == "GetSessions"
+        assert metric.count == 1
+        assert sum(metric.buckets) == 1
+        assert len(metric.bounds) == len(metrics.BUCKETS)
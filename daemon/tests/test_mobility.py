@@ -1,6 +1,11 @@
 import pytest
 
-from core.location.mobility import WayPoint
+from core.emulator.data import IpPrefixes
+from core.emulator.enumerations import MessageFlags
+from core.emulator.session import Session
+from core.location.mobility import BasicRangeModel, WayPoint
+from core.nodes.base import CoreNode
+from core.nodes.network import WlanNode
 
 POSITION = (0.0, 0.0, 0.0)
 
@@ -17,3 +22,27 @@ class TestMobility:
     )
     def test_waypoint_lessthan(self, wp1, wp2, expected):
         assert (wp1 < wp2) == expected
+
+    def test_range_link_options(self, session: Session, ip_prefixes: IpPrefixes):
+        # given
+        wlan = session.add_node(WlanNode)
+        session.mobility.set_model(wlan, BasicRangeModel, {"bandwidth": "1000"})
+        ifaces = []
+        for _ in range(2):
+            node = session.add_node(CoreNode)
+            iface_data = ip_prefixes.create_iface(node)
+            iface, _ = session.add_link(node.id, wlan.id, iface1_data=iface_data)
+            ifaces.append(iface)
+        model = wlan.wireless_model
+        link1 = model.create_link_data(*ifaces, MessageFlags.ADD)
+
+        # when
+        link2 = model.create_link_data(*ifaces, MessageFlags.ADD)
+        model.update_config({"bandwidth": "2000"})
+        link3 = model.create_link_data(*ifaces, MessageFlags.ADD)
+
+        # then
+        assert link1.options is link2.options
+        assert link1.options.bandwidth == 1000
+        assert link3.options.bandwidth == 2000
+        assert ifaces[0].options.bandwidth == 2000
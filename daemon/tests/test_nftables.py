@@ -0,0 +1,99 @@
+import threading
+from types import SimpleNamespace
+
+from core.emulator.enumerations import NetworkPolicy
+from core.nodes.network import NftablesQueue
+
+
+class FakeIface:
+    def __init__(self, localname: str) -> None:
+        self.localname = localname
+
+
+def create_net(policy: NetworkPolicy) -> SimpleNamespace:
+    ifaces = [FakeIface(f"veth{i}") for i in range(3)]
+    linked = {x: {} for x in ifaces}
+    return SimpleNamespace(
+        brname="b.1.1",
+        policy=policy,
+        ifaces=ifaces,
+        linked=linked,
+        linked_lock=threading.Lock(),
+        has_nftables_chain=False,
+        nftables_changes=set(),
+        nftables_resync=False,
+        nftables_elements={},
+    )
+
+
+class TestNftables:
+    def test_build_cmds_create(self):
+        # given
+        queue = NftablesQueue()
+        net = create_net(NetworkPolicy.DROP)
+        iface1, iface2, iface3 = net.ifaces
+        net.linked[iface1][iface2] = True
+        net.linked[iface1][iface3] = False
+
+        # when
+        queue.build_cmds(net)
+
+        # then
+        assert "add table bridge b.1.1" in queue.cmds
+        assert "add map bridge b.1.1 links {type ifname . ifname : verdict;}" in (
+            queue.cmds
+        )
+        assert queue.cmds[-1] == (
+            'add element bridge b.1.1 links { "veth0" . "veth1" : accept, '
+            '"veth1" . "veth0" : accept }'
+        )
+        assert net.nftables_elements == {
+            ("veth0", "veth1"): "accept",
+            ("veth1", "veth0"): "accept",
+        }
+
+    def test_build_cmds_incremental(self):
+        # given
+        queue = NftablesQueue()
+        net = create_net(NetworkPolicy.DROP)
+        iface1, iface2, iface3 = net.ifaces
+        net.linked[iface1][iface2] = True
+        queue.build_cmds(net)
+        queue.cmds.clear()
+
+        # when
+        net.linked[iface1][iface2] = False
+        net.linked[iface2][iface3] = True
+        net.nftables_changes.update([(iface1, iface2), (iface2, iface3)])
+        queue.build_cmds(net)
+
+        # then
+        assert queue.cmds == [
+            'delete element bridge b.1.1 links { "veth0" . "veth1", '
+            '"veth1" . "veth0" }',
+            'add element bridge b.1.1 links { "veth1" . "veth2" : accept, '
+            '"veth2" . "veth1" : accept }',
+        ]
+        assert not net.nftables_changes
+
+    def test_build_cmds_resync(self):
+        # given
+        queue = NftablesQueue()
+        net = create_net(NetworkPolicy.ACCEPT)
+        iface1, iface2, iface3 = net.ifaces
+        net.linked[iface1][iface2] = False
+        net.linked[iface3][iface2] = False
+        queue.build_cmds(net)
+        queue.cmds.clear()
+
+        # when
+        del net.linked[iface3]
+        net.nftables_resync = True
+        queue.build_cmds(net)
+
+        # then
+        assert queue.cmds == [
+            'delete element bridge b.1.1 links { "veth2" . "veth1", '
+            '"veth1" . "veth2" }'
+        ]
+        assert net.nftables_resync is False
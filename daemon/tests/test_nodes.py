@@ -1,9 +1,13 @@
+import threading
+from unittest import mock
+
 import pytest
 
 from core.emulator.data import InterfaceData
 from core.emulator.session import Session
 from core.errors import CoreError
 from core.nodes.base import CoreNode
+from core.nodes.netclient import LinuxNetClient
 from core.nodes.network import HubNode, SwitchNode, WlanNode
 
 MODELS = ["router", "host", "PC", "mdr"]
@@ -71,6 +75,65 @@ class TestNodes:
         # then
         assert iface.id in node.ifaces
 
+    def test_node_add_iface_namespace(self, session: Session):
+        # given
+        node = session.add_node(CoreNode)
+        iface_data = InterfaceData(
+            mac="00:00:00:00:00:01",
+            ip4="10.0.0.1",
+            ip4_mask=24,
+            ip6="2001::1",
+            ip6_mask=64,
+        )
+
+        # when
+        with mock.patch.object(
+            LinuxNetClient, "create_veth_ns"
+        ) as create_veth_ns, mock.patch.object(
+            node.node_net_client, "run", return_value="5: eth0: <BROADCAST>"
+        ) as run:
+            iface = node.create_iface(iface_data)
+
+        # then
+        assert iface.up
+        assert iface.name == f"eth{iface.id}"
+        create_veth_ns.assert_called_once_with(
+            iface.localname, iface.name, str(node.pid), iface.mtu, "00:00:00:00:00:01"
+        )
+        cmds = run.call_args.args[0].split(" && ")
+        assert f"ip address add 10.0.0.1/24 broadcast + dev {iface.name}" in cmds
+        assert f"ip address add 2001::1/64 dev {iface.name}" in cmds
+        sysctl = f"sysctl -w net.ipv6.conf.{iface.name}.keep_addr_on_down=1"
+        assert sysctl in cmds
+        assert cmds[-1] == f"ip link set {iface.name} up"
+        assert iface.flow_id == 5
+
+    def test_iface_shutdown_concurrent(self, session: Session):
+        # given
+        node = session.add_node(CoreNode)
+        iface = node.create_iface(InterfaceData())
+        deleting = threading.Event()
+        release = threading.Event()
+
+        def delete_device(_: str) -> None:
+            deleting.set()
+            release.wait(5)
+
+        # when
+        with mock.patch.object(
+            iface.net_client, "delete_device", side_effect=delete_device
+        ) as delete:
+            thread = threading.Thread(target=iface.shutdown)
+            thread.start()
+            deleting.wait(5)
+            iface.shutdown()
+            release.set()
+            thread.join()
+
+        # then
+        assert not iface.up
+        delete.assert_called_once_with(iface.localname)
+
     def test_node_get_iface(self, session: Session):
         # given
         node = session.add_node(CoreNode)
@@ -0,0 +1,100 @@
+from pathlib import Path
+from unittest import mock
+
+from core.api.grpc.client import MoveNodesStreamer
+from core.player import (
+    TIMELINE_SUFFIX,
+    CorePlayer,
+    CorePlayerWriter,
+    PlayerEvents,
+    PlayerTimeline,
+)
+
+
+def write_file(file_path: Path) -> None:
+    writer = CorePlayerWriter(str(file_path))
+    writer.open()
+    writer.write_xy(1, 10.0, 20.0)
+    writer.update(1.0)
+    writer.write_xy(1, 30.0, 40.0)
+    writer.write_xy(2, 50.0, 60.0)
+    writer.write_cmd(1, True, False, "echo hello")
+    writer.update(1.0)
+    writer.write_wireless_link(3, 1, 2, True)
+    writer.write_wireless_config(3, 1, 2, 10.0, 2500.5, 20.0, 3000)
+    writer.close()
+
+
+class TestPlayer:
+    def test_timeline(self, tmp_path: Path):
+        # given
+        file_path = tmp_path / "test.core"
+        write_file(file_path)
+
+        # when
+        timeline = PlayerTimeline.from_file(file_path)
+        loaded = PlayerTimeline.load(
+            file_path.with_name(file_path.name + TIMELINE_SUFFIX), file_path
+        )
+
+        # then
+        assert len(timeline) == 6
+        assert timeline.get(3) == (
+            1.0,
+            PlayerEvents.CMD,
+            (1, True, False, "echo hello"),
+        )
+        assert timeline.get(4) == (2.0, PlayerEvents.WILINK, (3, 1, 2, True))
+        assert timeline.get(5) == (
+            2.0,
+            PlayerEvents.WICONFIG,
+            (3, 1, 2, 10.0, 2500.5, 20.0, 3000.0),
+        )
+        assert timeline.find(0.5) == 1
+        assert loaded is not None
+        assert [loaded.get(x) for x in range(6)] == [timeline.get(x) for x in range(6)]
+
+    def test_play_seek(self, tmp_path: Path):
+        # given
+        file_path = tmp_path / "test.core"
+        write_file(file_path)
+        player = CorePlayer(file_path, speed=100.0, seek=1.5)
+        player.node_streamer = mock.MagicMock()
+        player.core = mock.MagicMock()
+
+        # when
+        player.start()
+
+        # then
+        positions = player.node_streamer.create_position.call_args_list
+        assert positions == [mock.call(1, 30.0, 40.0), mock.call(2, 50.0, 60.0)]
+        player.node_streamer.send_all.assert_called_once()
+        player.core.node_command.assert_not_called()
+        player.core.wireless_linked.assert_called_once_with(None, 3, 1, 2, True)
+        options = player.core.wireless_config.call_args[0][4:]
+        assert [x.delay for x in options] == [2500, 3000]
+
+    def test_move_burst(self, tmp_path: Path):
+        # given
+        file_path = tmp_path / "test.core"
+        write_file(file_path)
+        player = CorePlayer(file_path, speed=100.0, seek=0.5)
+        player.node_streamer = MoveNodesStreamer(1)
+        player.core = mock.MagicMock()
+        calls = mock.MagicMock()
+        calls.node_command.return_value = (0, "hello")
+        player.core.node_command.side_effect = calls.node_command
+
+        # when
+        with mock.patch.object(
+            player.node_streamer, "send_all", wraps=player.node_streamer.send_all
+        ) as send_all:
+            calls.attach_mock(send_all, "send_all")
+            player.start()
+
+        # then
+        names = [x[0] for x in calls.mock_calls]
+        assert names == ["send_all", "send_all", "node_command"]
+        burst = calls.mock_calls[1].args[0]
+        assert [x.node_id for x in burst] == [1, 2]
+        assert player.node_streamer.queue.qsize() == 2
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+from core.emulator.data import LinkData
+from core.emulator.enumerations import LinkTypes, MessageFlags
+from core.emulator.recorder import SessionRecorder
+from core.emulator.session import Session
+from core.nodes.base import CoreNode
+from core.nodes.network import WlanNode
+from core.player import PlayerEvents, PlayerTimeline, QueuePlayerWriter
+
+
+class TestRecorder:
+    def test_record(self, session: Session, tmp_path: Path):
+        # given
+        file_path = tmp_path / "record.core"
+        node1 = session.add_node(CoreNode)
+        node2 = session.add_node(CoreNode)
+        wlan = session.add_node(WlanNode)
+        recorder = SessionRecorder.to_file(session, str(file_path), min_distance=5)
+        recorder.start()
+
+        # when
+        for x in (10, 12, 20):
+            node1.setposition(x, 10)
+            session.broadcast_node(node1)
+            recorder.flush()
+        link_data = LinkData(
+            message_type=MessageFlags.ADD,
+            type=LinkTypes.WIRELESS,
+            node1_id=node1.id,
+            node2_id=node2.id,
+            network_id=wlan.id,
+        )
+        session.broadcast_link(link_data)
+        recorder.stop()
+
+        # then
+        timeline = PlayerTimeline.compile(file_path)
+        events = [timeline.get(x)[1:] for x in range(len(timeline))]
+        assert events == [
+            (PlayerEvents.XY, (node1.id, 10.0, 10.0)),
+            (PlayerEvents.XY, (node1.id, 20.0, 10.0)),
+            (PlayerEvents.WLINK, (wlan.id, node1.id, node2.id, True)),
+        ]
+        assert recorder.skipped == 1
+
+    def test_record_rotation(self, session: Session, tmp_path: Path):
+        # given
+        file_path = tmp_path / "record.core"
+        node = session.add_node(CoreNode)
+        node2 = session.add_node(CoreNode)
+        wlan = session.add_node(WlanNode)
+        recorder = SessionRecorder.to_file(
+            session, str(file_path), max_bytes=200, backups=2
+        )
+        recorder.start()
+        link_data = LinkData(
+            message_type=MessageFlags.ADD,
+            type=LinkTypes.WIRELESS,
+            node1_id=node.id,
+            node2_id=node2.id,
+            network_id=wlan.id,
+        )
+        session.broadcast_link(link_data)
+
+        # when
+        for x in range(100):
+            node.setposition(x, 10)
+            session.broadcast_node(node)
+            recorder.flush()
+        recorder.stop()
+
+        # then
+        files = sorted(x.name for x in tmp_path.iterdir())
+        assert files == ["record.core", "record.core.1", "record.core.2"]
+        for name in ("record.core.1", "record.core.2"):
+            timeline = PlayerTimeline.compile(tmp_path / name)
+            events = [timeline.get(x) for x in range(len(timeline))]
+            assert events[0][:2] == (0.0, PlayerEvents.XY)
+            wlan_link = (PlayerEvents.WLINK, (wlan.id, node.id, node2.id, True))
+            assert (0.0, *wlan_link) in events
+
+    def test_record_queue_full(self, session: Session):
+        # given
+        node = session.add_node(CoreNode)
+        writer = QueuePlayerWriter(maxsize=2)
+        recorder = SessionRecorder(session, writer)
+        recorder.start()
+
+        # when
+        for x in range(5):
+            node.setposition(x, 10)
+            session.broadcast_node(node)
+            recorder.flush()
+        recorder.stop()
+
+        # then
+        assert writer.queue.qsize() == 2
+        assert writer.dropped == 4
+        writer.queue.get()
+        assert writer.queue.get() is None
@@ -0,0 +1,88 @@
+import socket
+from unittest import mock
+
+from core.location.geo import GeoLocation
+from core.plugins.sdt import SdtWriter, pack_cmds
+
+
+def create_writer(sock: socket.socket, mtu: int = 1400) -> SdtWriter:
+    location = GeoLocation()
+    location.setrefgeo(47.57917, -122.13232, 2.0)
+    location.refscale = 150.0
+    return SdtWriter(sock, location, 0.01, mtu, mock.MagicMock())
+
+
+def read_cmds(sock: socket.socket) -> list[list[str]]:
+    sock.setblocking(False)
+    datagrams = []
+    while True:
+        try:
+            data = sock.recv(65535)
+        except BlockingIOError:
+            break
+        datagrams.append(data.decode().splitlines())
+    return datagrams
+
+
+class TestSdt:
+    def test_pack_cmds(self):
+        # given
+        cmds = ["a" * 10, "b" * 10, "c" * 10, "d" * 30]
+
+        # when
+        datagrams = pack_cmds(cmds, 25)
+
+        # then
+        assert datagrams == [
+            b"aaaaaaaaaa\nbbbbbbbbbb\n",
+            b"cccccccccc\n",
+            b"d" * 30 + b"\n",
+        ]
+
+    def test_writer_coalesces_positions(self):
+        # given
+        sock, peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        writer = create_writer(sock)
+
+        # when
+        writer.add_cmd("layer CORE")
+        for i in range(10):
+            writer.set_position(1, i, i, 0)
+        writer.set_geo(2, 1.0, 2.0, 3.0)
+        writer.set_geo(2, 4.0, 5.0, 6.0)
+        writer.set_position(3, 0, 0, 0)
+        writer.delete_node(3)
+        writer.flush()
+
+        # then
+        datagrams = read_cmds(peer)
+        assert len(datagrams) == 1
+        cmds = datagrams[0]
+        assert cmds[0] == "layer CORE"
+        assert cmds[1] == "delete node,3"
+        assert cmds[2].startswith("node 2 pos 4.000000,5.000000,6.000000")
+        assert cmds[3].startswith("node 1 pos")
+        assert len(cmds) == 4
+        assert writer.coalesced == 10
+        sock.close()
+        peer.close()
+
+    def test_writer_thread(self):
+        # given
+        sock, peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        writer = create_writer(sock, mtu=32)
+        writer.start()
+
+        # when
+        for i in range(5):
+            writer.add_cmd(f"node {i} label on")
+        writer.stop()
+
+        # then
+        datagrams = read_cmds(peer)
+        cmds = [x for datagram in datagrams for x in datagram]
+        assert cmds == [f"node {i} label on" for i in range(5)]
+        assert len(datagrams) == writer.sent_datagrams
+        assert len(datagrams) < 5
+        sock.close()
+        peer.close()
@@ -1,11 +1,26 @@
+import subprocess
 from pathlib import Path
+from typing import Any
 from unittest import mock
 
 import pytest
 
 from core.config import ConfigBool, ConfigString
+from core.emulator.data import IpPrefixes
+from core.emulator.enumerations import EventTypes
+from core.emulator.session import Session
 from core.errors import CoreCommandError, CoreError
-from core.services.base import CoreService, ServiceBootError, ServiceMode
+from core.nodes.base import CoreNode
+from core.services.base import (
+    TEMPLATE_CACHE,
+    CoreService,
+    ServiceBootError,
+    ServiceMode,
+    TopologyDep,
+)
+from core.services.defaults.frrservices.services import FRRZebra
+from core.services.defaults.quaggaservices.services import Zebra
+from core.services.defaults.utilservices.services import IpForwardService
 
 TEMPLATE_TEXT = "echo hello"
 
@@ -38,6 +53,18 @@ class MyService(CoreService):
         return TEMPLATE_TEXT
 
 
+class MyTopologyService(MyService):
+    name = "MyTopologyService"
+    topology_deps = [TopologyDep.IFACES]
+    reload = ["reload"]
+
+    def data(self) -> dict[str, Any]:
+        return dict(count=len(self.node.get_ifaces()))
+
+    def get_text_template(self, name: str) -> str:
+        return "${count}"
+
+
 class TestServices:
     def test_set_template(self):
         # given
@@ -90,6 +117,110 @@ class TestServices:
         file_path = Path(MyService.files[0])
         node.create_file.assert_called_with(file_path, TEMPLATE_TEXT)
 
+    def test_render_text_cached(self):
+        # given
+        service1 = MyService(mock.MagicMock())
+        service2 = MyService(mock.MagicMock())
+
+        # when
+        service1.create_files()
+        service2.create_files()
+
+        # then
+        template1 = TEMPLATE_CACHE.get_text(MyService, TEMPLATE_TEXT)
+        template2 = TEMPLATE_CACHE.get_text(MyService, TEMPLATE_TEXT)
+        assert template1 is template2
+        assert service1.templates is service2.templates
+
+    def test_set_template_invalidates_cache(self):
+        # given
+        node = mock.MagicMock()
+        service = MyService(node)
+        service.set_template(MyService.files[0], "echo custom1")
+        service.create_files()
+        template = TEMPLATE_CACHE.get_text(MyService, "echo custom1")
+
+        # when
+        service.set_template(MyService.files[0], "echo custom2")
+        service.create_files()
+
+        # then
+        assert TEMPLATE_CACHE.get_text(MyService, "echo custom1") is not template
+        file_path = Path(MyService.files[0])
+        node.create_file.assert_called_with(file_path, "echo custom2")
+
+    def test_render_text_module_dir(self, tmp_path: Path):
+        # given
+        node = mock.MagicMock()
+        service = MyService(node)
+        TEMPLATE_CACHE.set_module_dir(tmp_path)
+
+        # when
+        try:
+            service.create_files()
+        finally:
+            TEMPLATE_CACHE.set_module_dir(None)
+
+        # then
+        file_path = Path(MyService.files[0])
+        node.create_file.assert_called_with(file_path, TEMPLATE_TEXT)
+        assert list(tmp_path.glob("texts/**/*.py"))
+
+    def test_lookup_module_dir(self, tmp_path: Path):
+        # given
+        module_dir = tmp_path / "modules"
+        for name in ("a", "b"):
+            path = tmp_path / name
+            path.mkdir()
+            (path / "start.sh").write_text(f"echo {name}")
+        TEMPLATE_CACHE.set_module_dir(module_dir)
+
+        # when
+        try:
+            for name in ("a", "b"):
+                lookup = TEMPLATE_CACHE.get_lookup(tmp_path / name)
+                lookup.get_template("start.sh").render()
+            TEMPLATE_CACHE.set_module_dir(module_dir)
+            results = []
+            for name in ("a", "b"):
+                lookup = TEMPLATE_CACHE.get_lookup(tmp_path / name)
+                results.append(lookup.get_template("start.sh").render())
+        finally:
+            TEMPLATE_CACHE.set_module_dir(None)
+
+        # then
+        assert results == ["echo a", "echo b"]
+
+    @pytest.mark.parametrize(
+        "service_class,prefix", [(FRRZebra, "frr"), (Zebra, "quagga")]
+    )
+    def test_zebra_reload(self, tmp_path: Path, service_class, prefix: str):
+        # given
+        service = service_class(mock.MagicMock())
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        vtysh = bin_dir / "vtysh"
+        vtysh.write_text('#!/bin/sh\necho "vtysh $@"\n')
+        vtysh.chmod(0o755)
+        data = {
+            f"{prefix}_conf": "",
+            f"{prefix}_sbin_search": "",
+            f"{prefix}_bin_search": str(bin_dir),
+            f"{prefix}_state_dir": "",
+            "ifaces": [],
+        }
+        script = service.files[1]
+        (tmp_path / script).write_text(service.render_template(script, data))
+
+        # when
+        result = subprocess.run(
+            service.reload[0], shell=True, cwd=tmp_path, capture_output=True, text=True
+        )
+
+        # then
+        assert result.returncode == 0
+        assert result.stdout.strip() == "vtysh -b"
+
     def test_run_startup(self):
         # given
         node = mock.MagicMock()
@@ -294,3 +425,67 @@ class TestServices:
         service.run_startup.assert_called_once()
         service.run_validation.assert_called_once()
         service.wait_validation.assert_not_called()
+
+    def test_update_files(self):
+        # given
+        node = mock.MagicMock()
+        node.get_ifaces.return_value = [1]
+        service = MyTopologyService(node)
+        service.create_files()
+        node.get_ifaces.return_value = [1, 2]
+
+        # when
+        updated = service.update_files({TopologyDep.IFACES})
+
+        # then
+        assert updated == MyTopologyService.files
+        node.create_file.assert_called_with(Path(MyTopologyService.files[0]), "2")
+        node.cmd.assert_called_once_with("reload", shell=True)
+
+    def test_update_files_unchanged(self):
+        # given
+        node = mock.MagicMock()
+        node.get_ifaces.return_value = [1]
+        service = MyTopologyService(node)
+        service.create_files()
+
+        # when
+        updated = service.update_files({TopologyDep.IFACES, TopologyDep.NETWORKS})
+        unrelated = service.update_files({TopologyDep.LINK_OPTIONS})
+
+        # then
+        assert updated == []
+        assert unrelated == []
+        node.cmd.assert_not_called()
+
+    def test_update_files_reload_exception(self):
+        # given
+        node = mock.MagicMock()
+        node.get_ifaces.return_value = [1]
+        service = MyTopologyService(node)
+        service.create_files()
+        node.get_ifaces.return_value = [1, 2]
+        node.cmd.side_effect = CoreCommandError(1, "reload")
+
+        # when
+        with pytest.raises(CoreError):
+            service.update_files({TopologyDep.IFACES})
+
+    def test_runtime_link_updates_services(self, session: Session):
+        # given
+        ip_prefixes = IpPrefixes(ip4_prefix="10.83.0.0/16")
+        options = CoreNode.create_options()
+        options.services = [IpForwardService.name]
+        node1 = session.add_node(CoreNode, options=options)
+        node2 = session.add_node(CoreNode, options=options)
+        session.set_state(EventTypes.RUNTIME_STATE)
+        iface1_data = ip_prefixes.create_iface(node1)
+        iface2_data = ip_prefixes.create_iface(node2)
+
+        # when
+        with mock.patch.object(IpForwardService, "update_files") as update_files:
+            session.add_link(node1.id, node2.id, iface1_data, iface2_data)
+
+        # then
+        assert update_files.call_count == 2
+        update_files.assert_called_with({TopologyDep.IFACES})
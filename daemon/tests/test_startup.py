@@ -0,0 +1,111 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from core.config import Configuration
+from core.emane import emanemanifest
+from core.emulator.enumerations import ConfigDataTypes
+from core.emulator.startup import StartupCache
+from core.errors import CoreError
+from core.services.manager import ServiceManager
+
+CONFIG = {"emane_prefix": "/usr"}
+
+
+@pytest.fixture
+def manifest_cache():
+    manifests = dict(emanemanifest.MANIFEST_CACHE)
+    emanemanifest.MANIFEST_CACHE.clear()
+    yield emanemanifest.MANIFEST_CACHE
+    emanemanifest.MANIFEST_CACHE.clear()
+    emanemanifest.MANIFEST_CACHE.update(manifests)
+
+
+class TestStartup:
+    def test_warm_start(self, tmp_path: Path, manifest_cache):
+        # given
+        cache_path = tmp_path / "startup.json"
+        config = Configuration(
+            id="delay", type=ConfigDataTypes.UINT32, default="0", options=["1", "2"]
+        )
+        cache = StartupCache(cache_path)
+        cache.load(CONFIG)
+        with mock.patch("core.utils.which", return_value="/usr/bin/ip"):
+            cache.which("ip", True)
+        cache.service_modules = ServiceManager.find_locals()
+        manifest_cache["manifest.xml:"] = [config]
+        cache.save()
+        manifest_cache.clear()
+
+        # when
+        warm_cache = StartupCache(cache_path)
+        with mock.patch("core.utils.which") as which:
+            result = warm_cache.load(CONFIG)
+            path = warm_cache.which("ip", True)
+
+        # then
+        assert result is True
+        assert warm_cache.hit is True
+        assert path == "/usr/bin/ip"
+        which.assert_not_called()
+        assert warm_cache.service_modules == cache.service_modules
+        assert manifest_cache["manifest.xml:"] == [config]
+
+    def test_rebuild(self, tmp_path: Path, manifest_cache):
+        # given
+        cache_path = tmp_path / "startup.json"
+        cache = StartupCache(cache_path)
+        cache.load(CONFIG)
+        cache.save()
+
+        # when
+        rebuild_cache = StartupCache(cache_path, rebuild=True)
+        result = rebuild_cache.load(CONFIG)
+
+        # then
+        assert cache_path.is_file()
+        assert result is False
+        assert rebuild_cache.hit is False
+
+    def test_invalidated(self, tmp_path: Path, manifest_cache):
+        # given
+        cache_path = tmp_path / "startup.json"
+        cache = StartupCache(cache_path)
+        cache.load(CONFIG)
+        cache.save()
+
+        # when
+        changed_cache = StartupCache(cache_path)
+        result = changed_cache.load({"emane_prefix": str(tmp_path)})
+
+        # then
+        assert result is False
+
+    def test_default_emane_prefix(self, tmp_path: Path):
+        # given
+        cache = StartupCache(None)
+        manifest_path = tmp_path / "share" / "emane" / "manifest"
+        manifest_path.mkdir(parents=True)
+        with mock.patch("core.emulator.startup.DEFAULT_EMANE_PREFIX", str(tmp_path)):
+            fingerprint = cache.create_fingerprint({})
+
+            # when
+            (manifest_path / "model.xml").write_text("<manifest/>")
+            changed = cache.create_fingerprint({})
+
+        # then
+        assert changed != fingerprint
+
+    def test_which_required(self, manifest_cache):
+        # given
+        cache = StartupCache(None)
+
+        # when
+        with mock.patch("core.utils.which", return_value=None):
+            path = cache.which("missing", False)
+
+        # then
+        assert path is None
+        with pytest.raises(CoreError):
+            cache.which("missing", True)
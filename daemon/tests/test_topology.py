@@ -0,0 +1,92 @@
+from core.emulator.data import IpPrefixes
+from core.emulator.session import Session
+from core.nodes.base import CoreNode
+from core.nodes.interface import DEFAULT_MTU
+from core.nodes.network import SwitchNode, WlanNode
+from core.services.defaults.frrservices.services import FRROspfv2, FRRZebra
+
+
+class TestTopology:
+    def test_build(self, session: Session, ip_prefixes: IpPrefixes):
+        # given
+        switch = session.add_node(SwitchNode)
+        node1 = session.add_node(CoreNode)
+        node2 = session.add_node(CoreNode)
+        iface1_data = ip_prefixes.create_iface(node1)
+        iface1, _ = session.add_link(node1.id, switch.id, iface1_data)
+        iface1.net.get_ifaces()[-1].mtu = DEFAULT_MTU - 100
+        iface2_data = ip_prefixes.create_iface(node2)
+        iface2, _ = session.add_link(node2.id, switch.id, iface2_data)
+
+        # when
+        session.topology.build()
+
+        # then
+        topology = session.topology
+        assert topology.get_min_mtu(iface1) == DEFAULT_MTU - 100
+        assert topology.has_mtu_mismatch(iface1)
+        assert topology.get_min_mtu(iface2) == DEFAULT_MTU
+        assert not topology.has_mtu_mismatch(iface2)
+        assert not topology.has_rj45(iface1)
+        assert not topology.is_wireless(iface1.net)
+        assert topology.get_router_id(node1) == str(iface1.get_ip4().ip)
+
+    def test_update_on_link_changes(self, session: Session, ip_prefixes: IpPrefixes):
+        # given
+        wlan = session.add_node(WlanNode)
+        node1 = session.add_node(CoreNode)
+        node2 = session.add_node(CoreNode)
+        iface1_data = ip_prefixes.create_iface(node1)
+        session.add_link(node1.id, wlan.id, iface1_data)
+        session.topology.build()
+
+        # when
+        iface2_data = ip_prefixes.create_iface(node2)
+        iface2, _ = session.add_link(node2.id, wlan.id, iface2_data)
+
+        # then
+        topology = session.topology
+        assert topology.is_wireless(wlan)
+        assert topology.router_ids[node2.id] == str(iface2.get_ip4().ip)
+
+        # when
+        session.delete_link(node2.id, wlan.id, iface2.id)
+
+        # then
+        assert topology.router_ids[node2.id] == "0.0.0.0"
+
+    def test_update_on_link_update(self, session: Session, ip_prefixes: IpPrefixes):
+        # given
+        node1 = session.add_node(CoreNode)
+        node2 = session.add_node(CoreNode)
+        iface1_data = ip_prefixes.create_iface(node1)
+        iface2_data = ip_prefixes.create_iface(node2)
+        iface1, iface2 = session.add_link(node1.id, node2.id, iface1_data, iface2_data)
+        session.topology.build()
+        iface1.mtu = DEFAULT_MTU - 100
+
+        # when
+        session.update_link(node1.id, node2.id, iface1.id, iface2.id)
+
+        # then
+        assert session.topology.get_min_mtu(iface2) == DEFAULT_MTU - 100
+
+    def test_render_before_build(self, session: Session, ip_prefixes: IpPrefixes):
+        # given
+        options = CoreNode.create_options()
+        options.services = [FRRZebra.name, FRROspfv2.name]
+        node1 = session.add_node(CoreNode, options=options)
+        node2 = session.add_node(CoreNode)
+        service = node1.services[FRRZebra.name]
+        conf = "/usr/local/etc/frr/frr.conf"
+        assert "router-id 0.0.0.0" in service.get_rendered_templates()[conf]
+        iface1_data = ip_prefixes.create_iface(node1)
+        iface2_data = ip_prefixes.create_iface(node2)
+
+        # when
+        iface1, _ = session.add_link(node1.id, node2.id, iface1_data, iface2_data)
+        rendered = service.get_rendered_templates()[conf]
+
+        # then
+        assert not session.topology.built
+        assert f"router-id {iface1.get_ip4().ip}" in rendered
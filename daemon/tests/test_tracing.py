@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from core import tracing
+from core.emulator.coreemu import CoreEmu
+from core.emulator.session import Session
+from core.nodes.base import CoreNode
+from core.nodes.netclient import LinuxNetClient
+
+
+@tracing.traced()
+def run(args: str, *_, **__) -> str:
+    return "1"
+
+
+@pytest.fixture
+def traced_session(session: Session):
+    session.options.set("trace_commands", "1")
+    session.set_tracing()
+    yield session
+    session.options.set("trace_commands", "0")
+    session.set_tracing()
+
+
+class TestTracing:
+    def test_netclient_source(self, traced_session: Session):
+        # given
+        net_client = LinuxNetClient(run)
+
+        # when
+        net_client.device_up("eth0")
+
+        # then
+        sources = {x.source for x in traced_session.tracer.events}
+        assert sources == {"netclient.device_up"}
+        assert traced_session.tracer.summary()[0][0] == "netclient.device_up"
+
+    def test_node_command(self, traced_session: Session):
+        # given
+        node = traced_session.add_node(CoreNode)
+        traced_session.tracer.events.clear()
+
+        # when
+        with mock.patch("core.utils.cmd", run):
+            node.cmd("ip link show")
+
+        # then
+        event = traced_session.tracer.events[0]
+        assert event.node == node.name
+        assert event.command.endswith("ip link show")
+
+    def test_write_trace(self, traced_session: Session, tmp_path):
+        # given
+        run("ip link show")
+        path = tmp_path / tracing.TRACE_FILE
+
+        # when
+        traced_session.tracer.write(path)
+
+        # then
+        data = json.loads(path.read_text())
+        events = [x for x in data["traceEvents"] if x["ph"] == "X"]
+        assert len(events) == 1
+        assert events[0]["name"] == "ip"
+        assert events[0]["pid"] == traced_session.id
+        assert events[0]["args"]["command"] == "ip link show"
+
+    def test_shutdown_trace(self, global_coreemu: CoreEmu):
+        # given
+        session = global_coreemu.create_session()
+        session.options.set("trace_commands", "1")
+        session.set_tracing()
+        node = session.add_node(CoreNode)
+        path = Path(f"{session.directory}.{tracing.TRACE_FILE}")
+
+        # when
+        with mock.patch.object(node, "shutdown", lambda: run("ip link delete eth0")):
+            global_coreemu.delete_session(session.id)
+
+        # then
+        try:
+            assert not session.directory.exists()
+            data = json.loads(path.read_text())
+            commands = [
+                x["args"]["command"] for x in data["traceEvents"] if x["ph"] == "X"
+            ]
+            assert commands == ["ip link delete eth0"]
+        finally:
+            path.unlink(missing_ok=True)
+
+    def test_disabled(self, session: Session):
+        # when
+        run("ip link show")
+
+        # then
+        assert session.tracer is None
+        assert not tracing._TRACERS